@@ -1 +1,12 @@
-from . import autorig_settings
\ No newline at end of file
+from . import _lazy
+
+# attribute name -> submodule, imported on first access (PEP 562)
+_SUBMODULES = {"autorig_settings": ".autorig_settings",
+               "core": ".core",
+               "data": ".data",
+               "modules": ".modules",
+               "ui": ".ui",
+               "utils": ".utils"}
+
+
+_lazy.attach(__name__, globals(), _SUBMODULES)
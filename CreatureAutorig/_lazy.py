@@ -0,0 +1,28 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import importlib
+
+
+def attach(package_name, package_globals, submodules):
+    '''
+    The function makes the submodules of a package load on first attribute access (PEP 562),
+    so importing the package doesn't import all of them
+    @param package_name: str, __name__ of the package
+    @param package_globals: dict, globals() of the package, __getattr__ and __dir__ are added
+    @param submodules: dict, attribute name -> submodule relative to the package, e.g. ".scene"
+    '''
+    def __getattr__(name):
+        if name not in submodules:
+            raise AttributeError(f"module '{package_name}' has no attribute '{name}'")
+        module = importlib.import_module(submodules[name], package_name)
+        package_globals[name] = module
+        return module
+
+    def __dir__():
+        return sorted(set(package_globals) | set(submodules))
+
+    package_globals["__getattr__"] = __getattr__
+    package_globals["__dir__"] = __dir__
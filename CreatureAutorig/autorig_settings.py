@@ -13,6 +13,7 @@ UTILS_PATH = ROOT_PATH + "utils/"
 DATA_PATH = ROOT_PATH + "data/"
 
 sides = {"M":"M", "L":"L", "R":"R"}
+mirror_sides = {"M":"M", "L":"R", "R":"L"} # side -> the opposite side
 #sides = ("M", "L", "R")
 
 # suffixes = ( "ctrl",
@@ -61,6 +62,10 @@ suffixes = {"ctrl": "ctrl",
 
 ZERO_PADDING = 2 #padding used to generate names
 
+# maximum time in seconds a cold import of the CreatureAutorig package can take,
+# checked by core/test_core/test_import_time, can be overridden by the environment variable
+IMPORT_TIME_BUDGET = 0.1
+
 colors = {  "red": [2.0, 0.0, 0.0],
             "redDark": [0.522, 0.004, 0.004],
             "redLight": [4.679, 0.446, 0.357],
@@ -94,6 +99,10 @@ ctrl_shp_types = ["circle", "triangle", "square", "rectangle", "rectangleRound",
                 "cube", "cubeX", "cubeY", "cubeZ", "cuboid", 
                 "diamond", "pyramid", "pyramidPointing", "axes"]
 
+# extra json shape libraries loaded after the default data/ctrl_shapes.json,
+# shapes with the same name replace the default ones
+CTRL_SHAPE_LIBRARIES = []
+
 '''
 # test colors
 import autorig_settings as sett
@@ -1,2 +1,10 @@
-from . import build_session
+try:
+    from .. import _lazy
+except ImportError: # the package is imported as a top level package
+    import _lazy
 
+# attribute name -> submodule, imported on first access (PEP 562)
+_SUBMODULES = {"build_session": ".build_session"}
+
+
+_lazy.attach(__name__, globals(), _SUBMODULES)
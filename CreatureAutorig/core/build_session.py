@@ -3,3 +3,43 @@ Created on 24. 12. 2023
 
 @author: mstolarz
 '''
+from utils import name_utils
+
+
+class BuildSession(object):
+    '''
+    The class holds the state shared by everything built during a single rig build.
+    Use it as a context manager, the names generated inside of it come from
+    the session's name registry instead of querying the scene for every name.
+    '''
+    def __init__(self, name_registry=None):
+        '''
+        This is the constructor
+        @param name_registry: NameRegistry, if not provided it is seeded from the scene
+                              when the session starts
+        '''
+        self.name_registry = name_registry
+        self.__previous_registry = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.end()
+        return False
+
+    def start(self):
+        '''
+        This method activates the session's name registry
+        '''
+        if self.name_registry is None:
+            self.name_registry = name_utils.registry_from_scene()
+        self.__previous_registry = name_utils.set_registry(self.name_registry)
+
+    def end(self):
+        '''
+        This method restores the name registry which was active before the session started
+        '''
+        name_utils.set_registry(self.__previous_registry)
+        self.__previous_registry = None
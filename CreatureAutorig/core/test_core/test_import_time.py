@@ -0,0 +1,94 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import os
+import sys
+import json
+import subprocess
+import unittest
+import autorig_settings as sett
+
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BUDGET_ENV_VAR = "CA_IMPORT_TIME_BUDGET"
+HEAVY_MODULES = ("maya", "pymel", "numpy")
+
+IMPORT_SCRIPT = '''
+import sys, time, json
+start = time.perf_counter()
+import CreatureAutorig
+from CreatureAutorig import core, data, modules, ui, utils
+duration = time.perf_counter() - start
+print(json.dumps({"time": duration, "modules": sorted(sys.modules)}))
+'''
+
+
+def get_budget():
+    '''
+    The function returns the import time budget in seconds, the environment variable
+    CA_IMPORT_TIME_BUDGET overrides the value defined in autorig_settings
+    @return float
+    '''
+    return float(os.environ.get(BUDGET_ENV_VAR, sett.IMPORT_TIME_BUDGET))
+
+
+def measure_import(repeat=3):
+    '''
+    The function imports the package and all its subpackages in a fresh interpreter
+    @param repeat: int, number of runs, the fastest one is returned
+    @return (float, [str]): time in seconds and the names of the modules loaded by the import
+    '''
+    results = []
+    for _ in range(repeat):
+        res = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], capture_output=True,
+                             text=True, check=True, cwd=os.path.dirname(PACKAGE_DIR))
+        results.append(json.loads(res.stdout))
+
+    fastest = min(results, key=lambda r: r["time"])
+    return fastest["time"], fastest["modules"]
+
+
+class TestImportTime(unittest.TestCase):
+    def test_import_time(self):
+        duration, loaded = measure_import()
+
+        budget = get_budget()
+        self.assertLessEqual(duration, budget,
+                             f"Importing CreatureAutorig took {duration:.4f}s, "
+                             f"the budget is {budget:.4f}s")
+
+        heavy = [m for m in loaded if m.split(".")[0] in HEAVY_MODULES]
+        self.assertEqual(heavy, [], "Heavy modules are imported eagerly")
+        tests = [m for m in loaded if m.startswith("CreatureAutorig.") and ".test_" in m]
+        self.assertEqual(tests, [], "Test modules are imported with the package")
+
+        print ("Successfully ran test_import_time")
+
+    def test_lazy_attributes(self):
+        import CreatureAutorig
+
+        self.assertIn("utils", dir(CreatureAutorig))
+        registry = CreatureAutorig.utils.name_registry.NameRegistry
+        self.assertIs(CreatureAutorig.utils.name_registry.NameRegistry, registry)
+        self.assertRaises(AttributeError, getattr, CreatureAutorig.utils, "missing_utils")
+
+        print ("Successfully ran test_lazy_attributes")
+
+
+def benchmark_import(repeat=10):
+    '''
+    The function prints how long a cold import of the package takes
+    @param repeat: int, number of runs
+    @return float: time in seconds of the fastest run
+    '''
+    duration, loaded = measure_import(repeat)
+    print (f"CreatureAutorig import: {duration*1000:.2f}ms, {len(loaded)} modules loaded, "
+           f"budget: {get_budget()*1000:.2f}ms")
+    return duration
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
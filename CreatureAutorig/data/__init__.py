@@ -1 +1,12 @@
-from . import ca_file
\ No newline at end of file
+try:
+    from .. import _lazy
+except ImportError: # the package is imported as a top level package
+    import _lazy
+
+# attribute name -> submodule, imported on first access (PEP 562)
+_SUBMODULES = {"ca_file": ".ca_file",
+               "shape_library": ".shape_library",
+               "skin_weights": ".skin_weights"}
+
+
+_lazy.attach(__name__, globals(), _SUBMODULES)
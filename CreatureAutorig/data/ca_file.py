@@ -3,3 +3,387 @@ Created on 24. 12. 2023
 
 @author: mstolarz
 '''
+import os
+import json
+import time
+import uuid
+import struct
+import hashlib
+import numpy as np
+from data import skin_weights
+
+
+# file layout, a file is only appended to:
+#   preamble - magic, version (uint32)
+#   blobs - raw little-endian array bytes, every blob starts at ALIGNMENT and is keyed 
+#           by the hash of its bytes, so all chunks and versions with the same data share it
+#   manifest - utf-8 json: metadata, the dtype, shape and blob of every chunk,
+#              all blobs in the file and the footer of the previous version
+#   footer - manifest magic, manifest offset (uint64), manifest size (uint64)
+# every save appends the new blobs, a manifest and a footer, the last footer is the newest version.
+# Version 1 files (preamble, header size (uint32), data offset (uint64), json header, chunks)
+# are still read
+MAGIC = b"CAFILE\x00\x00"
+MANIFEST_MAGIC = b"CAMANIF\x00"
+VERSION = 2
+ALIGNMENT = 64
+PREAMBLE = struct.Struct("<8sI")
+V1_HEADER = struct.Struct("<IQ")
+FOOTER = struct.Struct("<8sQQ")
+DTYPE_KINDS = "biuf" # bool, int, unsigned int, float
+
+
+def write(path, chunks, metadata=None, incremental=True):
+    '''
+    The function saves arrays into a .ca file as a new version. If the file exists,
+    only the chunks whose data is not in it yet are appended together with a new manifest, 
+    the older versions stay readable. A new file is written next to the target 
+    and moved over it when complete
+    @param path: str
+    @param chunks: dict, chunk name -> numpy.ndarray of a numeric dtype,
+                   names can use "/" to group the chunks into sections, e.g. "guides/positions"
+    @param metadata: dict, anything json serializable
+    @param incremental: bool, False writes a new file with this version only
+    @return dict: the manifest of the new version
+    '''
+    previous = None
+    if incremental and os.path.isfile(path):
+        previous = CaFile(path)
+        if previous.version < VERSION:
+            previous = None
+    file_id = previous.file_id if previous else uuid.uuid4().hex
+    blobs = dict(previous.blobs) if previous else {}
+
+    arrays = {}
+    layout = {}
+    for name, array in chunks.items():
+        digest = __source_hash(array, file_id)
+        array = np.asarray(array)
+        if array.dtype.kind not in DTYPE_KINDS:
+            raise ValueError(f"Chunk '{name}': dtype {array.dtype} is not supported")
+        array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+        if digest is None:
+            digest = hashlib.blake2b(array.data, digest_size=16).hexdigest()
+        if digest not in blobs:
+            arrays[digest] = array
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "hash": digest}
+
+    manifest = {"file_id": file_id, "index": previous.index + 1 if previous else 0,
+                "time": time.time(), "previous": previous.footer if previous else None,
+                "metadata": metadata or {}, "chunks": layout, "blobs": blobs}
+
+    if previous is None:
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(PREAMBLE.pack(MAGIC, VERSION))
+            __append_version(f, arrays, manifest)
+        os.replace(temp_path, path)
+        return manifest
+
+    with open(path, "r+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        try:
+            __append_version(f, arrays, manifest)
+        except BaseException:
+            f.truncate(end)
+            raise
+    return manifest
+
+
+def __source_hash(array, file_id):
+    '''
+    This function returns the hash of an unchanged chunk memory mapped from the file,
+    so the chunks which were read and are saved again are not hashed again
+    @param array: anything write takes as a chunk
+    @param file_id: str
+    @return str or None
+    '''
+    source = array if hasattr(array, "ca_source") else getattr(array, "base", None)
+    source_file_id, digest = getattr(source, "ca_source", (None, None))
+    if source_file_id != file_id or not isinstance(array, np.ndarray):
+        return None
+    if (array.dtype, array.shape, array.strides) != (source.dtype, source.shape, source.strides):
+        return None
+    if array.__array_interface__["data"][0] != source.__array_interface__["data"][0]:
+        return None
+    return digest
+
+
+def __append_version(f, arrays, manifest):
+    '''
+    This function appends the blobs, the manifest and the footer of a version
+    @param f: file, opened for writing at its end
+    @param arrays: dict, hash -> contiguous little-endian numpy.ndarray, the new blobs
+    @param manifest: dict, the chunks get the offset and size of their blobs
+    '''
+    blobs = manifest["blobs"]
+    for digest, array in arrays.items():
+        offset = __align(f.tell())
+        f.seek(offset)
+        f.write(array.data)
+        blobs[digest] = [offset, array.nbytes]
+
+    for chunk in manifest["chunks"].values():
+        chunk["offset"], chunk["nbytes"] = blobs[chunk["hash"]]
+
+    data = json.dumps(manifest).encode("utf-8")
+    offset = f.seek(0, os.SEEK_END)
+    f.write(data)
+    f.write(FOOTER.pack(MANIFEST_MAGIC, offset, len(data)))
+
+
+def __align(offset):
+    '''
+    This function rounds the offset up to the next multiple of ALIGNMENT
+    '''
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _read_manifest(f, footer):
+    '''
+    This function reads the manifest of a version
+    @param f: file, opened for reading
+    @param footer: int, offset of the footer of the version
+    @return dict
+    '''
+    f.seek(footer)
+    magic, offset, size = FOOTER.unpack(f.read(FOOTER.size))
+    if magic != MANIFEST_MAGIC:
+        raise ValueError(f"'{f.name}' has no manifest at {footer}, the file is damaged")
+    f.seek(offset)
+    manifest = json.loads(f.read(size).decode("utf-8"))
+    manifest["footer"] = footer
+    return manifest
+
+
+def versions(path):
+    '''
+    The function lists the versions saved in a .ca file
+    @param path: str
+    @return [dict]: "index", "time" and "metadata" of every version, the oldest first
+    '''
+    ca = CaFile(path)
+    result = [{"index": ca.index, "time": ca.time, "metadata": ca.metadata}]
+    with open(path, "rb") as f:
+        previous = ca.previous
+        while previous is not None:
+            manifest = _read_manifest(f, previous)
+            result.append({key: manifest[key] for key in ("index", "time", "metadata")})
+            previous = manifest["previous"]
+
+    return result[::-1]
+
+
+def diff(old, new):
+    '''
+    The function compares the chunks of two versions. Only the manifests are compared,
+    chunks of version 1 files have no hash, so they are always changed
+    @param old: CaFile
+    @param new: CaFile
+    @return dict: "added", "removed", "changed" -> [str], sorted chunk names
+    '''
+    changed = [name for name in set(old.chunks) & set(new.chunks)
+               if old.chunks[name].get("hash") is None
+               or old.chunks[name].get("hash") != new.chunks[name].get("hash")
+               or old.chunks[name]["dtype"] != new.chunks[name]["dtype"]
+               or old.chunks[name]["shape"] != new.chunks[name]["shape"]]
+
+    return {"added": sorted(set(new.chunks) - set(old.chunks)),
+            "removed": sorted(set(old.chunks) - set(new.chunks)),
+            "changed": sorted(changed)}
+
+
+def compact(path):
+    '''
+    The function rewrites a .ca file with its newest version only
+    @param path: str
+    '''
+    ca = CaFile(path)
+    write(path, {name: ca.get(name, mmap=False) for name in ca.names()}, ca.metadata, 
+          incremental=False)
+
+
+class CaFile(object):
+    '''
+    The class reads a version of a .ca file. Only the manifest is read when the file 
+    is opened, the chunks are memory mapped, so only the parts of them which are used are loaded
+    '''
+    def __init__(self, path, version=None):
+        '''
+        This is the constructor
+        @param path: str
+        @param version: int, index of the version, negative indices count from the newest, 
+                        None is the newest version
+        '''
+        self.path = path
+        with open(path, "rb") as f:
+            preamble = f.read(PREAMBLE.size)
+            if len(preamble) < PREAMBLE.size or preamble[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"'{path}' is not a .ca file")
+            self.version = PREAMBLE.unpack(preamble)[1]
+            if self.version > VERSION:
+                raise ValueError(f"'{path}' has version {self.version}, "
+                                 f"the newest supported version is {VERSION}")
+
+            if self.version == 1:
+                manifest = self.__read_v1_header(f)
+            else:
+                manifest = _read_manifest(f, f.seek(0, os.SEEK_END) - FOOTER.size)
+
+            if version is not None:
+                index = version if version >= 0 else manifest["index"] + 1 + version
+                if not 0 <= index <= manifest["index"]:
+                    raise ValueError(f"'{path}' has no version {version}")
+                while manifest["index"] != index:
+                    manifest = _read_manifest(f, manifest["previous"])
+
+        self.file_id = manifest["file_id"]
+        self.index = manifest["index"]
+        self.time = manifest["time"]
+        self.footer = manifest["footer"]
+        self.previous = manifest["previous"]
+        self.metadata = manifest["metadata"]
+        self.chunks = manifest["chunks"]
+        self.blobs = manifest["blobs"]
+
+    def __read_v1_header(self, f):
+        '''
+        This method reads the header of a version 1 file as a manifest
+        @param f: file, opened for reading after the preamble
+        @return dict
+        '''
+        header_size, data_offset = V1_HEADER.unpack(f.read(V1_HEADER.size))
+        header = json.loads(f.read(header_size).decode("utf-8"))
+        for chunk in header["chunks"].values():
+            chunk["offset"] += data_offset
+
+        return {"file_id": None, "index": 0, "time": None, "footer": None, "previous": None,
+                "metadata": header["metadata"], "chunks": header["chunks"], "blobs": {}}
+
+    def __contains__(self, name):
+        return name in self.chunks
+
+    def __getitem__(self, name):
+        return self.get(name)
+
+    def names(self, section=None):
+        '''
+        This method returns the names of the chunks
+        @param section: str, only the chunks named section/... are returned if provided
+        @return [str]
+        '''
+        if section is None:
+            return list(self.chunks)
+        return [name for name in self.chunks if name.startswith(section + "/")]
+
+    def get(self, name, mmap=True):
+        '''
+        This method returns the array of a chunk
+        @param name: str
+        @param mmap: bool, False reads the whole chunk into memory
+        @return numpy.memmap or numpy.ndarray, memory maps are read only
+        '''
+        if name not in self.chunks:
+            raise ValueError(f"'{self.path}' has no chunk '{name}'")
+
+        chunk = self.chunks[name]
+        dtype = np.dtype(chunk["dtype"])
+        shape = tuple(chunk["shape"])
+        if not chunk["nbytes"]:
+            return np.empty(shape, dtype=dtype)
+        if mmap:
+            array = np.memmap(self.path, dtype=dtype, mode="r", shape=shape, 
+                              offset=chunk["offset"])
+            if self.file_id is not None:
+                array.ca_source = (self.file_id, chunk["hash"])
+            return array
+
+        with open(self.path, "rb") as f:
+            f.seek(chunk["offset"])
+            return np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+
+
+def write_rig_data(path, guides=None, ctrls_data=None, weights=None, metadata=None, 
+                   incremental=True):
+    '''
+    The function saves rig data into a .ca file as a new version
+    @param path: str
+    @param guides: dict, guide set name -> (positions (N,3), orientations (N,4) or None)
+    @param ctrls_data: [dict], the result of Control.get_ctrls_data
+    @param weights: dict, mesh name -> skin_weights.SkinWeights, stored as top k weights
+    @param metadata: dict, anything json serializable
+    @param incremental: bool, see write
+    @return dict: the manifest of the new version
+    '''
+    chunks = {}
+    rig_metadata = {"user": metadata or {}, "guides": [], "controls": None, "weights": {}}
+
+    for name, (positions, orientations) in (guides or {}).items():
+        chunks[f"guides/{name}/positions"] = np.asarray(positions, dtype=np.float64)
+        if orientations is not None:
+            chunks[f"guides/{name}/orientations"] = np.asarray(orientations, dtype=np.float64)
+        rig_metadata["guides"].append(name)
+
+    if ctrls_data:
+        shapes = [cvs for ctrl in ctrls_data for cvs in ctrl["cvPositions"]]
+        chunks["controls/cvs"] = np.array([cv for cvs in shapes for cv in cvs],
+                                          dtype=np.float64).reshape(-1, 3)
+        chunks["controls/cv_counts"] = np.array([len(cvs) for cvs in shapes], dtype=np.int32)
+        chunks["controls/degrees"] = np.array([d for ctrl in ctrls_data
+                                               for d in ctrl["degrees"]], dtype=np.int32)
+        rig_metadata["controls"] = [{"name": ctrl["name"], "shapes": ctrl["shapes"]}
+                                    for ctrl in ctrls_data]
+
+    for name, mesh_weights in (weights or {}).items():
+        top_k = mesh_weights.weights
+        if not isinstance(top_k, skin_weights.TopKWeights):
+            top_k = skin_weights.to_top_k(top_k)
+        chunks[f"weights/{name}/indices"] = top_k.indices
+        chunks[f"weights/{name}/values"] = top_k.values
+        rig_metadata["weights"][name] = {"influences": list(mesh_weights.influences),
+                                         "num_influences": top_k.num_influences}
+
+    return write(path, chunks, rig_metadata, incremental)
+
+
+def read_rig_data(path, version=None):
+    '''
+    The function reads rig data saved by write_rig_data.
+    The guides and the weights are memory mapped
+    @param path: str
+    @param version: int, see CaFile
+    @return dict: "guides", "controls", "weights" and "metadata" in the layout
+                  write_rig_data takes
+    '''
+    ca = CaFile(path, version)
+    rig_metadata = ca.metadata
+
+    guides = {}
+    for name in rig_metadata["guides"]:
+        orientations = f"guides/{name}/orientations"
+        guides[name] = (ca[f"guides/{name}/positions"],
+                        ca[orientations] if orientations in ca else None)
+
+    ctrls_data = None
+    if rig_metadata["controls"]:
+        cvs = ca.get("controls/cvs", mmap=False).tolist()
+        ends = np.cumsum(ca.get("controls/cv_counts", mmap=False)).tolist()
+        degrees = ca.get("controls/degrees", mmap=False).tolist()
+        shapes = [[tuple(cv) for cv in cvs[end-count:end]]
+                  for end, count in zip(ends, np.diff([0] + ends).tolist())]
+        ctrls_data = []
+        first = 0
+        for ctrl in rig_metadata["controls"]:
+            last = first + len(ctrl["shapes"])
+            ctrls_data.append({"name": ctrl["name"], "shapes": ctrl["shapes"],
+                               "degrees": degrees[first:last], "cvPositions": shapes[first:last]})
+            first = last
+
+    weights = {}
+    for name, mesh in rig_metadata["weights"].items():
+        top_k = skin_weights.TopKWeights(ca[f"weights/{name}/indices"],
+                                         ca[f"weights/{name}/values"], mesh["num_influences"])
+        weights[name] = skin_weights.SkinWeights(mesh["influences"], top_k)
+
+    return {"guides": guides, "controls": ctrls_data, "weights": weights,
+            "metadata": rig_metadata["user"]}
@@ -5,10 +5,14 @@ Created on 24. 12. 2023
 '''
 import importlib
 from data import ca_file
+from data import shape_library
+from data import skin_weights
 
 
 def reload_it():
-    importlib.reload(ca_file)    
+    importlib.reload(ca_file)
+    importlib.reload(shape_library)    
+    importlib.reload(skin_weights)
 
     
     print ("Data reload: OK")
\ No newline at end of file
@@ -0,0 +1,181 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import os
+import json
+from collections import namedtuple
+import numpy as np
+import autorig_settings as sett
+
+
+DEFAULT_LIBRARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ctrl_shapes.json")
+FORMS = ("open", "periodic")
+
+CurveData = namedtuple("CurveData", ["degree", "form", "points", "knots", "color"])
+# degree: int
+# form: str, "open" or "periodic"
+# points: numpy.ndarray float32 (N,3), for periodic curves only the unique CVs are stored
+# knots: numpy.ndarray float64, the full knot vector
+# color: str, color name defined in autorig_settings which overrides the control color or None
+
+_shapes = None # shape name -> tuple of CurveData, filled in on first use
+
+
+def get_shape(shape_type):
+    '''
+    The function returns the curves the control shape is made of
+    @param shape_type: str, name of the shape
+    @return (CurveData)
+    '''
+    shapes = __load()
+    if shape_type not in shapes:
+        raise ValueError(f"Unrecognized shape name: {shape_type}")
+
+    return shapes[shape_type]
+
+
+def has_shape(shape_type):
+    '''
+    The function checks if the shape is defined in any of the loaded libraries
+    @param shape_type: str
+    @return bool
+    '''
+    return shape_type in __load()
+
+
+def shape_names():
+    '''
+    The function returns names of all the available shapes
+    @return [str]
+    '''
+    return list(__load())
+
+
+def library_paths():
+    '''
+    The function returns the shape library files in the order they are loaded.
+    The default library goes first, the files listed in autorig_settings.CTRL_SHAPE_LIBRARIES
+    can add new shapes or replace the default ones.
+    @return [str]
+    '''
+    return [DEFAULT_LIBRARY] + list(getattr(sett, "CTRL_SHAPE_LIBRARIES", []))
+
+
+def reload_library():
+    '''
+    The function drops the cached shapes, they are loaded again on the next request
+    '''
+    global _shapes
+    _shapes = None
+
+
+def __load():
+    '''
+    This method loads all the libraries the first time the shapes are needed
+    '''
+    global _shapes
+    if _shapes is None:
+        shapes = {}
+        for path in library_paths():
+            shapes.update(read_library(path))
+        _shapes = shapes
+
+    return _shapes
+
+
+def read_library(path):
+    '''
+    The function reads and validates a shape library file
+    @param path: str, path to the json file
+    @return dict: shape name -> tuple of CurveData
+    '''
+    with open(path, "r") as f:
+        data = json.load(f)
+
+    shapes = {}
+    for name, shape in data["shapes"].items():
+        curves = []
+        for crv in shape["curves"]:
+            curve = CurveData(degree=int(crv["degree"]),
+                              form=crv.get("form", "open"),
+                              points=np.array(crv["points"], dtype=np.float32).reshape(-1, 3),
+                              knots=np.array(crv["knots"], dtype=float),
+                              color=crv.get("color"))
+            validate_curve(curve, name)
+            curves.append(curve)
+        if not curves:
+            raise ValueError(f"Shape '{name}' in {path} has no curves")
+        shapes[name] = tuple(curves)
+
+    return shapes
+
+
+def validate_curve(curve, name=""):
+    '''
+    The function checks if the curve data can be used to build a nurbs curve
+    @param curve: CurveData
+    @param name: str, shape name used in the error message
+    '''
+    if curve.degree < 1:
+        raise ValueError(f"Shape '{name}': degree has to be at least 1")
+    if curve.form not in FORMS:
+        raise ValueError(f"Shape '{name}': form has to be one of {FORMS}")
+    if len(curve.points) <= curve.degree:
+        raise ValueError(f"Shape '{name}': not enough points for degree {curve.degree}")
+    if len(curve.knots) != knot_count(len(curve.points), curve.degree, curve.form):
+        raise ValueError(f"Shape '{name}': wrong number of knots")
+    if curve.color is not None and curve.color not in sett.colors:
+        raise ValueError(f"Shape '{name}': color '{curve.color}' is not valid")
+
+    return True
+
+
+def knot_count(num_points, degree, form="open"):
+    '''
+    The function returns the length of the knot vector Maya expects for a curve
+    @param num_points: int, number of CVs (unique CVs for periodic curves)
+    @param degree: int
+    @param form: str, "open" or "periodic"
+    @return int
+    '''
+    if form == "periodic":
+        return num_points + 2*degree - 1
+
+    return num_points + degree - 1
+
+
+def curve_points(curve):
+    '''
+    The function returns the CV positions in the layout Maya expects when creating a curve,
+    periodic curves get the first 'degree' CVs repeated at the end
+    @param curve: CurveData
+    @return numpy.ndarray: float32 (N,3)
+    '''
+    if curve.form == "periodic":
+        return np.concatenate([curve.points, curve.points[:curve.degree]])
+
+    return curve.points
+
+
+def write_library(path, shapes):
+    '''
+    The function writes shapes into a library file, one shape per line
+    @param path: str
+    @param shapes: dict, shape name -> list of CurveData
+    '''
+    lines = []
+    for name, curves in shapes.items():
+        data = []
+        for crv in curves:
+            crv_data = {"degree": int(crv.degree), "form": crv.form,
+                        "points": [round(float(v), 6) + 0.0 for v in np.ravel(crv.points)],
+                        "knots": [float(k) if k % 1 else int(k) for k in crv.knots]}
+            if crv.color:
+                crv_data["color"] = crv.color
+            data.append(crv_data)
+        lines.append(json.dumps(name) + ": " + json.dumps({"curves": data}, separators=(",", ":")))
+
+    with open(path, "w") as f:
+        f.write('{"version": 1, "shapes": {\n' + ",\n".join(lines) + "\n}}\n")
@@ -0,0 +1,418 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+from collections import namedtuple
+import numpy as np
+from utils import spatial_utils
+
+
+SkinWeights = namedtuple("SkinWeights", ["influences", "weights"])
+# influences: [str], influence names, one per column of the weights
+# weights: numpy.ndarray (V,I), CsrWeights or TopKWeights, vertex x influence
+
+CsrWeights = namedtuple("CsrWeights", ["indptr", "indices", "values", "shape"])
+# compressed sparse rows, only the non-zero weights are stored
+# indptr: numpy.ndarray int64 (V+1,), weights of vertex v are at indptr[v]:indptr[v+1]
+# indices: numpy.ndarray int32, influence index of every stored weight
+# values: numpy.ndarray float, the weights
+# shape: (int, int), number of vertices and influences
+
+TRANSFER_METHODS = ("idw", "barycentric")
+# idw - the weights of the k nearest source vertices blended by inverse distance
+# barycentric - the weights of the closest source triangle blended by barycentric coordinates
+
+TopKWeights = namedtuple("TopKWeights", ["indices", "values", "num_influences"])
+# the K highest weights of every vertex in fixed width arrays, sorted from the highest
+# indices: numpy.ndarray int16 (V,K), influence indices, -1 in the unused slots
+# values: numpy.ndarray float32 (V,K), the weights, 0 in the unused slots
+# num_influences: int
+
+
+def to_csr(dense, threshold=0.0):
+    '''
+    The function converts dense weights into compressed sparse rows
+    @param dense: numpy.ndarray (V,I)
+    @param threshold: float, weights less or equal to it are not stored
+    @return CsrWeights
+    '''
+    dense = np.asarray(dense)
+    if dense.ndim != 2:
+        raise ValueError(f"Dense weights have to be a 2D array, got shape {dense.shape}")
+
+    rows, cols = np.nonzero(dense > threshold)
+    indptr = np.zeros(len(dense) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(dense)), out=indptr[1:])
+
+    return CsrWeights(indptr, cols.astype(np.int32), dense[rows, cols], dense.shape)
+
+
+def to_top_k(weights, k=None):
+    '''
+    The function keeps the k highest weights of every vertex.
+    It is lossless (in float32) if no vertex has more than k weights
+    @param weights: numpy.ndarray (V,I), CsrWeights or TopKWeights
+    @param k: int, None uses the highest number of weights a vertex has
+    @return TopKWeights
+    '''
+    dense = to_dense(weights)
+    num_influences = dense.shape[1]
+    if num_influences > np.iinfo(np.int16).max:
+        raise ValueError(f"Too many influences for int16 indices: {num_influences}")
+    if k is None:
+        k = max(int(np.count_nonzero(dense > 0.0, axis=1).max(initial=0)), 1)
+    k = min(k, num_influences)
+
+    if k < num_influences:
+        # the weights above the k-th highest one and the ones equal to it with the lowest
+        # indices, so ties are broken the same way as in argmax
+        kth = -np.partition(-dense, k-1, axis=1)[:, k-1:k]
+        above = dense > kth
+        tied = dense == kth
+        tied &= np.cumsum(tied, axis=1) <= k - np.count_nonzero(above, axis=1)[:, None]
+        columns = np.nonzero(above | tied)[1].reshape(-1, k)
+    else:
+        columns = np.broadcast_to(np.arange(num_influences), dense.shape)
+    values = np.take_along_axis(dense, columns, axis=1)
+    order = np.argsort(-values, axis=1, kind="stable")
+    columns = np.take_along_axis(columns, order, axis=1)
+    values = np.take_along_axis(values, order, axis=1)
+
+    used = values > 0.0
+    return TopKWeights(np.where(used, columns, -1).astype(np.int16),
+                       np.where(used, values, 0.0).astype(np.float32), num_influences)
+
+
+def prune(top_k, threshold):
+    '''
+    The function removes the weights lower than the threshold
+    @param top_k: TopKWeights
+    @param threshold: float
+    @return TopKWeights
+    '''
+    removed = top_k.values < threshold
+    return top_k._replace(indices=np.where(removed, -1, top_k.indices).astype(np.int16),
+                          values=np.where(removed, 0.0, top_k.values).astype(np.float32))
+
+
+def cap_influences(top_k, max_influences):
+    '''
+    The function keeps only the highest weights of every vertex
+    @param top_k: TopKWeights
+    @param max_influences: int, maximum number of influences per vertex
+    @return TopKWeights: with max_influences columns
+    '''
+    if max_influences < 1:
+        raise ValueError("Every vertex has to keep at least one influence")
+
+    return top_k._replace(indices=top_k.indices[:, :max_influences].copy(), 
+                          values=top_k.values[:, :max_influences].copy())
+
+
+def to_dense(weights):
+    '''
+    The function returns the weights as a dense vertex x influence matrix
+    @param weights: numpy.ndarray (V,I), CsrWeights or TopKWeights
+    @return numpy.ndarray (V,I)
+    '''
+    if isinstance(weights, TopKWeights):
+        dense = np.zeros((len(weights.values), weights.num_influences), dtype=np.float32)
+        rows, slots = np.nonzero(weights.indices >= 0)
+        dense[rows, weights.indices[rows, slots]] = weights.values[rows, slots]
+        return dense
+
+    if not isinstance(weights, CsrWeights):
+        return np.asarray(weights)
+
+    dense = np.zeros(weights.shape, dtype=weights.values.dtype)
+    dense[csr_rows(weights), weights.indices] = weights.values
+    return dense
+
+
+def csr_rows(csr):
+    '''
+    The function returns the vertex index of every stored weight
+    @param csr: CsrWeights
+    @return numpy.ndarray int64
+    '''
+    return np.repeat(np.arange(csr.shape[0]), np.diff(csr.indptr))
+
+
+def dominant_influences(weights):
+    '''
+    The function returns the influence with the highest weight for every vertex
+    @param weights: numpy.ndarray (V,I), CsrWeights or TopKWeights
+    @return numpy.ndarray int64 (V,): influence index, -1 for vertices without weights
+    '''
+    if isinstance(weights, TopKWeights):
+        return weights.indices[:, 0].astype(np.int64)
+
+    if not isinstance(weights, CsrWeights):
+        weights = np.asarray(weights)
+        result = np.argmax(weights, axis=1)
+        result[~np.any(weights > 0.0, axis=1)] = -1
+        return result
+
+    # sorted by the vertex, the weight and the reversed influence index, the dominant
+    # influence goes last, equal weights are won by the lower index like in argmax
+    order = np.lexsort((-weights.indices, weights.values, csr_rows(weights)))
+    counts = np.diff(weights.indptr)
+    result = np.full(weights.shape[0], -1, dtype=np.int64)
+    result[counts > 0] = weights.indices[order[weights.indptr[1:][counts > 0] - 1]]
+    return result
+
+
+def influence_vertices(skin_weights):
+    '''
+    The function returns the vertices every influence dominates
+    @param skin_weights: SkinWeights
+    @return dict: influence name -> numpy.ndarray of vertex indices,
+            influences which don't dominate any vertex are left out
+    '''
+    dominant = dominant_influences(skin_weights.weights)
+    order = np.argsort(dominant, kind="stable")
+    found, starts = np.unique(dominant[order], return_index=True)
+    groups = np.split(order, starts[1:])
+
+    return {skin_weights.influences[i]: vertices for i, vertices in zip(found, groups) if i >= 0}
+
+
+def influence_map(source, target):
+    '''
+    The function maps influences by name, the namespaces and the DAG paths are ignored
+    @param source: [str], influence names
+    @param target: [str], influence names
+    @return numpy.ndarray int64: for every source influence its index in the target
+    '''
+    target_index = {short_name(name): i for i, name in enumerate(target)}
+    missing = [name for name in source if short_name(name) not in target_index]
+    if missing:
+        raise ValueError(f"Influences not found: {', '.join(missing)}")
+
+    return np.array([target_index[short_name(name)] for name in source], dtype=np.int64)
+
+
+def short_name(name):
+    '''
+    The function returns the name without the DAG path and the namespace
+    @param name: str
+    @return str
+    '''
+    return name.rsplit("|", 1)[-1].rsplit(":", 1)[-1]
+
+
+def remap(skin_weights, influences):
+    '''
+    The function reorders the weights to match other influences, matched by name.
+    The influences the weights don't use get zero weights
+    @param skin_weights: SkinWeights
+    @param influences: [str], must contain all the influences of the weights
+    @return SkinWeights: the same layout as the input
+    '''
+    columns = influence_map(skin_weights.influences, influences)
+    weights = skin_weights.weights
+    if isinstance(weights, TopKWeights):
+        weights = TopKWeights(np.where(weights.indices >= 0, columns[weights.indices], 
+                                       -1).astype(np.int16),
+                              weights.values, len(influences))
+    elif isinstance(weights, CsrWeights):
+        weights = CsrWeights(weights.indptr, columns[weights.indices].astype(np.int32),
+                             weights.values, (weights.shape[0], len(influences)))
+    else:
+        dense = np.zeros((len(weights), len(influences)), dtype=weights.dtype)
+        dense[:, columns] = weights
+        weights = dense
+
+    return SkinWeights(list(influences), weights)
+
+
+def normalize(weights):
+    '''
+    The function scales the weights of every vertex to add up to 1,
+    vertices without weights are left at zero
+    @param weights: numpy.ndarray (V,I), CsrWeights or TopKWeights
+    @return the same type as the input
+    '''
+    if isinstance(weights, TopKWeights):
+        sums = weights.values.sum(axis=1, keepdims=True)
+        return weights._replace(values=weights.values / np.where(sums > 0.0, sums, 1.0))
+
+    if isinstance(weights, CsrWeights):
+        rows = csr_rows(weights)
+        sums = np.bincount(rows, weights.values, minlength=weights.shape[0])
+        return weights._replace(values=weights.values / np.where(sums > 0.0, sums, 1.0)[rows])
+
+    weights = np.asarray(weights)
+    sums = weights.sum(axis=1, keepdims=True)
+    return weights / np.where(sums > 0.0, sums, 1.0)
+
+
+def transfer(source_points, skin_weights, target_points, method="idw", k=4, power=2.0, 
+             triangles=None):
+    '''
+    The function transfers weights between meshes with different topology, 
+    e.g. to a retopologized creature mesh. All the target vertices are looked up 
+    in a KD-tree of the source vertices at once and the weights are blended in NumPy
+    @param source_points: numpy.ndarray (V,3), positions of the source vertices
+    @param skin_weights: SkinWeights, weights of the source vertices
+    @param target_points: numpy.ndarray (T,3), positions of the target vertices
+    @param method: str, one of TRANSFER_METHODS
+    @param k: int, number of source vertices blended with the "idw" method
+    @param power: float, the weights fall off with distance**power with the "idw" method
+    @param triangles: numpy.ndarray int (F,3), vertex indices of the source triangles, 
+                      needed by the "barycentric" method
+    @return SkinWeights: dense normalized weights of the target vertices
+    '''
+    if method not in TRANSFER_METHODS:
+        raise ValueError(f"Transfer method has to be one of {TRANSFER_METHODS}, got: {method}")
+    source_points = np.asarray(source_points, dtype=float).reshape(-1, 3)
+    target_points = np.asarray(target_points, dtype=float).reshape(-1, 3)
+    top_k = to_top_k(skin_weights.weights)
+    if len(top_k.values) != len(source_points):
+        raise ValueError(f"{len(source_points)} source points don't match "
+                         f"the weights of {len(top_k.values)} vertices")
+
+    tree = spatial_utils.KDTree(source_points)
+    if method == "idw":
+        distances, vertices = tree.query(target_points, min(k, len(source_points)))
+        exact = distances < spatial_utils.TOLERANCE
+        blend = np.where(exact.any(axis=1, keepdims=True), exact, 
+                         1.0 / np.maximum(distances, spatial_utils.TOLERANCE)**power)
+    else:
+        if triangles is None:
+            raise ValueError("The barycentric transfer needs the source triangles")
+        _, nearest = tree.query(target_points, 1)
+        vertices, blend = __closest_triangles(source_points, np.asarray(triangles), 
+                                              target_points, nearest[:, 0])
+
+    blend = blend / blend.sum(axis=1, keepdims=True)
+
+    # the top k weights of the blended vertices scaled and summed up per target vertex
+    columns = top_k.indices[vertices]
+    values = top_k.values[vertices] * blend[:, :, None]
+    rows = np.broadcast_to(np.arange(len(target_points))[:, None, None], columns.shape)
+    used = columns >= 0
+    num_influences = top_k.num_influences
+    dense = np.bincount(rows[used]*num_influences + columns[used], values[used], 
+                        minlength=len(target_points)*num_influences)
+
+    return SkinWeights(list(skin_weights.influences), 
+                       normalize(dense.reshape(-1, num_influences)))
+
+
+def __closest_triangles(points, triangles, target_points, nearest):
+    '''
+    This function finds the closest triangle among the triangles around the nearest vertex 
+    of every target point and returns its vertices and the barycentric coordinates 
+    of the closest point on it. Points with no triangles around get the nearest vertex
+    @return (numpy.ndarray, numpy.ndarray): vertices (T,3) and coordinates (T,3)
+    '''
+    # triangles around every vertex
+    flat = triangles.ravel()
+    vertex_triangles = np.argsort(flat, kind="stable") // 3
+    counts = np.bincount(flat, minlength=len(points))
+    starts = np.cumsum(counts) - counts
+
+    # every target point paired with the triangles around its nearest vertex
+    pair_counts = counts[nearest]
+    targets = np.repeat(np.arange(len(target_points)), pair_counts)
+    offsets = np.arange(len(targets)) - np.repeat(np.cumsum(pair_counts) - pair_counts, 
+                                                  pair_counts)
+    pair_triangles = triangles[vertex_triangles[np.repeat(starts[nearest], pair_counts) + 
+                                                offsets]]
+
+    # barycentric coordinates of the point projected on the plane of the triangle,
+    # clamped to the triangle
+    corners = points[pair_triangles]
+    v0 = corners[:, 1] - corners[:, 0]
+    v1 = corners[:, 2] - corners[:, 0]
+    v2 = target_points[targets] - corners[:, 0]
+    d00 = np.einsum("ij,ij->i", v0, v0)
+    d01 = np.einsum("ij,ij->i", v0, v1)
+    d11 = np.einsum("ij,ij->i", v1, v1)
+    d20 = np.einsum("ij,ij->i", v2, v0)
+    d21 = np.einsum("ij,ij->i", v2, v1)
+    denom = d00*d11 - d01*d01
+    valid = denom > spatial_utils.TOLERANCE
+    denom = np.where(valid, denom, 1.0)
+    v = (d11*d20 - d01*d21) / denom
+    w = (d00*d21 - d01*d20) / denom
+    coords = np.maximum(np.stack([1.0 - v - w, v, w], axis=1), 0.0)
+    coords /= coords.sum(axis=1, keepdims=True)
+
+    projected = np.einsum("ij,ijk->ik", coords, corners)
+    dist = np.where(valid, np.linalg.norm(projected - target_points[targets], axis=1), np.inf)
+
+    # the closest triangle of every target point, the pairs are sorted by the target point
+    order = np.lexsort((dist, targets))
+    found = np.flatnonzero(pair_counts > 0)
+    closest = order[(np.cumsum(pair_counts) - pair_counts)[found]]
+    found, closest = found[np.isfinite(dist[closest])], closest[np.isfinite(dist[closest])]
+
+    vertices = np.repeat(nearest[:, None], 3, axis=1)
+    vertices[found] = pair_triangles[closest]
+    result = np.zeros((len(target_points), 3))
+    result[:, 0] = 1.0
+    result[found] = coords[closest]
+
+    return vertices, result
+
+
+def export_weights(skin_cluster):
+    '''
+    The function reads all the weights of a skinCluster with a single getWeights call
+    @param skin_cluster: str, name of the skinCluster
+    @return SkinWeights: dense weights
+    '''
+    fn_skin, mesh_dag, components = __skin_cluster_data(skin_cluster)
+    influences = [dag.partialPathName() for dag in fn_skin.influenceObjects()]
+
+    weights, count = fn_skin.getWeights(mesh_dag, components)
+    weights = np.array(weights, dtype=float).reshape(-1, count)
+
+    return SkinWeights(influences, weights)
+
+
+def import_weights(skin_cluster, skin_weights, normalize_weights=True):
+    '''
+    The function writes weights into a skinCluster with a single setWeights call.
+    The influences are matched by name, so their order in the skinCluster doesn't matter
+    @param skin_cluster: str, name of the skinCluster
+    @param skin_weights: SkinWeights, dense or CSR, one row per vertex of the mesh
+    @param normalize_weights: bool
+    '''
+    import maya.api.OpenMaya as om2
+
+    fn_skin, mesh_dag, components = __skin_cluster_data(skin_cluster)
+    influences = [dag.partialPathName() for dag in fn_skin.influenceObjects()]
+
+    skin_weights = remap(skin_weights, influences)
+    weights = to_dense(skin_weights.weights)
+    num_vertices = om2.MFnMesh(mesh_dag).numVertices
+    if len(weights) != num_vertices:
+        raise ValueError(f"The weights have {len(weights)} vertices, "
+                         f"the mesh has {num_vertices}")
+
+    fn_skin.setWeights(mesh_dag, components, om2.MIntArray(list(range(len(influences)))),
+                       om2.MDoubleArray(weights.ravel().tolist()), normalize_weights)
+
+
+def __skin_cluster_data(skin_cluster):
+    '''
+    This function returns the function set of the skinCluster, the DAG path of its mesh
+    and the component holding all the vertices of the mesh
+    '''
+    import maya.api.OpenMaya as om2
+    import maya.api.OpenMayaAnim as oma2
+
+    sel = om2.MSelectionList()
+    sel.add(skin_cluster)
+    fn_skin = oma2.MFnSkinCluster(sel.getDependNode(0))
+    mesh_dag = fn_skin.getPathAtIndex(0)
+
+    fn_comp = om2.MFnSingleIndexedComponent()
+    components = fn_comp.create(om2.MFn.kMeshVertComponent)
+    fn_comp.setCompleteData(om2.MFnMesh(mesh_dag).numVertices)
+
+    return fn_skin, mesh_dag, components
@@ -0,0 +1,253 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import os
+import json
+import time
+import struct
+import tempfile
+import unittest
+import numpy as np
+from data import ca_file
+from data import skin_weights
+from data.test_data.test_skin_weights import random_weights
+
+
+def ctrls_data():
+    '''
+    The function creates data in the layout of Control.get_ctrls_data
+    @return [dict]
+    '''
+    return [{"name": "arm_L_ctrl", "shapes": ["arm_L_ctrlShape"], "degrees": [1],
+             "cvPositions": [[(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (1.0, 1.0, 0.0)]]},
+            {"name": "root_M_ctrl", "shapes": ["root_M_ctrlShape", "root_M_ctrlShape1"],
+             "degrees": [3, 1],
+             "cvPositions": [[(0.0, 0.0, float(i)) for i in range(6)],
+                             [(-1.0, 0.0, 0.0), (1.0, 0.0, 0.0)]]}]
+
+
+class TestCaFile(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        self.addCleanup(temp_dir.cleanup)
+        self.path = os.path.join(temp_dir.name, "rig.ca")
+
+    def test_write(self):
+        chunks = {"guides/positions": np.arange(12, dtype=np.float64).reshape(4, 3),
+                  "weights/indices": np.array([[3, -1], [0, 1]], dtype=np.int16),
+                  "weights/values": np.array([[1.0, 0.0], [0.25, 0.75]], dtype=np.float32),
+                  "empty": np.zeros((0, 3), dtype=np.int32),
+                  "big_endian": np.arange(5, dtype=">i4")}
+        ca_file.write(self.path, chunks, {"asset": "dragon"})
+
+        ca = ca_file.CaFile(self.path)
+        self.assertEqual(ca.version, ca_file.VERSION)
+        self.assertEqual(ca.metadata, {"asset": "dragon"})
+        self.assertEqual(ca.names("weights"), ["weights/indices", "weights/values"])
+        self.assertNotIn("guides", ca)
+        for name, array in chunks.items():
+            self.assertEqual(ca.chunks[name]["offset"] % ca_file.ALIGNMENT, 0)
+            for mmap in (True, False):
+                result = ca.get(name, mmap)
+                self.assertEqual(result.shape, array.shape)
+                self.assertEqual(result.dtype.kind, array.dtype.kind)
+                self.assertTrue(np.array_equal(result, array))
+        self.assertIsInstance(ca["guides/positions"], np.memmap)
+        self.assertEqual(ca["big_endian"].dtype, np.dtype("<i4"))
+        self.assertRaises(ValueError, ca.get, "guides")
+
+        self.assertRaises(ValueError, ca_file.write, self.path, {"names": np.array(["a"])})
+        with open(self.path, "wb") as f:
+            f.write(b"{}")
+        self.assertRaises(ValueError, ca_file.CaFile, self.path)
+
+        print ("Successfully ran test_write")
+
+    def test_rig_data(self):
+        positions = np.random.default_rng(0).random((5, 3))
+        orientations = np.tile([0.0, 0.0, 0.0, 1.0], (5, 1))
+        weights = skin_weights.SkinWeights([f"joint{i}_M_jnt" for i in range(6)],
+                                           random_weights(40, 6, per_vertex=3))
+        ca_file.write_rig_data(self.path,
+                               guides={"arm_L": (positions, orientations),
+                                       "tail_M": (positions[:2], None)},
+                               ctrls_data=ctrls_data(), weights={"body": weights},
+                               metadata={"asset": "dragon"})
+
+        rig_data = ca_file.read_rig_data(self.path)
+        self.assertEqual(rig_data["metadata"], {"asset": "dragon"})
+        self.assertTrue(np.array_equal(rig_data["guides"]["arm_L"][0], positions))
+        self.assertTrue(np.array_equal(rig_data["guides"]["arm_L"][1], orientations))
+        self.assertIsNone(rig_data["guides"]["tail_M"][1])
+        self.assertEqual(rig_data["controls"], ctrls_data())
+
+        result = rig_data["weights"]["body"]
+        self.assertEqual(result.influences, weights.influences)
+        self.assertIsInstance(result.weights, skin_weights.TopKWeights)
+        self.assertIsInstance(result.weights.values, np.memmap)
+        self.assertTrue(np.allclose(skin_weights.to_dense(result.weights), weights.weights))
+
+        ca_file.write_rig_data(self.path)
+        rig_data = ca_file.read_rig_data(self.path)
+        self.assertEqual(rig_data["guides"], {})
+        self.assertIsNone(rig_data["controls"])
+
+        print ("Successfully ran test_rig_data")
+
+    def test_incremental(self):
+        weights = np.random.default_rng(0).random((1000, 4)).astype(np.float32)
+        positions = np.zeros((10, 3))
+        ca_file.write(self.path, {"positions": positions, "weights": weights}, {"save": 0})
+        size = os.path.getsize(self.path)
+
+        # only the changed positions are appended
+        ca = ca_file.CaFile(self.path)
+        positions = np.array(ca["positions"])
+        positions[3] = (1.0, 2.0, 3.0)
+        manifest = ca_file.write(self.path, {"positions": positions, "weights": ca["weights"],
+                                             "copy": weights.copy()}, {"save": 1})
+        self.assertEqual(manifest["index"], 1)
+        self.assertLess(os.path.getsize(self.path) - size, weights.nbytes)
+        self.assertEqual(manifest["chunks"]["copy"]["offset"],
+                         manifest["chunks"]["weights"]["offset"])
+
+        old, new = ca_file.CaFile(self.path, 0), ca_file.CaFile(self.path)
+        self.assertEqual(ca_file.CaFile(self.path, -2).index, 0)
+        self.assertFalse(old["positions"].any())
+        self.assertTrue(np.array_equal(new["positions"], positions))
+        self.assertTrue(np.array_equal(new["copy"], weights))
+        self.assertEqual(ca_file.diff(old, new), {"added": ["copy"], "removed": [],
+                                                  "changed": ["positions"]})
+        self.assertEqual([v["metadata"] for v in ca_file.versions(self.path)],
+                         [{"save": 0}, {"save": 1}])
+        self.assertRaises(ValueError, ca_file.CaFile, self.path, 2)
+
+        ca_file.compact(self.path)
+        self.assertEqual(len(ca_file.versions(self.path)), 1)
+        self.assertLess(os.path.getsize(self.path), size + positions.nbytes)
+        self.assertTrue(np.array_equal(ca_file.CaFile(self.path)["positions"], positions))
+
+        print ("Successfully ran test_incremental")
+
+    def test_version_1(self):
+        header = json.dumps({"metadata": {"asset": "dragon"},
+                             "chunks": {"positions": {"dtype": "<f8", "shape": [2, 3],
+                                                      "offset": 0, "nbytes": 48}}}).encode()
+        with open(self.path, "wb") as f:
+            f.write(struct.pack("<8sIIQ", ca_file.MAGIC, 1, len(header), 256))
+            f.write(header)
+            f.seek(256)
+            f.write(np.arange(6, dtype="<f8").tobytes())
+
+        ca = ca_file.CaFile(self.path)
+        self.assertEqual(ca.version, 1)
+        self.assertTrue(np.array_equal(ca["positions"], np.arange(6).reshape(2, 3)))
+
+        # a version 1 file is rewritten, not appended to
+        ca_file.write(self.path, {"positions": ca["positions"]})
+        ca = ca_file.CaFile(self.path)
+        self.assertEqual((ca.version, ca.index), (ca_file.VERSION, 0))
+        self.assertTrue(np.array_equal(ca["positions"], np.arange(6).reshape(2, 3)))
+
+        print ("Successfully ran test_version_1")
+
+
+def benchmark_ca_file(num_vertices=1000000, k=8, num_influences=200):
+    '''
+    The function writes top k weights of millions of vertices into a .ca file 
+    and compares reading a few vertices through a memory map with reading the whole file
+    @param num_vertices: int
+    @param k: int, weights per vertex
+    @param num_influences: int
+    @return dict: operation -> time in seconds
+    '''
+    rng = np.random.default_rng(0)
+    indices = rng.integers(0, num_influences, size=(num_vertices, k)).astype(np.int16)
+    values = rng.random((num_vertices, k)).astype(np.float32)
+    weights = skin_weights.SkinWeights([f"joint{i}_M_jnt" for i in range(num_influences)],
+                                       skin_weights.TopKWeights(indices, values, num_influences))
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as temp_dir:
+        path = os.path.join(temp_dir, "rig.ca")
+
+        results = {}
+        start = time.perf_counter()
+        ca_file.write_rig_data(path, weights={"body": weights})
+        results["write"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rig_data = ca_file.read_rig_data(path)
+        float(rig_data["weights"]["body"].weights.values[num_vertices // 2].sum())
+        results["memmap read"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ca = ca_file.CaFile(path)
+        ca.get("weights/body/indices", mmap=False)
+        ca.get("weights/body/values", mmap=False)
+        results["full read"] = time.perf_counter() - start
+
+        del rig_data, ca
+
+        print (f"{num_vertices} vertices, k={k} ({os.path.getsize(path) / 2**20:.1f} MB)")
+        for operation, seconds in results.items():
+            print (f"{operation}: {seconds:.4f}s")
+        return results
+
+
+def benchmark_incremental_save(num_joints=5000, num_vertices=1000000, k=8, num_influences=200):
+    '''
+    The function saves a large rig file, moves one guide and compares saving
+    the edit incrementally with rewriting the whole file
+    @param num_joints: int
+    @param num_vertices: int
+    @param k: int, weights per vertex
+    @param num_influences: int
+    @return dict: operation -> time in seconds
+    '''
+    rng = np.random.default_rng(0)
+    indices = rng.integers(0, num_influences, size=(num_vertices, k)).astype(np.int16)
+    values = rng.random((num_vertices, k)).astype(np.float32)
+    weights = skin_weights.SkinWeights([f"joint{i}_M_jnt" for i in range(num_influences)],
+                                       skin_weights.TopKWeights(indices, values, num_influences))
+    guides = {"body_M": (rng.random((num_joints, 3)), np.tile([0.0, 0.0, 0.0, 1.0], (num_joints, 1)))}
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as temp_dir:
+        path = os.path.join(temp_dir, "rig.ca")
+        ca_file.write_rig_data(path, guides, ctrls_data(), {"body": weights})
+        size = os.path.getsize(path)
+
+        rig_data = ca_file.read_rig_data(path)
+        positions, orientations = rig_data["guides"]["body_M"]
+        positions = np.array(positions)
+        positions[num_joints // 2, 1] += 1.0
+        guides = {"body_M": (positions, orientations)}
+
+        results = {}
+        start = time.perf_counter()
+        ca_file.write_rig_data(path, guides, rig_data["controls"], rig_data["weights"])
+        results["incremental save"] = time.perf_counter() - start
+        appended = os.path.getsize(path) - size
+
+        # the same edit without the memory mapped chunks, every chunk is hashed
+        positions[num_joints // 2, 1] += 1.0
+        start = time.perf_counter()
+        ca_file.write_rig_data(path, guides, rig_data["controls"], {"body": weights})
+        results["incremental save, hashing"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ca_file.write_rig_data(path, guides, rig_data["controls"], {"body": weights}, 
+                               incremental=False)
+        results["full save"] = time.perf_counter() - start
+
+        del rig_data
+
+        print (f"{num_joints} joints, {num_vertices} vertices ({size / 2**20:.1f} MB), "
+               f"appended {appended / 2**10:.1f} KB")
+        for operation, seconds in results.items():
+            print (f"{operation}: {seconds:.4f}s")
+        return results
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
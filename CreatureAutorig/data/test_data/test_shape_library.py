@@ -0,0 +1,88 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import os
+import tempfile
+import unittest
+import numpy as np
+import autorig_settings as sett
+from data import shape_library
+
+
+class TestShapeLibrary(unittest.TestCase):
+    def test_default_library(self):
+        self.assertEqual(shape_library.shape_names(), sett.ctrl_shp_types)
+
+        for name in shape_library.shape_names():
+            for crv in shape_library.get_shape(name):
+                self.assertEqual(crv.points.dtype, np.float32)
+                self.assertTrue(shape_library.validate_curve(crv, name))
+
+        axes = shape_library.get_shape("axes")
+        self.assertEqual([crv.color for crv in axes], ["white", "red", "green", "blue"])
+        self.assertFalse(shape_library.has_shape("notAShape"))
+        self.assertRaises(ValueError, shape_library.get_shape, "notAShape")
+
+        print ("Successfully ran test_default_library")
+
+    def test_curve_points(self):
+        circle = shape_library.get_shape("circle")[0]
+        points = shape_library.curve_points(circle)
+        self.assertEqual(len(points), len(circle.points) + circle.degree)
+        self.assertTrue(np.array_equal(points[-circle.degree:], circle.points[:circle.degree]))
+
+        square = shape_library.get_shape("square")[0]
+        self.assertIs(shape_library.curve_points(square), square.points)
+
+        print ("Successfully ran test_curve_points")
+
+    def test_write_library(self):
+        shapes = {"circle": shape_library.get_shape("circle"),
+                  "axes": shape_library.get_shape("axes")}
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        path = os.path.join(temp_dir.name, "shapes.json")
+        shape_library.write_library(path, shapes)
+
+        res = shape_library.read_library(path)
+        self.assertEqual(list(res), ["circle", "axes"])
+        for name in shapes:
+            for crv, res_crv in zip(shapes[name], res[name]):
+                self.assertTrue(np.allclose(crv.points, res_crv.points, atol=1e-6))
+                self.assertTrue(np.array_equal(crv.knots, res_crv.knots))
+                self.assertEqual(crv.form, res_crv.form)
+                self.assertEqual(crv.color, res_crv.color)
+
+        bad = shape_library.CurveData(degree=3, form="periodic", points=np.zeros((4, 3)),
+                                      knots=np.arange(4), color=None)
+        self.assertRaises(ValueError, shape_library.validate_curve, bad)
+
+        print ("Successfully ran test_write_library")
+
+    def test_extra_library(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        path = os.path.join(temp_dir.name, "shapes.json")
+        line = shape_library.get_shape("square")[0]._replace(color="red")
+        shape_library.write_library(path, {"square": [line], "custom": [line]})
+
+        old_libraries = getattr(sett, "CTRL_SHAPE_LIBRARIES", [])
+        sett.CTRL_SHAPE_LIBRARIES = [path]
+        shape_library.reload_library()
+        try:
+            self.assertTrue(shape_library.has_shape("custom"))
+            self.assertEqual(shape_library.get_shape("square")[0].color, "red")
+        finally:
+            sett.CTRL_SHAPE_LIBRARIES = old_libraries
+            shape_library.reload_library()
+
+        self.assertFalse(shape_library.has_shape("custom"))
+
+        print ("Successfully ran test_extra_library")
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
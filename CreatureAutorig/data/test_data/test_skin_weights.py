@@ -0,0 +1,250 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import time
+import unittest
+from collections import defaultdict
+import numpy as np
+from data import skin_weights
+
+
+def random_weights(num_vertices, num_influences, per_vertex=4, seed=0):
+    '''
+    The function creates normalized weights, every vertex is weighted to a few 
+    random influences
+    @param num_vertices: int
+    @param num_influences: int
+    @param per_vertex: int, number of influences weighting every vertex
+    @param seed: int
+    @return numpy.ndarray (V,I)
+    '''
+    rng = np.random.default_rng(seed)
+    columns = np.argsort(rng.random((num_vertices, num_influences)), axis=1)[:, :per_vertex]
+    weights = np.zeros((num_vertices, num_influences))
+    np.put_along_axis(weights, columns, rng.random((num_vertices, per_vertex)), axis=1)
+
+    return skin_weights.normalize(weights)
+
+
+class TestSkinWeights(unittest.TestCase):
+    def setUp(self):
+        self.influences = [f"joint{i}_L_jnt" for i in range(6)]
+        self.weights = random_weights(50, 6, per_vertex=3)
+        self.weights[7] = 0.0 # a vertex without weights
+
+    def test_csr(self):
+        csr = skin_weights.to_csr(self.weights)
+        self.assertEqual(csr.shape, (50, 6))
+        self.assertEqual(len(csr.values), 49*3)
+        self.assertEqual(csr.indptr[8] - csr.indptr[7], 0)
+        self.assertTrue(np.array_equal(skin_weights.to_dense(csr), self.weights))
+        self.assertIs(skin_weights.to_dense(self.weights), self.weights)
+
+        normalized = skin_weights.normalize(csr._replace(values=csr.values * 3.0))
+        self.assertTrue(np.allclose(skin_weights.to_dense(normalized), self.weights))
+        self.assertRaises(ValueError, skin_weights.to_csr, self.weights[0])
+
+        print ("Successfully ran test_csr")
+
+    def test_dominant_influences(self):
+        # the per vertex approach of CodesFromWeb/GetWeightsFromSkinCluster
+        expected = defaultdict(list)
+        for vtx, wts in enumerate(self.weights):
+            if vtx == 7:
+                continue
+            jnt = sorted(zip(self.influences, wts), key=lambda jw: jw[1])[-1][0]
+            expected[jnt].append(vtx)
+
+        dominant = skin_weights.dominant_influences(self.weights)
+        self.assertEqual(dominant[7], -1)
+        csr = skin_weights.to_csr(self.weights)
+        self.assertTrue(np.array_equal(skin_weights.dominant_influences(csr), dominant))
+
+        for weights in (self.weights, csr):
+            result = skin_weights.influence_vertices(skin_weights.SkinWeights(self.influences, 
+                                                                              weights))
+            self.assertEqual({jnt: vertices.tolist() for jnt, vertices in result.items()}, 
+                             dict(expected))
+
+        # equal weights go to the lower index in every layout
+        ties = np.array([[0.5, 0.5, 0.0], [0.0, 0.3, 0.3], [0.2, 0.4, 0.4]])
+        for weights in (ties, skin_weights.to_csr(ties), skin_weights.to_top_k(ties), 
+                        skin_weights.to_top_k(ties, k=1)):
+            self.assertEqual(skin_weights.dominant_influences(weights).tolist(), [0, 1, 1])
+
+        print ("Successfully ran test_dominant_influences")
+
+    def test_remap(self):
+        target = ["root_M_jnt"] + [f"rig:{name}" for name in self.influences[::-1]]
+        self.assertEqual(skin_weights.influence_map(self.influences, target).tolist(), 
+                         [6, 5, 4, 3, 2, 1])
+
+        for weights in (self.weights, skin_weights.to_csr(self.weights)):
+            res = skin_weights.remap(skin_weights.SkinWeights(self.influences, weights), target)
+            self.assertEqual(res.influences, target)
+            dense = skin_weights.to_dense(res.weights)
+            self.assertTrue(np.array_equal(dense[:, 0], np.zeros(50)))
+            self.assertTrue(np.array_equal(dense[:, :0:-1], self.weights))
+
+        with self.assertRaisesRegex(ValueError, "joint5_L_jnt"):
+            skin_weights.remap(skin_weights.SkinWeights(self.influences, self.weights), 
+                               self.influences[:5])
+
+        print ("Successfully ran test_remap")
+
+    def test_top_k(self):
+        top_k = skin_weights.to_top_k(self.weights)
+        self.assertEqual(top_k.indices.shape, (50, 3))
+        self.assertEqual((top_k.indices.dtype, top_k.values.dtype), (np.int16, np.float32))
+        self.assertTrue(np.all(np.diff(top_k.values, axis=1) <= 0.0))
+        self.assertEqual(top_k.indices[7].tolist(), [-1, -1, -1])
+        # lossless in float32
+        dense = skin_weights.to_dense(top_k)
+        self.assertTrue(np.array_equal(dense, self.weights.astype(np.float32)))
+        self.assertTrue(np.array_equal(skin_weights.to_dense(skin_weights.to_top_k(dense)), 
+                                       dense))
+        csr = skin_weights.to_csr(self.weights)
+        self.assertTrue(np.array_equal(skin_weights.to_top_k(csr).indices, top_k.indices))
+        self.assertTrue(np.array_equal(skin_weights.dominant_influences(top_k),
+                                       skin_weights.dominant_influences(self.weights)))
+
+        capped = skin_weights.cap_influences(top_k, 2)
+        self.assertEqual(capped.values.shape, (50, 2))
+        pruned = skin_weights.prune(capped, 0.3)
+        self.assertTrue(np.all((pruned.values >= 0.3) | (pruned.indices == -1)))
+        self.assertTrue(np.all(pruned.values[pruned.indices == -1] == 0.0))
+        normalized = skin_weights.normalize(pruned)
+        sums = normalized.values.sum(axis=1)
+        self.assertTrue(np.allclose(sums[pruned.indices[:, 0] >= 0], 1.0))
+        self.assertRaises(ValueError, skin_weights.cap_influences, top_k, 0)
+
+        # the same result as pruning and capping the dense weights
+        expected = np.where(self.weights >= 0.3, self.weights, 0.0)
+        expected[np.arange(50)[:, None], np.argsort(-self.weights, axis=1)[:, 2:]] = 0.0
+        self.assertTrue(np.allclose(skin_weights.to_dense(normalized), 
+                                    skin_weights.normalize(expected), atol=1e-6))
+
+        remapped = skin_weights.remap(skin_weights.SkinWeights(self.influences, top_k), 
+                                      self.influences[::-1])
+        self.assertTrue(np.array_equal(skin_weights.to_dense(remapped.weights)[:, ::-1], dense))
+
+        print ("Successfully ran test_top_k")
+
+    def test_transfer(self):
+        # a grid weighted linearly along X, interpolating it gives the same linear weights
+        grid = np.linspace(0.0, 1.0, 21)
+        xs, ys = np.meshgrid(grid, grid)
+        points = np.stack([xs.ravel(), ys.ravel(), np.zeros(xs.size)], axis=1)
+        index = np.arange(xs.size).reshape(xs.shape)
+        corners = [index[:-1, :-1], index[:-1, 1:], index[1:, :-1], index[1:, 1:]]
+        triangles = np.concatenate([np.stack([corners[0], corners[1], corners[3]], axis=-1),
+                                    np.stack([corners[0], corners[3], corners[2]], axis=-1)])
+        triangles = triangles.reshape(-1, 3)
+        source = skin_weights.SkinWeights(["left_L_jnt", "right_R_jnt"], 
+                                          np.stack([points[:, 0], 1.0 - points[:, 0]], axis=1))
+
+        rng = np.random.default_rng(5)
+        targets = np.concatenate([rng.random((200, 2)), np.full((200, 1), 0.01)], axis=1)
+        result = skin_weights.transfer(points, source, targets, "barycentric", 
+                                       triangles=triangles)
+        self.assertEqual(result.influences, source.influences)
+        self.assertTrue(np.allclose(result.weights[:, 0], targets[:, 0], atol=1e-6))
+
+        result = skin_weights.transfer(points, source, targets, "idw", k=4)
+        self.assertTrue(np.allclose(result.weights.sum(axis=1), 1.0))
+        self.assertTrue(np.allclose(result.weights[:, 0], targets[:, 0], atol=0.05))
+        # the same vertices keep their weights
+        result = skin_weights.transfer(points, source, points[::7], "idw")
+        self.assertTrue(np.allclose(result.weights, source.weights[::7], atol=1e-6))
+
+        self.assertRaises(ValueError, skin_weights.transfer, points, source, targets, 
+                          "barycentric")
+        self.assertRaises(ValueError, skin_weights.transfer, points[1:], source, targets)
+
+        print ("Successfully ran test_transfer")
+
+
+def benchmark_weights(num_vertices=100000, num_influences=80, per_vertex=4):
+    '''
+    The function compares finding the dominant influences per vertex in Python 
+    (CodesFromWeb/GetWeightsFromSkinCluster) with the vectorized functions
+    on synthetic weights and times the conversions
+    @param num_vertices: int
+    @param num_influences: int
+    @param per_vertex: int, number of influences weighting every vertex
+    @return dict: operation -> time in seconds
+    '''
+    influences = [f"joint{i}_M_jnt" for i in range(num_influences)]
+    weights = random_weights(num_vertices, num_influences, per_vertex)
+    results = {}
+
+    start = time.perf_counter()
+    influenced_vertices = defaultdict(list)
+    for vtx, wts in enumerate(weights.tolist()):
+        jnt, wt = sorted(zip(influences, wts), key=lambda jw: jw[1])[-1]
+        influenced_vertices[jnt].append(vtx)
+    results["python dominant"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    skin_weights.influence_vertices(skin_weights.SkinWeights(influences, weights))
+    results["dense dominant"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    csr = skin_weights.to_csr(weights)
+    results["to csr"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    skin_weights.influence_vertices(skin_weights.SkinWeights(influences, csr))
+    results["csr dominant"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    skin_weights.remap(skin_weights.SkinWeights(influences, csr), influences[::-1])
+    results["csr remap"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    skin_weights.to_dense(csr)
+    results["to dense"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    top_k = skin_weights.to_top_k(weights)
+    results["to top k"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    skin_weights.normalize(skin_weights.prune(skin_weights.cap_influences(top_k, 3), 0.1))
+    results["top k cap, prune, normalize"] = time.perf_counter() - start
+
+    print (f"{num_vertices}x{num_influences} weights, dense: {weights.nbytes/2**20:.1f}MB, "
+           f"csr: {sum(a.nbytes for a in csr[:3])/2**20:.1f}MB, "
+           f"top k: {(top_k.indices.nbytes + top_k.values.nbytes)/2**20:.1f}MB")
+    for operation, seconds in results.items():
+        print (f"{operation}: {seconds:.3f}s")
+    return results
+
+
+def benchmark_transfer(num_vertices=100000, num_influences=80, k=4):
+    '''
+    The function transfers synthetic weights between two random point clouds
+    @param num_vertices: int, number of source and target vertices
+    @param num_influences: int
+    @param k: int, number of source vertices blended for every target vertex
+    @return float: time in seconds
+    '''
+    rng = np.random.default_rng(0)
+    source = rng.uniform(-100, 100, size=(num_vertices, 3))
+    targets = rng.uniform(-100, 100, size=(num_vertices, 3))
+    weights = skin_weights.SkinWeights([f"joint{i}_M_jnt" for i in range(num_influences)],
+                                       random_weights(num_vertices, num_influences))
+
+    start = time.perf_counter()
+    skin_weights.transfer(source, weights, targets, "idw", k)
+    result = time.perf_counter() - start
+
+    print (f"{num_vertices} vertices, {num_influences} influences, k={k}: {result:.3f}s")
+    return result
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
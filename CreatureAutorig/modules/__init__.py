@@ -1,7 +1,16 @@
-from . import main_module
-from . import limb_module
-from .submodules import control
-from .submodules import joint_chain
-from .submodules import ik_chain
-from .submodules import fk_chain
-from .test_modules import test_control, test_joint_chain
\ No newline at end of file
+try:
+    from .. import _lazy
+except ImportError: # the package is imported as a top level package
+    import _lazy
+
+# attribute name -> submodule, imported on first access (PEP 562)
+_SUBMODULES = {"main_module": ".main_module",
+               "limb_module": ".limb_module",
+               "control": ".submodules.control",
+               "control_batch": ".submodules.control_batch",
+               "joint_chain": ".submodules.joint_chain",
+               "ik_chain": ".submodules.ik_chain",
+               "fk_chain": ".submodules.fk_chain"}
+
+
+_lazy.attach(__name__, globals(), _SUBMODULES)
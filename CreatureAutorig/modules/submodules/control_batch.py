@@ -0,0 +1,255 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import time
+from collections import namedtuple
+import numpy as np
+import autorig_settings as sett
+from utils import name_utils
+from utils import scene
+from data import shape_library
+from modules.submodules.control import Control
+
+
+ControlSpec = namedtuple("ControlSpec", ["base_name", "shape_type", "side", "size",
+                                         "ctrl_color", "aim_axis", "matrix"],
+                         defaults=("M", 1.0, None, "x", None))
+# base_name: str, base of the control name
+# shape_type: str, name of the shape defined in the shape library
+# side: str, side defined in autorig_settings
+# size: float
+# ctrl_color: str, color defined in autorig_settings, None keeps the default color
+# aim_axis: str, takes: "x", "y", "z"
+# matrix: float[16], world matrix of the zero group, None leaves it at the origin
+
+
+class ControlBatch(object):
+    '''
+    This class builds many controls at once (e.g. for feathers, scales or spikes).
+    Instead of building each control separately, every phase (names, CVs, nodes,
+    transforms, curves, colors) is done for all the controls together through
+    the batch functions of the scene adapter. The whole build is a single undo step.
+    '''
+    def __init__(self, specs=None):
+        '''
+        This is the constructor
+        @param specs: [ControlSpec], controls to build
+        '''
+        self.specs = list(specs) if specs else []
+
+        self.controls = [] # control names
+        self.control_grps = [] # zero group names
+        self.timings = {} # phase -> time in seconds
+
+        self.__ctrl_nodes = []
+        self.__grp_nodes = []
+        self.__shape_nodes = [] # list of shape nodes for every control
+
+    def add(self, base_name, shape_type, side="M", size=1.0, ctrl_color=None,
+            aim_axis="x", matrix=None):
+        '''
+        This method adds a control to the batch, the parameters match ControlSpec
+        @return int: index of the control in the batch
+        '''
+        self.specs.append(ControlSpec(base_name, shape_type, side, size,
+                                      ctrl_color, aim_axis, matrix))
+        return len(self.specs) - 1
+
+    def build(self):
+        '''
+        This method builds all the controls in the batch
+        @return [str]: names of the controls
+        '''
+        if self.__grp_nodes:
+            raise ValueError("The batch has already been built")
+
+        self.timings = {}
+        start = time.perf_counter()
+
+        self.__validate()
+        start = self.__lap("validate", start)
+
+        self.__build_names()
+        start = self.__lap("names", start)
+
+        curves = self.__build_curves()
+        start = self.__lap("cvs", start)
+
+        with scene.undo_chunk("ControlBatch"):
+            try:
+                self.__create_nodes()
+                start = self.__lap("dag", start)
+
+                self.__set_matrices()
+                start = self.__lap("xforms", start)
+
+                self.__create_shapes(curves)
+                start = self.__lap("shapes", start)
+
+                self.__set_colors()
+                self.__lap("colors", start)
+            except RuntimeError as e:
+                scene.display_error(f"Control batch failed: {e}")
+                self.undo()
+                raise
+
+        return self.controls
+
+    def undo(self):
+        '''
+        This method deletes everything the batch has built
+        '''
+        scene.delete(*[grp for grp in self.__grp_nodes if grp.exists()])
+
+        self.__ctrl_nodes = []
+        self.__grp_nodes = []
+        self.__shape_nodes = []
+        self.controls = []
+        self.control_grps = []
+
+    def print_timings(self):
+        '''
+        This method prints out the time spent in each phase of the last build
+        '''
+        total = sum(self.timings.values())
+        for phase, duration in self.timings.items():
+            print (f"{phase:>10}: {duration:.4f}s")
+        print (f"{'total':>10}: {total:.4f}s ({len(self.controls)} controls)")
+
+    def __lap(self, phase, start):
+        '''
+        This method stores the time spent in the phase and returns the current time
+        '''
+        now = time.perf_counter()
+        self.timings[phase] = now - start
+        return now
+
+    def __validate(self):
+        '''
+        This method checks all the specs before anything is created in the scene
+        '''
+        if not self.specs:
+            raise ValueError("No controls to build")
+
+        for i, spec in enumerate(self.specs):
+            if not shape_library.has_shape(spec.shape_type):
+                raise ValueError(f"Control {i}: shape type '{spec.shape_type}' is not valid")
+            if spec.side not in sett.sides:
+                raise ValueError(f"Control {i}: side '{spec.side}' is not valid")
+            if spec.aim_axis not in ("x", "y", "z"):
+                raise ValueError(f"Control {i}: aim axis '{spec.aim_axis}' is not valid")
+            if spec.ctrl_color and spec.ctrl_color not in sett.colors:
+                raise ValueError(f"Control {i}: color '{spec.ctrl_color}' is not valid")
+            if spec.matrix is not None and len(list(self.__flat_matrix(spec.matrix))) != 16:
+                raise ValueError(f"Control {i}: matrix needs 16 values")
+
+    def __build_names(self):
+        '''
+        This method generates the names of the controls and their zero groups,
+        the controls sharing a base name and side get one block of numbered names
+        '''
+        groups = {}
+        for i, spec in enumerate(self.specs):
+            groups.setdefault((spec.base_name, spec.side), []).append(i)
+
+        self.controls = [None] * len(self.specs)
+        self.control_grps = [None] * len(self.specs)
+        for (base_name, side), indices in groups.items():
+            ctrl_names = name_utils.build_unique_names(base_name, side, sett.suffixes["ctrl"],
+                                                       len(indices))
+            grp_names = name_utils.build_unique_names(base_name+"Zero", side, 
+                                                      sett.suffixes["grp"], len(indices))
+            for i, ctrl_name, grp_name in zip(indices, ctrl_names, grp_names):
+                self.controls[i] = ctrl_name
+                self.control_grps[i] = grp_name
+
+    def __build_curves(self):
+        '''
+        This method transforms the CVs once for every distinct shape, aim axis and size
+        @return dict: (shape_type, aim_axis, size) -> [(points, knots, degree, periodic)]
+        '''
+        curves = {}
+        for spec in self.specs:
+            key = (spec.shape_type, spec.aim_axis, spec.size)
+            if key in curves:
+                continue
+
+            curves[key] = [(Control.shape_points(crv, spec.aim_axis, spec.size),
+                            crv.knots.tolist(), crv.degree, crv.form == "periodic")
+                           for crv in shape_library.get_shape(spec.shape_type)]
+
+        return curves
+
+    def __create_nodes(self):
+        '''
+        This method creates the zero groups and the control transforms under them
+        '''
+        count = len(self.specs)
+        created = scene.create_nodes(["transform"] * (2*count), 
+                                     self.control_grps + self.controls,
+                                     [None] * count + list(range(count)))
+        self.__grp_nodes = created[:count]
+        self.__ctrl_nodes = created[count:]
+
+    def __set_matrices(self):
+        '''
+        This method moves the zero groups to their target matrices
+        '''
+        placed = [(grp, list(self.__flat_matrix(spec.matrix))) 
+                  for spec, grp in zip(self.specs, self.__grp_nodes) if spec.matrix is not None]
+        if placed:
+            grps, matrices = zip(*placed)
+            scene.set_matrices(grps, np.array(matrices))
+
+    def __create_shapes(self, curves):
+        '''
+        This method creates the shapes of all the controls
+        '''
+        shape_curves, names, parents, counts = [], [], [], []
+        for spec, ctrl_name, ctrl in zip(self.specs, self.controls, self.__ctrl_nodes):
+            ctrl_curves = curves[(spec.shape_type, spec.aim_axis, spec.size)]
+            shape_curves.extend(ctrl_curves)
+            names.extend(ctrl_name+"Shape"+(str(i) if i else "") for i in range(len(ctrl_curves)))
+            parents.extend([ctrl] * len(ctrl_curves))
+            counts.append(len(ctrl_curves))
+
+        shapes = scene.create_curves(shape_curves, names, parents)
+        ends = np.cumsum(counts).tolist()
+        self.__shape_nodes = [shapes[end-count:end] for end, count in zip(ends, counts)]
+
+    def __set_colors(self):
+        '''
+        This method applies the control colors, colors defined in the shape library
+        replace the control color like in Control.build
+        '''
+        nodes, colors = [], []
+        for spec, ctrl, shapes in zip(self.specs, self.__ctrl_nodes, self.__shape_nodes):
+            shape_colors = [crv.color for crv in shape_library.get_shape(spec.shape_type)]
+            if any(shape_colors):
+                colored = [(shape, color) for shape, color in zip(shapes, shape_colors) if color]
+            elif spec.ctrl_color:
+                colored = [(node, spec.ctrl_color) for node in [ctrl] + shapes]
+            else:
+                continue
+
+            for node, color in colored:
+                nodes.append(node)
+                colors.append(tuple(sett.colors[color]))
+
+        if nodes:
+            scene.set_attrs(nodes, "overrideEnabled", [True] * len(nodes))
+            scene.set_attrs(nodes, "overrideRGBColors", [True] * len(nodes))
+            scene.set_attrs(nodes, "overrideColorRGB", colors)
+
+    @staticmethod
+    def __flat_matrix(matrix):
+        '''
+        This method flattens a 4x4 matrix (nested lists, numpy array, MMatrix) into 16 floats
+        '''
+        for row in matrix:
+            if hasattr(row, "__len__"):
+                yield from (float(v) for v in row)
+            else:
+                yield float(row)
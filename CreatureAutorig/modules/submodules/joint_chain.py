@@ -2,14 +2,46 @@
 @author: mstolarz
 '''
 
-import math
-import pymel.core as pm
-import maya.OpenMaya as om1
-import maya.api.OpenMaya as om2
+import time
+from collections import namedtuple
+from contextlib import nullcontext
+import numpy as np
 from utils import name_utils
+from utils import geo_utils
+from utils import spatial_utils
+from utils import orient_utils
+from utils import quat_utils
+from utils import curve_utils
+from utils import mirror_utils
+from utils import scene
 import autorig_settings as sett
+from core.build_session import BuildSession
 
 
+CHAIN_MODES = ("linear", "planar", "arbitrary")
+
+ChainSpec = namedtuple("ChainSpec", ["base_name", "pos_list", "side", "mode", "aim_axis", 
+                                     "twist_axis", "twist_vec", "orient_list", "skip_last",
+                                     "zero_orient_last", "planar_mode", "num"],
+                       defaults=("M", "planar", "+x", "+y", None, None, False, False, 
+                                 "strict", 1))
+# base_name: str, base of the joint names
+# pos_list: float[3] list, world positions of the joints
+# side: str, side defined in autorig_settings
+# mode: str, one of CHAIN_MODES, the JointChain method used: linear_chain, planar_chain,
+#       arbitrary_chain
+# aim_axis, twist_axis: str, "+x", "-x", "+y", "-y", "+z", "-z", used by linear and planar
+# twist_vec: float[3], direction the twist_axis aims at, used by linear
+# orient_list: float[3] list, world orientations in degrees, used by arbitrary
+# skip_last: bool, the last position is skipped
+# zero_orient_last: bool, orientation of the last joint is zeroed out, used by arbitrary
+# planar_mode: str, "strict" or "fit", used by planar
+# num: int, the first number to start counting from
+
+# world space description of a chain ready to be created, either the aim and twist 
+# directions of the joints or their orientations as quaternions are defined
+_ChainFrames = namedtuple("_ChainFrames", ["positions", "aim_vecs", "twist_vecs", "aim_axis",
+                                           "twist_axis", "quats", "zero_orient_last"])
 
 
 
@@ -18,6 +50,7 @@ class JointChain(object):
     The class creates joint chains and orients them in a desired way
     '''
     precision = 10 # number of decimal points included when running tests and presenting data
+    planar_modes = ("strict", "fit") # how planar_chain treats positions off a single plane
     def __init__(self, base_name="chain", side="M", num=1):
         '''
         This is the constructor
@@ -30,6 +63,10 @@ class JointChain(object):
         self.num = num
         self.chain = []
         self.perpendicular_vec = None # vector perpendicular to coplanar joints
+        self.guide_fit = None # geo_utils.PointsFit of the last checked positions
+        self.plane_deviation = None # largest distance of a position from the fitted plane
+        self.overlapping = [] # index pairs of overlapping positions found in the last check
+        self.__last_overlap = None
 
     def __str__(self):
         chain_names = [obj.name() for obj in self.chain]
@@ -37,70 +74,302 @@ class JointChain(object):
 
         return result
 
-    def __zero_orient_joint(self, joint):
-        '''
-        This method zeroes out the jointOrient attribute of a joint
-        @param joint: PyNode, the joint which needs to have orientation zeroed out
-        '''    
-        for a in ["jointOrientX", "jointOrientY", "jointOrientZ"]:
-            joint.attr(a).set(0)
-
-    def __make_hierarchy(self):
-        '''This method parents joints into a hierarchy'''
-        reversed_list = list(self.chain)
-        reversed_list.reverse()
-        for i in range(len(reversed_list)-1):
-            pm.parent(reversed_list[i], reversed_list[i+1])
-        pm.select(cl=1)
+    def __linear_frames(self, pos_list, aim_axis, twist_axis, twist_vec, skip_last):
+        '''
+        This method validates the positions of a linear chain 
+        and calculates the aim and twist directions of its joints
+        @return _ChainFrames
+        '''
+        if not self.check_collinear(pos_list):
+            raise ValueError("The given positions are not collinear")
+
+        #determine the range
+        range_end = len(pos_list)
+        if skip_last:
+            range_end = len(pos_list)-1
+        if range_end < 2:
+            raise ValueError("pos_list must have at least 2 items if skip_last is set to False, "
+                             "or at least 3 items if skip_last is set to True.")    
+                 
+        if twist_vec is None:
+            raise ValueError("twist_vec not defined")
+       
+        orient_utils.validate_axes(aim_axis, twist_axis)
+
+        # check if aim and up vector are perpendicular
+        aim_vec = orient_utils.segment_vectors(pos_list[:2])[0]
+        up_vec = orient_utils.normalize(orient_utils.as_vectors(twist_vec))[0]
+        if round(float(np.linalg.norm(np.cross(aim_vec, up_vec))), self.precision) < 1.0:
+            raise ValueError("Aim vector and up vector are not "
+                                     "perpendicular to each other. "
+                                     "Change aim_axis or twist_vec attribute and try again. ")
+
+        positions = orient_utils.as_vectors(pos_list)[:range_end]
+        return _ChainFrames(positions, np.tile(aim_vec, (range_end, 1)), 
+                            np.tile(up_vec, (range_end, 1)), aim_axis, twist_axis, None, True)
+
+
+    def __planar_frames(self, pos_list, aim_axis, twist_axis, skip_last, planar_mode):
+        '''
+        This method validates the positions of a planar chain 
+        and calculates the aim and twist directions of its joints
+        @return _ChainFrames
+        '''
+        if planar_mode not in self.planar_modes:
+            raise ValueError(f"planar_mode has to be one of {self.planar_modes}, "
+                             f"got: {planar_mode}")
+
+        unique_num = self.__check_overlapping(pos_list)
+        if unique_num < 3:
+            raise ValueError("There has to be at least 3 non-overlapping "
+                             f"positions defined. Found: {unique_num}")
+
+        orient_utils.validate_axes(aim_axis, twist_axis)
         
-    def __create_matrix_from_vecs(self, axis1, axis2, vec1, vec2, vec3=None):
-        '''This method creates matrix from 3 vectors to orient joints'''
-        if vec3 is None:
-            if (axis1, axis2) in [("x", "y"), ("x", "z"), ("y", "x"), ("z", "x")]:
-                vec3 = vec1 ^ vec2
-            else:
-                vec3 = vec2 ^ vec1
-            vec3.normalize()
-
-        combinations = {
-            ("x", "y"): [vec1.x, vec1.y, vec1.z, 0,
-                         vec2.x, vec2.y, vec2.z, 0,
-                         vec3.x, vec3.y, vec3.z, 0,
-                         0, 0, 0, 1],
-
-            ("x", "z"): [vec1.x, vec1.y, vec1.z, 0,
-                         vec3.x, vec3.y, vec3.z, 0,
-                         vec2.x, vec2.y, vec2.z, 0,
-                         0, 0, 0, 1],
-
-            ("y", "x"): [vec2.x, vec2.y, vec2.z, 0,
-                         vec1.x, vec1.y, vec1.z, 0,
-                         vec3.x, vec3.y, vec3.z, 0,
-                         0, 0, 0, 1],
-
-            ("y", "z"): [vec3.x, vec3.y, vec3.z, 0,
-                         vec2.x, vec2.y, vec2.z, 0,
-                         vec1.x, vec1.y, vec1.z, 0,
-                         0, 0, 0, 1],
-
-            ("z", "x"): [vec2.x, vec2.y, vec2.z, 0,
-                         vec3.x, vec3.y, vec3.z, 0,
-                         vec1.x, vec1.y, vec1.z, 0,
-                         0, 0, 0, 1],
-
-            ("z", "y"): [vec3.x, vec3.y, vec3.z, 0,
-                         vec1.x, vec1.y, vec1.z, 0,
-                         vec2.x, vec2.y, vec2.z, 0,
-                         0, 0, 0, 1]
-        }            
-
-        matrix_vec = combinations.get((axis1, axis2))
-        if matrix_vec is None:
-            return None
-    
-        return matrix_vec   
+        if planar_mode == "fit":
+            pos_list = self.fit_plane(pos_list)
+        elif not self.check_coplanar(pos_list):
+            raise ValueError("The given positions are not coplanar")
 
-            
+        #determine the range
+        positions = orient_utils.as_vectors(pos_list)
+        range_end = len(positions)-1 if skip_last else len(positions)
+
+        # every joint aims at the next position, the last one keeps the previous direction
+        aim_vecs = orient_utils.segment_vectors(positions)[:range_end]
+        if range_end > len(aim_vecs):
+            aim_vecs = np.concatenate([aim_vecs, aim_vecs[-1:]])
+
+        return _ChainFrames(positions[:range_end], aim_vecs, 
+                            np.tile(self.perpendicular_vec, (range_end, 1)), 
+                            aim_axis, twist_axis, None, not skip_last)
+
+
+    @staticmethod
+    def __arbitrary_frames(pos_list, orient_list, zero_orient_last, skip_last):
+        '''
+        This method validates the positions and orientations of an arbitrary chain
+        @return _ChainFrames
+        '''
+        if not pos_list:
+            raise ValueError("Position list not defined")
+        if not orient_list:
+            raise ValueError("Orientation list not defined")
+        if len(pos_list) != len(orient_list):
+            raise ValueError("The list of positions and list of orientations "
+                             "should contain same number of items")
+
+        range_end = len(pos_list)-1 if skip_last else len(pos_list)
+        if range_end < 1:
+            raise ValueError("There are no positions left to build the chain from")
+
+        return _ChainFrames(orient_utils.as_vectors(pos_list)[:range_end], None, None, 
+                            None, None, orient_utils.euler_to_quat(orient_list[:range_end]),
+                            zero_orient_last)
+
+
+    def __spec_frames(self, spec):
+        '''
+        This method validates a ChainSpec and calculates the directions of its joints
+        @return _ChainFrames
+        '''
+        if spec.mode == "linear":
+            return self.__linear_frames(spec.pos_list, spec.aim_axis, spec.twist_axis,
+                                        spec.twist_vec, spec.skip_last)
+        if spec.mode == "planar":
+            return self.__planar_frames(spec.pos_list, spec.aim_axis, spec.twist_axis,
+                                        spec.skip_last, spec.planar_mode)
+        if spec.mode == "arbitrary":
+            return self.__arbitrary_frames(spec.pos_list, spec.orient_list, 
+                                           spec.zero_orient_last, spec.skip_last)
+
+        raise ValueError(f"mode has to be one of {CHAIN_MODES}, got: {spec.mode}")
+
+
+    @classmethod
+    def __create_chains(cls, chains, frames, timings=None, root_parents=None):
+        '''
+        This method creates joints of many chains at once.
+        Orientations of all the joints are calculated together, the names are reserved 
+        in one build session and all the joints are created in a single pass,
+        every joint directly under the previous one
+        @param chains: [JointChain], the chains the joints are added to
+        @param frames: [_ChainFrames], world space description of every chain
+        @param timings: dict, if defined, time spent in each phase is stored in it
+        @param root_parents: [SceneNode], the nodes the first joints are created under,
+                             None for the world
+        @return [[SceneNode]]: joints of every chain
+        '''
+        timings = {} if timings is None else timings
+        start = time.perf_counter()
+
+        # orientations of all the chains, one orient_frames call per axis combination
+        quats = [frm.quats for frm in frames]
+        groups = {}
+        for i, frm in enumerate(frames):
+            if frm.quats is None:
+                groups.setdefault((frm.aim_axis, frm.twist_axis), []).append(i)
+        for (aim_axis, twist_axis), indices in groups.items():
+            matrices = orient_utils.orient_frames(
+                np.concatenate([frames[i].aim_vecs for i in indices]),
+                np.concatenate([frames[i].twist_vecs for i in indices]), aim_axis, twist_axis)
+            group_quats = quat_utils.from_matrix(matrices)
+            bounds = np.cumsum([0] + [len(frames[i].aim_vecs) for i in indices])
+            for i, first, last in zip(indices, bounds[:-1], bounds[1:]):
+                quats[i] = group_quats[first:last]
+
+        counts = [len(frm.positions) for frm in frames]
+        roots = np.cumsum([0] + counts[:-1])
+        translates, orients = orient_utils.chain_local_transforms(
+            np.concatenate([frm.positions for frm in frames]), np.concatenate(quats), roots)
+        for root, count, frm in zip(roots, counts, frames):
+            if frm.zero_orient_last:
+                orients[root+count-1] = 0.0
+        root_parents = root_parents or [None] * len(chains)
+        for root, parent in zip(roots, root_parents):
+            if parent is not None:
+                translates[root], orients[root] = cls.__relative_root(translates[root], 
+                                                                      orients[root], parent)
+        start = cls.__lap(timings, "orients", start)
+
+        names = []
+        session = nullcontext()
+        if name_utils.get_registry() is None:
+            # only the names sharing the chain prefixes are read from the scene
+            session = BuildSession(name_utils.registry_from_scene(
+                [f"{chain.base_name}_{chain.side}_*" for chain in chains]))
+        with session:
+            for chain, count in zip(chains, counts):
+                names.extend(name_utils.build_unique_names(chain.base_name, chain.side, 
+                                                           sett.suffixes["jnt"], count, 
+                                                           num=chain.num))
+        start = cls.__lap(timings, "names", start)
+
+        root_parent = dict(zip(roots.tolist(), root_parents))
+        parents = [root_parent[i] if i in root_parent else i-1 for i in range(len(names))]
+        with scene.undo_chunk("JointChain"):
+            joints = scene.create_joints(names, translates, orients, parents)
+        cls.__lap(timings, "dag", start)
+
+        result = []
+        for chain, root, count in zip(chains, roots, counts):
+            chain.chain.extend(joints[root:root+count])
+            result.append(joints[root:root+count])
+
+        return result
+
+
+    @staticmethod
+    def __relative_root(translate, orient, parent):
+        '''
+        This method turns the world translate and orientation of a first joint
+        into the values relative to the node it is created under
+        '''
+        matrix = np.identity(4)
+        matrix[:3, :3] = orient_utils.euler_to_matrix(orient)[0]
+        matrix[3, :3] = translate
+        matrix = matrix @ np.linalg.inv(parent.world_matrix())
+
+        rotation = orient_utils.normalize(matrix[:3, :3])
+        return matrix[3, :3], orient_utils.matrix_to_euler(rotation)[0]
+
+
+    @staticmethod
+    def __lap(timings, phase, start):
+        '''
+        This method stores the time spent in the phase and returns the current time
+        '''
+        now = time.perf_counter()
+        timings[phase] = now - start
+        return now
+
+
+    @classmethod
+    def build_many(cls, specs):
+        '''
+        This method builds many chains at once (e.g. all the legs or fingers of a creature).
+        All the specs are validated before anything is created, the orientations 
+        of all the joints are calculated together and the joints are created 
+        in a single pass inside one undo chunk
+        @param specs: [ChainSpec]
+        @return ([JointChain], dict): the chains and the time in seconds spent in each phase
+        '''
+        if not specs:
+            raise ValueError("No chains to build")
+
+        timings = {}
+        start = time.perf_counter()
+
+        chains = []
+        frames = []
+        for i, spec in enumerate(specs):
+            chain = cls(spec.base_name, spec.side, spec.num)
+            try:
+                if spec.side not in sett.sides:
+                    raise ValueError(f"side '{spec.side}' is not valid")
+                frames.append(chain.__spec_frames(spec))
+            except ValueError as e:
+                raise ValueError(f"Chain {i} ({spec.base_name}): {e}") from None
+            chains.append(chain)
+        start = cls.__lap(timings, "validate", start)
+
+        cls.__create_chains(chains, frames, timings)
+
+        joint_count = sum(chain.chain_length() for chain in chains)
+        phases = ", ".join(f"{phase}: {duration:.4f}s" for phase, duration in timings.items())
+        scene.display_info(f"Built {len(chains)} chains ({joint_count} joints) - {phases}")
+
+        return chains, timings
+
+
+    @classmethod
+    def mirror_many(cls, chains, axis="x", mode="behavior"):
+        '''
+        This method builds the opposite side of the chains, e.g. R legs from the L ones.
+        World matrices of all the joints are mirrored together and all the mirrored 
+        chains are created in a single pass. A mirrored chain is created under 
+        the opposite side counterpart of the original parent if it exists
+        @param chains: [JointChain], built chains
+        @param axis: str, normal of the mirror plane, takes: "x", "y", "z"
+        @param mode: str, "behavior" - the joint axes point the opposite way, 
+                     so the same rotations give a mirrored pose,
+                     "orientation" - the joints keep the world orientation of the original
+        @return [JointChain]
+        '''
+        if not chains or not all(chain.chain for chain in chains):
+            raise ValueError("Only built chains can be mirrored")
+
+        matrices = mirror_utils.mirror_matrices([jnt.world_matrix() for chain in chains 
+                                                 for jnt in chain.chain], axis, mode)
+        quats = quat_utils.from_matrix(orient_utils.normalize(matrices[:, :3, :3]))
+
+        mirrored = []
+        frames = []
+        first = 0
+        for chain in chains:
+            last = first + chain.chain_length()
+            mirrored.append(cls(chain.base_name, name_utils.mirror_side(chain.side), chain.num))
+            frames.append(_ChainFrames(matrices[first:last, 3, :3], None, None, None, None, 
+                                       quats[first:last], False))
+            first = last
+
+        cls.__create_chains(mirrored, frames, 
+                            root_parents=[mirror_utils.mirror_parent(chain.chain[0]) 
+                                          for chain in chains])
+
+        return mirrored
+
+
+    def mirror(self, axis="x", mode="behavior"):
+        '''
+        This method builds the chain on the opposite side, see mirror_many
+        @param axis: str, normal of the mirror plane, takes: "x", "y", "z"
+        @param mode: str, "behavior" or "orientation"
+        @return JointChain
+        '''
+        return self.mirror_many([self], axis, mode)[0]
+
+        
     def arbitrary_chain(self, pos_list=None, orient_list=None, 
                         zero_orient_last=False, skip_last=False):
         '''
@@ -110,33 +379,13 @@ class JointChain(object):
         @param zero_orient_last: bool, whether or not zero out joint orientations of the last joint 
                                 in the created chain, regardless the value of skip_last parameter
         '''
-        if not pos_list:
-            om1.displayError("Position list not defined")
+        try:
+            frames = self.__arbitrary_frames(pos_list, orient_list, zero_orient_last, skip_last)
+        except ValueError as e:
+            scene.display_error(e)
             return
 
-        if not orient_list:
-            om1.displayError("Orientation list not defined")
-            return
-        
-        if len(pos_list) != len(orient_list):
-            om1.MGlobal.displayError("The list of positions and list of orientations "
-                                     "should contain same number of items")
-            return
-        
-        range_end = len(pos_list)
-        if skip_last:
-            range_end = len(pos_list)-1
-        
-        for i in range(range_end):
-            name = name_utils.build_unique_name(self.base_name, self.side, sett.suffixes["jnt"])   
-            pm.select(cl=1)    
-            jnt = pm.joint(n=name, position=pos_list[i], orientation=orient_list[i])    
-            self.chain.append(jnt)
-    
-        self.__make_hierarchy()
-
-        if zero_orient_last:
-            self.__zero_orient_joint(self.chain[-1])
+        self.__create_chains([self], [frames])
 
     
     def linear_chain(self, pos_list=None, aim_axis="+x", twist_axis="+y", 
@@ -151,133 +400,9 @@ class JointChain(object):
         @param twist_vec: float[3], a direction at which twist_axis should aim
         @param skip_last: bool, if set to True, the last position in pos_list will be skipped
         '''
-
-        if not self.check_collinear(pos_list):
-            raise ValueError("The given positions are not collinear")
-
-        #determine the range
-        range_end = len(pos_list)
-        if skip_last:
-            range_end = len(pos_list)-1
-        if range_end < 2:
-            raise ValueError("pos_list must have at least 2 items if skip_last is set to False, "
-                             "or at least 3 items if skip_last is set to True.")    
-                 
-        if twist_vec is None:
-            raise ValueError("twist_vec not defined")
-       
-        valid = ["+x", "-x", "+y", "-y", "+z", "-z"]
-        if aim_axis not in valid or twist_axis not in valid:
-            raise ValueError("aim_axis and twist_axis can only take values: "
-                             "'+x', '-x', '+y', '-y', '+z', '-z'")
-
-        if aim_axis[1] == twist_axis[1]:
-            raise ValueError("aim_axis and twist_axis cannot share same axis")
-
-
-
-        #get up vector
-        twist_vec = twist_vec * -1 if "-" in twist_axis else twist_vec
-        twist_vec.normalize()       
-
-        #calculate aim vector
-        vec_start = om2.MVector(pos_list[0][0],pos_list[0][1],pos_list[0][2])
-        vec_end = om2.MVector(pos_list[1][0],pos_list[1][1],pos_list[1][2])
-                
-        aim_vec = vec_start - vec_end if "-" in aim_axis else vec_end - vec_start
-        aim_vec.normalize()
-        
-        # check if aim and up vector are perpendicular
-        cross_prod = om2.MVector(aim_vec ^ twist_vec)
-        if round(cross_prod.length(),self.precision) < 1.0:
-            raise ValueError("Aim vector and up vector are not "
-                                     "perpendicular to each other. "
-                                     "Change aim_axis or twist_vec attribute and try again. ")
-
-        #create a matrix to orient joints
-        matrix_vec = self.__create_matrix_from_vecs(aim_axis[1], twist_axis[1], 
-                                                    aim_vec, twist_vec)
-
-        # #create a matrix to orient joints
-        # if "x" in aim_axis and "y" in twist_axis:
-        #     third_vec = aim_vec ^ twist_vec 
-        #     third_vec.normalize()
-        #     matrix_vec = [aim_vec.x, aim_vec.y, aim_vec.z, 0,
-        #                twist_vec.x, twist_vec.y, twist_vec.z, 0,
-        #                third_vec.x, third_vec.y, third_vec.z, 0,                                                     
-        #                 0,0,0,1]
-        # elif "x" in aim_axis and "z" in twist_axis:
-        #     third_vec = twist_vec ^ aim_vec 
-        #     third_vec.normalize()
-        #     matrix_vec = [aim_vec.x, aim_vec.y, aim_vec.z, 0,                               
-        #                third_vec.x, third_vec.y, third_vec.z, 0,
-        #                twist_vec.x, twist_vec.y, twist_vec.z, 0,                                                
-        #                 0,0,0,1]             
-        # elif "y" in aim_axis and "x" in twist_axis:
-        #     third_vec = aim_vec ^ twist_vec 
-        #     third_vec.normalize()
-        #     matrix_vec = [twist_vec.x, twist_vec.y, twist_vec.z, 0,
-        #                aim_vec.x, aim_vec.y, aim_vec.z, 0,
-        #                third_vec.x, third_vec.y, third_vec.z, 0,                                                     
-        #                 0,0,0,1]
-        # elif "y" in aim_axis and "z" in twist_axis:
-        #     third_vec = aim_vec ^ twist_vec 
-        #     third_vec.normalize()
-        #     matrix_vec = [third_vec.x, third_vec.y, third_vec.z, 0,
-        #                aim_vec.x, aim_vec.y, aim_vec.z, 0,
-        #                twist_vec.x, twist_vec.y, twist_vec.z, 0,                                                                                    
-        #                 0,0,0,1]
-        # elif "z" in aim_axis and "x" in twist_axis:
-        #     third_vec = aim_vec ^ twist_vec 
-        #     third_vec.normalize()                 
-        #     matrix_vec = [twist_vec.x, twist_vec.y, twist_vec.z, 0,
-        #                third_vec.x, third_vec.y, third_vec.z, 0,                                                       
-        #                aim_vec.x, aim_vec.y, aim_vec.z, 0,                                                    
-        #                 0,0,0,1]
-        # elif "z" in aim_axis and "y" in twist_axis:
-        #     third_vec = twist_vec ^ aim_vec 
-        #     third_vec.normalize()
-        #     matrix_vec = [third_vec.x, third_vec.y, third_vec.z, 0,
-        #                twist_vec.x, twist_vec.y, twist_vec.z, 0,                              
-        #                aim_vec.x, aim_vec.y, aim_vec.z, 0,                                                    
-        #                 0,0,0,1]
-        #
-
-        matrix_m = om2.MMatrix(matrix_vec)
-        matrix_fn = om2.MTransformationMatrix(matrix_m)               
-        
-        #set joints rotations out of matrix
-        rot_rad = matrix_fn.rotation(asQuaternion=False)              
-        rot_deg = list(map(math.degrees, rot_rad))    
-            
-        #create joints in the correct positions
-        for i in range(range_end):
-            name = name_utils.build_unique_name(self.base_name, self.side, sett.suffixes["jnt"])
-            pm.select(cl=1)
-            jnt = pm.joint(n=name, position=pos_list[i])
-            self.chain.append(jnt)
-        
-        #orient joints        
-        i = 0
-        while True: # emulation of do-while loop
-            pm.xform(self.chain[i], ws=1, rotation=(rot_deg[0],
-                                                    rot_deg[1],
-                                                    rot_deg[2]))                                                          
-            pm.makeIdentity(self.chain[i], apply=True, jointOrient=False, rotate=True)
-            i += 1
-            if i >= range_end-1:
-                break
+        frames = self.__linear_frames(pos_list, aim_axis, twist_axis, twist_vec, skip_last)
+        self.__create_chains([self], [frames])
         
-        self.__make_hierarchy()
-        if len(self.chain) > 1:
-            self.__zero_orient_joint(self.chain[-1])
-        pm.select(cl=1)
-        
-        if len(set(pos_list)) < len(pos_list):
-            om2.MGlobal.displayWarning("Some positions are overlapping")
-        
-        
-   
         
     @staticmethod
     def linear_chain_test():
@@ -287,96 +412,31 @@ class JointChain(object):
         Edit vec variable to get twist object axis as an up vector for the chain:
         vecs[0] - it is X axis of the object, vecs[1] - Y axis, vecs[2] - Z axis
         Edit skip_last attribute to decide how the test is supposed to run
+        All the 24 combinations of aim and twist axes are built with a single build_many call
         '''
         
-        pos_list = [pm.xform(item, q=1, ws=1, t=1) for item in pm.selected()]
-        vecs = JointChain.get_vec_from_ori(pm.selected()[0])        
+        pos_list = JointChain.get_pos_from_selection()
+        vecs = JointChain.get_vec_from_ori(scene.selected()[0])        
         vec = vecs[0] # run test for this reference object axis
         skip_last = False
         
-        # aim X
-        chain1 = JointChain("plusX_plusY")
-        chain1.linear_chain(pos_list, aim_axis="+x", twist_axis="+y", 
-                            twist_vec=vec, skip_last=skip_last)
-        chain2 = JointChain("plusX_minusY")
-        chain2.linear_chain(pos_list, aim_axis="+x", twist_axis="-y", 
-                            twist_vec=vec, skip_last=skip_last)
-        chain3 = JointChain("minusX_plusY")
-        chain3.linear_chain(pos_list, aim_axis="-x", twist_axis="+y", 
-                            twist_vec=vec, skip_last=skip_last)
-        chain4 = JointChain("minusX_minusY")
-        chain4.linear_chain(pos_list, aim_axis="-x", twist_axis="-y", 
-                            twist_vec=vec, skip_last=skip_last)
-        
-        chain5 = JointChain("plusX_plusZ")
-        chain5.linear_chain(pos_list, aim_axis="+x", twist_axis="+z", 
-                            twist_vec=vec, skip_last=skip_last)
-        chain6 = JointChain("plusX_minusZ")
-        chain6.linear_chain(pos_list, aim_axis="+x", twist_axis="-z", 
-                            twist_vec=vec, skip_last=skip_last)
-        chain7 = JointChain("minusX_plusZ")
-        chain7.linear_chain(pos_list, aim_axis="-x", twist_axis="+z", 
-                            twist_vec=vec, skip_last=skip_last)
-        chain8 = JointChain("minusX_minusZ")
-        chain8.linear_chain(pos_list, aim_axis="-x", twist_axis="-z", 
-                            twist_vec=vec, skip_last=skip_last)
-        
-        # aim Y
-        chain9 = JointChain("plusY_plusX")
-        chain9.linear_chain(pos_list, aim_axis="+y", twist_axis="+x", 
-                            twist_vec=vec, skip_last=skip_last)
-        chain10 = JointChain("plusY_minusX")
-        chain10.linear_chain(pos_list, aim_axis="+y", twist_axis="-x", 
-                             twist_vec=vec, skip_last=skip_last)
-        chain11 = JointChain("minusY_plusX")
-        chain11.linear_chain(pos_list, aim_axis="-y", twist_axis="+x", 
-                             twist_vec=vec, skip_last=skip_last)
-        chain12 = JointChain("minusY_minusX")
-        chain12.linear_chain(pos_list, aim_axis="-y", twist_axis="-x", 
-                             twist_vec=vec, skip_last=skip_last)
-        
-        chain13 = JointChain("plusY_plusZ")
-        chain13.linear_chain(pos_list, aim_axis="+y", twist_axis="+z", 
-                             twist_vec=vec, skip_last=skip_last)
-        chain14 = JointChain("plusY_minusZ")
-        chain14.linear_chain(pos_list, aim_axis="+y", twist_axis="-z", 
-                             twist_vec=vec, skip_last=skip_last)
-        chain15 = JointChain("minusY_plusZ")
-        chain15.linear_chain(pos_list, aim_axis="-y", twist_axis="+z", 
-                             twist_vec=vec, skip_last=skip_last)
-        chain16 = JointChain("minusY_minusZ")
-        chain16.linear_chain(pos_list, aim_axis="-y", twist_axis="-z", 
-                             twist_vec=vec, skip_last=skip_last)
-        
-        # aim Z
-        chain17 = JointChain("plusZ_plusX")
-        chain17.linear_chain(pos_list, aim_axis="+z", twist_axis="+x", 
-                             twist_vec=vec, skip_last=skip_last)
-        chain18 = JointChain("plusZ_minusX")
-        chain18.linear_chain(pos_list, aim_axis="+z", twist_axis="-x", 
-                             twist_vec=vec, skip_last=skip_last)
-        chain19 = JointChain("minusZ_plusX")
-        chain19.linear_chain(pos_list, aim_axis="-z", twist_axis="+x", 
-                             twist_vec=vec, skip_last=skip_last)
-        chain20 = JointChain("minusZ_minusX")
-        chain20.linear_chain(pos_list, aim_axis="-z", twist_axis="-x", 
-                             twist_vec=vec, skip_last=skip_last)
-        
-        chain21 = JointChain("plusZ_plusY")
-        chain21.linear_chain(pos_list, aim_axis="+z", twist_axis="+y", 
-                             twist_vec=vec, skip_last=skip_last)
-        chain22 = JointChain("plusZ_minusY")
-        chain22.linear_chain(pos_list, aim_axis="+z", twist_axis="-y", 
-                             twist_vec=vec, skip_last=skip_last)
-        chain23 = JointChain("minusZ_plusY")
-        chain23.linear_chain(pos_list, aim_axis="-z", twist_axis="+y", 
-                             twist_vec=vec, skip_last=skip_last)
-        chain24 = JointChain("minusZ_minusY")
-        chain24.linear_chain(pos_list, aim_axis="-z", twist_axis="-y", 
-                             twist_vec=vec, skip_last=skip_last)
+        axis_names = {"+x": "plusX", "-x": "minusX", "+y": "plusY", 
+                      "-y": "minusY", "+z": "plusZ", "-z": "minusZ"}
+        specs = []
+        for aim_axis in orient_utils.VALID_AXES:
+            for twist_axis in orient_utils.VALID_AXES:
+                if aim_axis[1] == twist_axis[1]:
+                    continue
+                specs.append(ChainSpec(f"{axis_names[aim_axis]}_{axis_names[twist_axis]}",
+                                       pos_list, mode="linear", aim_axis=aim_axis, 
+                                       twist_axis=twist_axis, twist_vec=vec, 
+                                       skip_last=skip_last))
+
+        JointChain.build_many(specs)
                
 
-    def planar_chain(self, pos_list=None, aim_axis="+x", twist_axis="+y", skip_last=False):
+    def planar_chain(self, pos_list=None, aim_axis="+x", twist_axis="+y", skip_last=False,
+                     planar_mode="strict"):
         '''
         This method builds a joint chain from a list of positions and orients them
         @param pos_list: float[3] list, the position list needed for the chain
@@ -388,119 +448,55 @@ class JointChain(object):
                           the last position in pos_list,
                           if set to False, it will automatically zero out 
                           joint orientation of the last joint
+        @param planar_mode: string, "strict" - the positions have to be coplanar,
+                            "fit" - the positions are projected onto their least-squares plane,
+                            the largest distance from it is stored in plane_deviation
         '''
-        
-        if len(set(pos_list)) < 3:
-            raise ValueError("There has to be at least 3 non-overlapping "
-                             f"positions defined. Found: {len(set(pos_list))}")
+        frames = self.__planar_frames(pos_list, aim_axis, twist_axis, skip_last, planar_mode)
+        self.__create_chains([self], [frames])
 
-        valid = ["+x", "-x", "+y", "-y", "+z", "-z"]
-        if aim_axis not in valid or twist_axis not in valid:
-            raise ValueError("aim_axis and twist_axis can only take values: "
-                             "'+x', '-x', '+y', '-y', '+z', '-z'")
-        
-        if aim_axis[1] == twist_axis[1]:
-            raise ValueError("aim_axis and twist_axis cannot share same axis")
         
-        if not self.check_coplanar(pos_list):
-            raise ValueError("The given positions are not coplanar")
 
-        
-        #determine the range
-        range_end = len(pos_list)-1 if skip_last else len(pos_list)
+    def from_curve(self, curve_points=None, count=2, aim_axis="+x", twist_axis="+y", 
+                   up_vec=None, distribution="uniform", smooth=True):
+        '''
+        This method builds a joint chain along a guide curve.
+        The joints are placed by the arc length of the curve and oriented with
+        parallel transported frames, so the chain doesn't twist along the curve
+        @param curve_points: float[3] list, points of the guide curve (e.g. guide locators)
+        @param count: int, number of joints
+        @param aim_axis: string, axis going down the chain, 
+                         accepts values: ["+x", "-x", "+y", "-y", "+z", "-z"]
+        @param twist_axis: string, secondary axis controling the twist, 
+                           accepts values: ["+x", "-x", "+y", "-y", "+z", "-z"] 
+        @param up_vec: float[3], a direction at which twist_axis of the first joint should aim,
+                       if None the world axis most perpendicular to the chain is used
+        @param distribution: string, "uniform", "ease_in", "ease_out", "ease_in_out",
+                             a function remapping uniform parameters between 0 and 1
+                             or a list of parameters between 0 and 1
+        @param smooth: bool, if set to True, a Catmull-Rom spline going through 
+                       the curve points is used instead of straight segments
+        '''
+        if count < 2:
+            raise ValueError("count has to be at least 2")
 
-        
-        #create joints in the correct positions
-        for i in range(range_end):
-            name = name_utils.build_unique_name(self.base_name, self.side, sett.suffixes["jnt"])    
-            pm.select(cl=1)
-            jnt = pm.joint(n=name, position=pos_list[i])
-            self.chain.append(jnt)
-        
-        #orient joints
-        if "-" in twist_axis:
-            self.perpendicular_vec = self.perpendicular_vec * -1
-            
-        #for i in range(len(self.chain)):
-        for i, joint in enumerate(self.chain):
-            if i < len(pos_list)-1: 
-                vec_start = om1.MVector(pos_list[i][0],pos_list[i][1],pos_list[i][2])
-                vec_end = om1.MVector(pos_list[i+1][0],pos_list[i+1][1],pos_list[i+1][2])
-                
-                #calculate aim vector
-                aim_vec = vec_end - vec_start
-                if "-" in aim_axis:
-                    aim_vec = vec_start - vec_end
-                aim_vec.normalize()
-                  
-                #calculate third vector
-                third_vec = aim_vec ^ self.perpendicular_vec
-                third_vec.normalize()
-                
-                #create a matrix to orient joints
-                matrix_vec = self.__create_matrix_from_vecs(aim_axis[1], twist_axis[1], aim_vec, 
-                                                            self.perpendicular_vec, third_vec)
-                              
-                # #create a matrix
-                # if "x" in aim_axis and "y" in twist_axis:
-                #     matrix_vec = [aim_vec.x, aim_vec.y, aim_vec.z, 0,
-                #                self.perpendicular_vec.x, self.perpendicular_vec.y, 
-                #                self.perpendicular_vec.z, 0,
-                #                third_vec.x, third_vec.y, third_vec.z, 0,                                                     
-                #                 0,0,0,1]
-                # elif "x" in aim_axis and "z" in twist_axis:
-                #     matrix_vec = [aim_vec.x, aim_vec.y, aim_vec.z, 0,                               
-                #                third_vec.x, third_vec.y, third_vec.z, 0,
-                #                self.perpendicular_vec.x, self.perpendicular_vec.y, 
-                #                self.perpendicular_vec.z, 0,                                                
-                #                 0,0,0,1]             
-                # elif "y" in aim_axis and "x" in twist_axis:
-                #     matrix_vec = [self.perpendicular_vec.x, self.perpendicular_vec.y, 
-                #                   self.perpendicular_vec.z, 0,
-                #                aim_vec.x, aim_vec.y, aim_vec.z, 0,
-                #                third_vec.x, third_vec.y, third_vec.z, 0,                                                     
-                #                 0,0,0,1]
-                # elif "y" in aim_axis and "z" in twist_axis:
-                #     matrix_vec = [third_vec.x, third_vec.y, third_vec.z, 0,
-                #                aim_vec.x, aim_vec.y, aim_vec.z, 0,
-                #                self.perpendicular_vec.x, self.perpendicular_vec.y, 
-                #                self.perpendicular_vec.z, 0,                                                                                    
-                #                 0,0,0,1]
-                # elif "z" in aim_axis and "x" in twist_axis:                  
-                #     matrix_vec = [self.perpendicular_vec.x, self.perpendicular_vec.y, 
-                #                   self.perpendicular_vec.z, 0,
-                #                third_vec.x, third_vec.y, third_vec.z, 0,                                                       
-                #                aim_vec.x, aim_vec.y, aim_vec.z, 0,                                                    
-                #                 0,0,0,1]
-                # elif "z" in aim_axis and "y" in twist_axis:
-                #     matrix_vec = [third_vec.x, third_vec.y, third_vec.z, 0,
-                #                self.perpendicular_vec.x, self.perpendicular_vec.y, 
-                #                self.perpendicular_vec.z, 0,                              
-                #                aim_vec.x, aim_vec.y, aim_vec.z, 0,                                                    
-                #                 0,0,0,1]
-               
-                matrix_m = om1.MMatrix()
-                om1.MScriptUtil.createMatrixFromList(matrix_vec, matrix_m)
-                matrix_fn = om1.MTransformationMatrix(matrix_m)
-                               
-                #set joints rotations out of matrix
-                rot_rad = matrix_fn.eulerRotation()              
-                rot_deg = list(map(math.degrees, rot_rad))
-                pm.xform(joint, ws=1, rotation=(rot_deg[0],
-                                                        rot_deg[1],
-                                                        rot_deg[2]))
-                                                              
-                pm.makeIdentity(joint, apply=True, jointOrient=False, rotate=True)
-        
-        self.__make_hierarchy()
-        
-        if not skip_last:
-            self.__zero_orient_joint(self.chain[-1])
-            
-        if len(set(pos_list)) < len(pos_list):
-            om2.MGlobal.displayWarning("Some positions are overlapping")
+        unique_num = self.__check_overlapping(curve_points)
+        if unique_num < 2:
+            raise ValueError("There has to be at least 2 non-overlapping "
+                             f"curve points defined. Found: {unique_num}")
+
+        orient_utils.validate_axes(aim_axis, twist_axis)
+
+        points = curve_utils.catmull_rom(curve_points) if smooth else curve_points
+        positions = curve_utils.resample(points, count, distribution)
+
+        aim_vecs = orient_utils.segment_vectors(positions)
+        aim_vecs = np.concatenate([aim_vecs, aim_vecs[-1:]])
+        up_vecs = curve_utils.parallel_transport(aim_vecs, up_vec)
+
+        self.__create_chains([self], [_ChainFrames(positions, aim_vecs, up_vecs, 
+                                                   aim_axis, twist_axis, None, True)])
 
-        
 
     def check_coplanar(self, pos_list=None):
         '''
@@ -509,40 +505,43 @@ class JointChain(object):
         @param pos_list: float[3] list, the position list
         @return bool
         '''        
-        if len(set(pos_list)) < len(pos_list):
-            om2.MGlobal.displayWarning("Some positions overlap each other")        
-        if len(set(pos_list)) < 3:
-            om2.MGlobal.displayError("There has to be at least 3 non-overlapping "
-                                     f"positions defined. Found: {len(set(pos_list))}")
+        unique_num = self.__check_overlapping(pos_list)
+        if unique_num < 3:
+            scene.display_error("There has to be at least 3 non-overlapping "
+                                f"positions defined. Found: {unique_num}")
             return None
-        if len(set(pos_list)) == 3:
-            return True
-                
-        #define first three points as vectors
-        vec_0a = om1.MVector(pos_list[0][0], pos_list[0][1], pos_list[0][2])
-        vec_0b = om1.MVector(pos_list[1][0], pos_list[1][1], pos_list[1][2])
-        vec_0c = om1.MVector(pos_list[2][0], pos_list[2][1], pos_list[2][2])
-        
-        #define vectors between first three points      
-        vec_ab = vec_0b - vec_0a
-        vec_ac = vec_0c - vec_0a 
-      
-        #find cross product (perpendicular vector) to the first three points
-        cross_prod =  vec_ac ^ vec_ab
-       
-        #interate through all the following points 
-        #and check if the vector between them and the first point is still 
-        #perpendicular to the cross product
-        for i in range(3,len(pos_list)):
-            vec_0x = om1.MVector(pos_list[i][0], pos_list[i][1], pos_list[i][2])
-            vec_ax = vec_0x - vec_0a
-            dot_prod = vec_ax * cross_prod    
-            if (round(dot_prod,self.precision)) != 0.0:
-                return False    
+
+        coplanar, self.guide_fit = geo_utils.check_coplanar(pos_list, 10**-self.precision)
+        if self.guide_fit.normal is None:
+            scene.display_error("The given positions are collinear, "
+                                "the plane cannot be defined")
+            return None
+        if not coplanar:
+            return False
         
-        self.perpendicular_vec = cross_prod.normal()      
+        self.perpendicular_vec = self.guide_fit.normal
         return True
 
+
+    def fit_plane(self, pos_list=None):
+        '''
+        This method projects the positions onto their least-squares plane,
+        defines a normalized vector perpendicular to that plane
+        and reports how far the positions were from it
+        @param pos_list: float[3] list, the position list
+        @return numpy.ndarray: shape (N,3), the projected positions
+        '''
+        _, self.guide_fit = geo_utils.check_coplanar(pos_list, 10**-self.precision)
+        if self.guide_fit.normal is None:
+            raise ValueError("The given positions are collinear, the plane cannot be defined")
+
+        projected, self.plane_deviation = geo_utils.project_to_plane(pos_list, self.guide_fit)
+        self.perpendicular_vec = self.guide_fit.normal
+        scene.display_info(f"Positions projected onto the best-fit plane, "
+                           f"max deviation: {round(self.plane_deviation, self.precision)}")
+
+        return projected
+
        
     def check_collinear(self, pos_list=None):
         '''
@@ -550,100 +549,63 @@ class JointChain(object):
         @param pos_list: float[3] list
         @return bool 
         ''' 
-        if len(set(pos_list)) < len(pos_list):
-            om2.MGlobal.displayWarning("Some positions overlap each other")                
-        if len(set(pos_list)) < 2:
-            om2.MGlobal.displayError("There has to be at least 2 non-overlapping "
-                                     f"positions defined. Found: {len(set(pos_list))}")
+        unique_num = self.__check_overlapping(pos_list)
+        if unique_num < 2:
+            scene.display_error("There has to be at least 2 non-overlapping "
+                                f"positions defined. Found: {unique_num}")
             return None
-        if len(set(pos_list)) == 2:
-            return True
                 
-        #find first vector between two points with non-zero lenght
-        index = None        
-        for i in range(len(pos_list)-1):     
-            vec_0a = om1.MVector(pos_list[i][0], pos_list[i][1], pos_list[i][2])
-            vec_0b = om1.MVector(pos_list[i+1][0], pos_list[i+1][1], pos_list[i+1][2])
-            vec_ab = vec_0b - vec_0a
-
-            if round(vec_ab.length(), self.precision) != 0.0:
-                vec_non_0 = om1.MVector(vec_ab)
-                index = i
-                break
-
-        if index is None:
-            om1.MGlobal.displayWarning("All positions overlap each other.")
-            return None
-        
-        #interate through all the following points and run a test equation
-        for i in range(index+1,len(pos_list)):
-            vec_0x = om1.MVector(pos_list[i][0], pos_list[i][1], pos_list[i][2])
-            vec_ax = vec_0x - vec_0a           
-            if round(vec_ax.length(), self.precision) == 0.0:
-                continue           
-            test_equation = abs((vec_non_0 * vec_ax) / (vec_non_0.length() * vec_ax.length()))            
-            if round(test_equation, self.precision) != 1:
-                return False
+        collinear, self.guide_fit = geo_utils.check_collinear(pos_list, 10**-self.precision)
         
-        return True
+        return collinear
+
+
+    def __check_overlapping(self, pos_list):
+        '''
+        This method finds overlapping positions, warns about them and returns 
+        the number of non-overlapping positions.
+        The result is kept for the last position list, so the chain builders and the checks
+        they call don't search for the overlaps again
+        '''
+        points = orient_utils.as_vectors(pos_list)
+        if self.__last_overlap is None or not np.array_equal(self.__last_overlap[0], points):
+            pairs = self.find_overlapping(points)
+            self.overlapping = pairs.tolist()
+            self.__last_overlap = (points, spatial_utils.count_unique(points, pairs=pairs))
+            if self.overlapping:
+                scene.display_warning("Some positions overlap each other: "
+                                      f"{self.overlapping}")
+
+        return self.__last_overlap[1]
 
 
     @classmethod
-    def find_non_zero_vectors(cls, pos_list=None):
+    def find_overlapping(cls, pos_list=None, tolerance=None):
         '''
-        This method finds vectors between consecutive positions that are of zero length
+        This method finds pairs of positions which overlap each other
+        @param pos_list: float[3] list or numpy.ndarray (N,3)
+        @param tolerance: float, maximum distance between overlapping positions,
+                          defaults to the precision of the class
+        @return numpy.ndarray: shape (M,2), index pairs (i, j) with i < j
         '''
-        index_pair = []
-        
-        for i in range(len(pos_list)-1):
-            for n in range(i+1,len(pos_list)):   
-                vec_0a = om1.MVector(pos_list[i][0], pos_list[i][1], pos_list[i][2])
-                vec_0b = om1.MVector(pos_list[n][0], pos_list[n][1], pos_list[n][2])
-                vec_ab = vec_0b - vec_0a
-
-            if round(vec_ab.length(), cls.precision) != 0.0:
-                index_pair.append([i,n])
-        
-        return index_pair
+        if tolerance is None:
+            tolerance = 10**-cls.precision
+
+        return spatial_utils.find_overlapping(pos_list, tolerance)
         
             
     @staticmethod
     def get_vec_from_ori(obj=None):  
         '''
         This method returns 3 vectors which represent object's orientation in space
+        @param obj: SceneNode, PyNode or str
+        @return [numpy.ndarray]: normalized X, Y and Z axes of the object in world space
         '''      
+        obj = JointChain.__get_transform(obj)
         if not obj:
-            raise ValueError("Object not defined")
-        if not pm.objExists(obj):
-            raise ValueError(f"Object '{obj}' does not exist")
-        
-        # check if it is a pyNode
-        if isinstance(obj, pm.PyNode):
-            obj = obj.name()
-                   
-        sel_m = om2.MSelectionList()
-        sel_m.add(obj)        
-        obj_m = sel_m.getDependNode(0)
-    
-        if obj_m.hasFn(om2.MFn.kTransform):                   
-            obj_m_tmatrix = om2.MTransformationMatrix(
-                            om2.MMatrix(pm.xform(obj, matrix=True, ws=1, q=True)))
-            obj_rot_quat = obj_m_tmatrix.rotation(True)
-   
-            # create normalized vectors in 3 axes
-            x_axis_vec_m = om2.MVector.kXaxisVector
-            y_axis_vec_m = om2.MVector.kYaxisVector
-            z_axis_vec_m = om2.MVector.kZaxisVector
-    
-            # rotate the vectors and offset them to match object's transforms
-            x_axis_vec_m = x_axis_vec_m.rotateBy(obj_rot_quat)# + objPivotM
-            y_axis_vec_m = y_axis_vec_m.rotateBy(obj_rot_quat)# + objPivotM
-            z_axis_vec_m = z_axis_vec_m.rotateBy(obj_rot_quat)# + objPivotM
-              
-            return [x_axis_vec_m, y_axis_vec_m, z_axis_vec_m]
+            return None
         
-        om2.MGlobal.displayError(f"Object '{obj}' is not a transform")
-        return None
+        return list(orient_utils.normalize(obj.world_matrix()[:3, :3]))
 
 
 
@@ -651,22 +613,14 @@ class JointChain(object):
     def get_object_axes(obj=None):
         '''
         This method returns 3 vectors which represent object's orientation in space
+        @param obj: SceneNode, PyNode or str
+        @return (numpy.ndarray): X, Y and Z axes of the object's world matrix
         '''
+        obj = JointChain.__get_transform(obj)
         if not obj:
-            raise ValueError("Object not defined")
-        if not pm.objExists(obj):
-            raise ValueError(f"Object '{obj}' does not exist")
-                             
-        sel_m = om2.MSelectionList()
-        sel_m.add(obj)
-        obj_m = sel_m.getDependNode(0)
-        matrix = obj_m.getMatrix(worldSpace=True)
-        #obj = pm.PyNode(obj)
-        #matrix = obj.getMatrix(worldSpace=True)
+            return None
         
-        x_axis = om2.MVector(matrix(0,0), matrix(0,1), matrix(0,2))
-        y_axis = om2.MVector(matrix(1,0), matrix(1,1), matrix(1,2))
-        z_axis = om2.MVector(matrix(2,0), matrix(2,1), matrix(2,2))
+        x_axis, y_axis, z_axis = obj.world_matrix()[:3, :3]
         
         return x_axis, y_axis, z_axis
 
@@ -675,37 +629,57 @@ class JointChain(object):
     @staticmethod
     def get_rotation_as_quat(obj=None):
         '''
-        This method returns object's rotations as quaternions
+        This method returns object's world rotation as a quaternion
+        @param obj: SceneNode, PyNode or str
+        @return numpy.ndarray: shape (4,), (x, y, z, w) with w not negative
+        '''
+        obj = JointChain.__get_transform(obj)
+        if not obj:
+            return None
+        
+        axes = orient_utils.normalize(obj.world_matrix()[:3, :3])
+        return quat_utils.from_matrix(axes)[0]
+    
+
+    def get_chain_rotations(self):
+        '''
+        This method returns world rotations of all the joints in the chain, 
+        every joint is queried only once
+        @return numpy.ndarray: shape (N,4), (x, y, z, w)
+        '''
+        if not self.chain:
+            return np.empty((0, 4))
+
+        axes = np.array([jnt.world_matrix()[:3, :3] for jnt in self.chain])
+        return quat_utils.from_matrix(orient_utils.normalize(axes))
+    
+    
+    @staticmethod
+    def __get_transform(obj):
+        '''
+        This method returns a handle of the object if it is a transform
         '''
         if not obj:
             raise ValueError("Object not defined")
-        if not pm.objExists(obj):
+        if not scene.exists(obj):
             raise ValueError(f"Object '{obj}' does not exist")
         
-        sel_m = om2.MSelectionList()
-        sel_m.add(obj)
-        obj_m = sel_m.getDependNode(0)
+        obj = scene.node(obj)
+        if not obj.is_transform():
+            scene.display_error(f"Object '{obj.name()}' is not a transform")
+            return None
         
-        #check if its a transform        
-        if obj_m.hasFn(om2.MFn.kTransform):
-            xform = om2.MFnTransform(obj_m)
-            quat = xform.rotation(om2.MSpace.kWorld, asQuaternion=True)
-            #            #targetMTMatrix.rotation(True)
-            quat.normalizeIt()
-            #py_quat = [quat[x] for x in range(4)]
-            #return py_quat 
-            return quat
-
-        om2.MGlobal.displayError(f"Object '{obj}' is not a transform")
-        return None
+        return obj
+    
 
     @staticmethod
     def get_pos_from_selection():
         '''
         This method returns a list of positions of the selected objects
         '''
-        if pm.selected():
-            pos_list = [pm.xform(item, q=1, ws=1, t=1) for item in pm.selected()]
+        selected = scene.selected()
+        if selected:
+            pos_list = [item.world_matrix()[3, :3].tolist() for item in selected]
             return pos_list
         return None
         
@@ -3,10 +3,15 @@ Created on 3. 4. 2024
 
 @author: mstolarz
 '''
-import pymel.core as pm
+import time
+import unittest
+import numpy as np
 import autorig_settings as sett
-from modules import control
-import maya.OpenMaya as om
+from modules.submodules import control
+from modules.submodules import control_batch
+from utils import scene
+from utils.scene.fake_backend import FakeBackend
+from data import shape_library
 
 def create_all_controls(move_by=3):
     '''
@@ -24,14 +29,201 @@ def create_all_controls(move_by=3):
         ctrl = control.Control(base_name=shp, ctrl_color=color_name)
         try:
             ctrl.build(shp)
-            pm.move(i*move_by,0,0, ctrl.control_grp)
+            ctrl.control_grp.set_attr("translateX", i*move_by)
         except ValueError as e:
             print("Error:", e)
         else:
             ctrls_num += 1
             color_index += 1
 
-    om.MGlobal.displayInfo(f"{ctrls_num}/{len(sett.ctrl_shp_types)}: "
+    scene.display_info(f"{ctrls_num}/{len(sett.ctrl_shp_types)}: "
                            "controls created / shape names defined")
 
-        
\ No newline at end of file
+
+class TestControl(unittest.TestCase):
+    def setUp(self):
+        self.previous_backend = scene.set_backend(FakeBackend())
+
+    def tearDown(self):
+        scene.set_backend(self.previous_backend)
+
+    def test_build(self):
+        for shp in sett.ctrl_shp_types:
+            ctrl = control.Control(base_name=shp, side="L", size=2.0, 
+                                   ctrl_color="red", aim_axis="y")
+            ctrl.build(shp)
+
+            curves = shape_library.get_shape(shp)
+            shapes = ctrl.control.shapes()
+            self.assertEqual(len(shapes), len(curves))
+            self.assertEqual(ctrl.control.parent(), ctrl.control_grp)
+            self.assertEqual(ctrl.control.name(), f"{shp}_L_ctrl")
+
+            for sh, crv in zip(shapes, curves):
+                degree, periodic, points, knots = scene.curve_data(sh)
+                self.assertEqual(degree, crv.degree)
+                self.assertEqual(periodic, crv.form == "periodic")
+                self.assertEqual(knots, crv.knots.tolist())
+                # aim "y" turns X into Y
+                expected = crv.points[:, [1, 0, 2]] * [-2.0, 2.0, 2.0]
+                self.assertTrue(np.allclose(points, expected, atol=1e-6))
+
+            if any(crv.color for crv in curves):
+                colors = [sh.get_attr("overrideColorRGB") for sh in shapes]
+                self.assertEqual(colors, [tuple(sett.colors[crv.color]) for crv in curves])
+            else:
+                self.assertEqual(ctrl.control.get_attr("overrideColorRGB"), 
+                                 tuple(sett.colors["red"]))
+
+        self.assertRaises(ValueError, control.Control().build, "notAShape")
+
+        print ("Successfully ran test_build")
+
+    def test_ctrls_data(self):
+        ctrl = control.Control(base_name="axes")
+        ctrl.build("axes")
+        scene.get_backend().selection = [ctrl.control]
+
+        data = control.Control.get_ctrls_data()
+        self.assertEqual(data[0]["name"], "axes_M_ctrl")
+        self.assertEqual(len(data[0]["shapes"]), 4)
+        self.assertEqual(data[0]["degrees"], [1, 1, 1, 1])
+
+        print ("Successfully ran test_ctrls_data")
+
+    def test_mirror(self):
+        arm = scene.create_node("transform", name="arm_L_grp")
+        scene.create_node("transform", name="arm_R_grp")
+        ctrls = []
+        for shp, color in (("circle", "red"), ("axes", None)):
+            ctrl = control.Control(base_name=shp, side="L", ctrl_color=color, aim_axis="y")
+            ctrl.build(shp)
+            ctrl.control_grp.set_parent(arm)
+            ctrl.control_grp.set_matrix([0, 1, 0, 0, -1, 0, 0, 0, 0, 0, 1, 0, 3, 2, 1, 1])
+            ctrls.append(ctrl)
+        reflection = np.diag([-1.0, 1.0, 1.0])
+
+        mirrored = control.Control.mirror_many(ctrls)
+        for ctrl, mirrored_ctrl in zip(ctrls, mirrored):
+            self.assertEqual(mirrored_ctrl.control.name(), ctrl.control.name().replace("_L_", "_R_"))
+            self.assertEqual(mirrored_ctrl.control.parent(), mirrored_ctrl.control_grp)
+            self.assertEqual(mirrored_ctrl.control_grp.parent().name(), "arm_R_grp")
+            matrix = ctrl.control.world_matrix()
+            mirrored_matrix = mirrored_ctrl.control.world_matrix()
+            self.assertTrue(np.allclose(mirrored_matrix[:3, :3], -(matrix[:3, :3] @ reflection)))
+
+            shapes = ctrl.control.shapes()
+            mirrored_shapes = mirrored_ctrl.control.shapes()
+            self.assertEqual(len(mirrored_shapes), len(shapes))
+            for sh, mirrored_sh in zip(shapes, mirrored_shapes):
+                degree, periodic, points, knots = scene.curve_data(sh)
+                self.assertEqual(scene.curve_data(mirrored_sh)[:2], (degree, periodic))
+                mirrored_points = scene.curve_data(mirrored_sh)[2]
+                # the CVs end up at the reflected world positions
+                world = points @ matrix[:3, :3] + matrix[3, :3]
+                mirrored_world = mirrored_points @ mirrored_matrix[:3, :3] + mirrored_matrix[3, :3]
+                self.assertTrue(np.allclose(mirrored_world, world @ reflection))
+                self.assertEqual(mirrored_sh.get_attr("overrideColorRGB"), 
+                                 sh.get_attr("overrideColorRGB"))
+
+        copy = ctrls[0].mirror(mode="orientation")
+        self.assertTrue(np.allclose(copy.control.world_matrix()[:3, :3], 
+                                    ctrls[0].control.world_matrix()[:3, :3]))
+        self.assertRaises(ValueError, control.Control().mirror)
+
+        print ("Successfully ran test_mirror")
+
+    def test_undo_steps(self):
+        backend = scene.get_backend()
+        ctrl = control.Control(base_name="circle", side="L", ctrl_color="red")
+        ctrl.build("circle")
+        self.assertEqual(backend.undo_steps[-1], "Control build")
+
+        ctrl.mirror()
+        self.assertEqual(backend.undo_steps[-1], "Control mirror")
+        self.assertEqual(backend.undo_chunks, [])
+        self.assertEqual(backend.undo_steps.count("Control build"), 1)
+
+        print ("Successfully ran test_undo_steps")
+
+
+
+def benchmark_build(iterations=100):
+    '''
+    The function builds all the controls defined in autorig_settings a number of times 
+    with the pymel path and with the API path and compares the times with the undo queue on 
+    (interactive use) and off (batch builds)
+    @param iterations: int, how many times all the shapes are built
+    @return dict: undo queue state -> (float, float), time in seconds for the pymel 
+            and the API path
+    '''
+    from maya import cmds
+
+    undo_state = cmds.undoInfo(query=True, state=True)
+    results = {}
+    try:
+        for state in (True, False):
+            cmds.undoInfo(stateWithoutFlush=state)
+            times = []
+            for use_api in (False, True):
+                grps = []
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    for shp in sett.ctrl_shp_types:
+                        ctrl = control.Control(base_name=shp, size=2.0, aim_axis="z")
+                        ctrl.build(shp, use_api=use_api)
+                        grps.append(ctrl.control_grp)
+                times.append(time.perf_counter() - start)
+                scene.delete(*grps)
+
+            results[state] = tuple(times)
+            scene.display_info(f"{iterations}x{len(sett.ctrl_shp_types)} controls, "
+                               f"undo {'on' if state else 'off'} - "
+                               f"pymel: {times[0]:.3f}s, API: {times[1]:.3f}s")
+    finally:
+        cmds.undoInfo(stateWithoutFlush=undo_state)
+
+    return results
+
+
+def benchmark_batch(count=500, move_by=3):
+    '''
+    The function builds the same controls one by one and with ControlBatch
+    and prints the time spent in each phase of the batch
+    @param count: int, number of controls
+    @param move_by: int, a unit by which controls are distributed in the scene in X axis
+    @return (float, float): time in seconds for the single controls and the batch
+    '''
+    shapes = sett.ctrl_shp_types
+    colors = list(sett.colors)
+    specs = [control_batch.ControlSpec(base_name="batch", shape_type=shapes[i % len(shapes)],
+                                       ctrl_color=colors[i % len(colors)],
+                                       matrix=[1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 
+                                               i*move_by, 0, 0, 1])
+             for i in range(count)]
+
+    grps = []
+    start = time.perf_counter()
+    for spec in specs:
+        ctrl = control.Control(base_name=spec.base_name, ctrl_color=spec.ctrl_color)
+        ctrl.build(spec.shape_type)
+        ctrl.control_grp.set_attr("translateX", spec.matrix[12])
+        grps.append(ctrl.control_grp)
+    single_time = time.perf_counter() - start
+    scene.delete(*grps)
+
+    batch = control_batch.ControlBatch(specs)
+    start = time.perf_counter()
+    batch.build()
+    batch_time = time.perf_counter() - start
+    batch.print_timings()
+    batch.undo()
+
+    scene.display_info(f"{count} controls - single: {single_time:.3f}s, "
+                           f"batch: {batch_time:.3f}s")
+    return single_time, batch_time
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,95 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import unittest
+import numpy as np
+import autorig_settings as sett
+from modules.submodules import control_batch
+from utils import scene
+from utils.scene.fake_backend import FakeBackend
+from data import shape_library
+
+
+class TestControlBatch(unittest.TestCase):
+    def setUp(self):
+        self.backend = FakeBackend()
+        self.previous_backend = scene.set_backend(self.backend)
+
+    def tearDown(self):
+        scene.set_backend(self.previous_backend)
+
+    def test_build(self):
+        matrix = np.array([[0, 1, 0, 0], [-1, 0, 0, 0], [0, 0, 2, 0], [3, 2, 1, 1]], dtype=float)
+        batch = control_batch.ControlBatch()
+        batch.add("spike", "circle", side="L", size=2.0, ctrl_color="red", aim_axis="y",
+                  matrix=matrix)
+        batch.add("spike", "circle", side="L", size=2.0, ctrl_color="blue", aim_axis="y")
+        batch.add("feather", "axes", matrix=matrix.ravel().tolist())
+
+        scene.create_node("transform", name="spike_L_ctrl_01")
+        controls = batch.build()
+        # the controls sharing a base name and side get one block of numbers
+        self.assertEqual(controls, ["spike_L_ctrl_02", "spike_L_ctrl_03", "feather_M_ctrl_01"])
+        self.assertEqual(batch.control_grps, 
+                         ["spikeZero_L_grp_01", "spikeZero_L_grp_02", "featherZero_M_grp_01"])
+        self.assertEqual(self.backend.undo_steps, ["ControlBatch"])
+
+        for ctrl_name, grp_name, spec in zip(controls, batch.control_grps, batch.specs):
+            ctrl = scene.node(ctrl_name)
+            grp = scene.node(grp_name)
+            self.assertEqual(ctrl.parent(), grp)
+            self.assertIsNone(grp.parent())
+            expected = matrix if spec.matrix is not None else np.identity(4)
+            self.assertTrue(np.allclose(grp.world_matrix(), expected))
+            self.assertTrue(np.allclose(ctrl.world_matrix(), expected))
+
+            curves = shape_library.get_shape(spec.shape_type)
+            shapes = ctrl.shapes()
+            self.assertEqual([sh.name() for sh in shapes], 
+                             [ctrl_name+"Shape"+(str(i) if i else "") 
+                              for i in range(len(curves))])
+            for sh, crv in zip(shapes, curves):
+                degree, periodic, points, knots = scene.curve_data(sh)
+                self.assertEqual((degree, periodic, knots), 
+                                 (crv.degree, crv.form == "periodic", crv.knots.tolist()))
+                expected = control_batch.Control.shape_points(crv, spec.aim_axis, spec.size)
+                self.assertTrue(np.allclose(points, expected[:len(points)]))
+
+            if any(crv.color for crv in curves):
+                self.assertEqual([sh.get_attr("overrideColorRGB") for sh in shapes],
+                                 [tuple(sett.colors[crv.color]) for crv in curves])
+                self.assertFalse(ctrl.get_attr("overrideEnabled"))
+            else:
+                for node in [ctrl] + shapes:
+                    self.assertTrue(node.get_attr("overrideEnabled"))
+                    self.assertEqual(node.get_attr("overrideColorRGB"), 
+                                     tuple(sett.colors[spec.ctrl_color]))
+
+        self.assertRaises(ValueError, batch.build)
+        batch.undo()
+        self.assertEqual(batch.controls, [])
+        self.assertFalse(scene.exists("spike_L_ctrl_02"))
+        self.assertEqual(len(self.backend), 1)
+
+        print ("Successfully ran test_build")
+
+    def test_validate(self):
+        self.assertRaises(ValueError, control_batch.ControlBatch().build)
+        for spec in (control_batch.ControlSpec("a", "notAShape"),
+                     control_batch.ControlSpec("a", "circle", side="X"),
+                     control_batch.ControlSpec("a", "circle", aim_axis="-x"),
+                     control_batch.ControlSpec("a", "circle", ctrl_color="notAColor"),
+                     control_batch.ControlSpec("a", "circle", matrix=[1, 0, 0])):
+            batch = control_batch.ControlBatch([control_batch.ControlSpec("b", "circle"), spec])
+            self.assertRaises(ValueError, batch.build)
+        # nothing is created when a spec is not valid
+        self.assertEqual(len(self.backend), 0)
+
+        print ("Successfully ran test_validate")
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
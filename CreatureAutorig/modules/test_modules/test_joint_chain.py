@@ -3,16 +3,323 @@ Created on 22. 3. 2024
 
 @author: mstolarz
 '''
+import time
+import itertools
 import unittest
+import numpy as np
+from modules.submodules.joint_chain import JointChain, ChainSpec
+from utils import scene
+from utils import orient_utils
+from utils import quat_utils
+from utils.scene.fake_backend import FakeBackend
 
 
 class TestJointChain(unittest.TestCase):
+    def setUp(self):
+        self.backend = FakeBackend()
+        self.previous_backend = scene.set_backend(self.backend)
 
+    def tearDown(self):
+        scene.set_backend(self.previous_backend)
 
     def test_linear_chain(self):
-        pass
+        pos_list = [(0, 0, 0), (0, 2, 0), (0, 5, 0), (0, 6, 0)]
+        chain = JointChain("spine")
+        chain.linear_chain(pos_list, aim_axis="+x", twist_axis="-z", twist_vec=(1, 0, 0))
+
+        self.assertEqual(chain.chain_length(), 4)
+        self.assertEqual(chain.chain[0].name(), "spine_M_jnt_01")
+        self.assertEqual(chain.chain[1].parent(), chain.chain[0])
+        for jnt, pos in zip(chain.chain[:-1], pos_list):
+            matrix = jnt.world_matrix()
+            self.assertTrue(np.allclose(matrix[3, :3], pos))
+            self.assertTrue(np.allclose(matrix[0, :3], (0, 1, 0)))
+            self.assertTrue(np.allclose(matrix[2, :3], (-1, 0, 0)))
+        # the last joint has its orientation zeroed out
+        self.assertEqual(chain.chain[-1].get_attr("jointOrient"), (0.0, 0.0, 0.0))
+        self.assertTrue(np.allclose(chain.chain[-1].world_matrix()[3, :3], pos_list[-1]))
+
+        print ("Successfully ran test_linear_chain")
+
+    def test_linear_chain_axes(self):
+        # the same combinations as linear_chain_test, checked against frames built by hand
+        pos_list = [(1, 1, 1), (3, 1, 1), (5, 1, 1), (6, 1, 1)]
+        twist_vec = np.array([0.0, 0.6, 0.8])
+        vecs = {"x": np.array([1.0, 0.0, 0.0]), "twist": twist_vec}
+        combinations = [(aim, twist) for aim, twist in itertools.product(
+                        orient_utils.VALID_AXES, repeat=2) if aim[1] != twist[1]]
+        self.assertEqual(len(combinations), 24)
+
+        for aim_axis, twist_axis in combinations:
+            chain = JointChain(f"{aim_axis}{twist_axis}")
+            chain.linear_chain(pos_list, aim_axis, twist_axis, twist_vec=twist_vec)
+
+            frame = np.zeros((3, 3))
+            aim_index = orient_utils.AXIS_INDEX[aim_axis[1]]
+            twist_index = orient_utils.AXIS_INDEX[twist_axis[1]]
+            frame[aim_index] = vecs["x"] * (1 if aim_axis[0] == "+" else -1)
+            frame[twist_index] = vecs["twist"] * (1 if twist_axis[0] == "+" else -1)
+            third = 3 - aim_index - twist_index
+            frame[third] = np.cross(frame[(third+1) % 3], frame[(third+2) % 3])
+
+            expected = quat_utils.from_matrix(frame)
+            angles = quat_utils.angle_between(chain.get_chain_rotations(), expected)
+            np.testing.assert_allclose(angles, 0.0, atol=1e-5, err_msg=f"{aim_axis} {twist_axis}")
+            quat = chain.get_rotation_as_quat(chain.chain[1])
+            self.assertAlmostEqual(float(quat_utils.angle_between(quat, expected)[0]), 0.0, 4)
+            for jnt in chain.chain:
+                self.assertEqual(jnt.get_attr("rotate"), (0.0, 0.0, 0.0))
+            scene.delete(chain.chain[0])
+
+        print ("Successfully ran test_linear_chain_axes")
+
+    def test_planar_chain(self):
+        pos_list = [(0, 0, 0), (2, 0, -1), (4, 0, 0), (5, 0, 2)]
+        chain = JointChain("leg", side="L")
+        chain.planar_chain(pos_list, aim_axis="+x", twist_axis="+z")
+
+        aims = orient_utils.segment_vectors(pos_list)
+        for jnt, pos, aim in zip(chain.chain, pos_list, aims):
+            matrix = jnt.world_matrix()
+            self.assertTrue(np.allclose(matrix[3, :3], pos))
+            self.assertTrue(np.allclose(matrix[0, :3], aim))
+            self.assertTrue(np.allclose(np.abs(matrix[2, :3]), (0, 1, 0)))
+
+        print ("Successfully ran test_planar_chain")
+
+    def test_planar_chain_fit(self):
+        pos_list = [(0, 0.02, 0), (2, -0.03, -1), (4, 0.01, 0), (5, 0, 2)]
+        chain = JointChain("leg", side="R")
+        with self.assertRaises(ValueError):
+            chain.planar_chain(pos_list, aim_axis="+x", twist_axis="+z")
+        self.assertEqual(chain.chain_length(), 0)
+
+        chain.planar_chain(pos_list, aim_axis="+x", twist_axis="+z", planar_mode="fit")
+        self.assertEqual(chain.chain_length(), 4)
+        self.assertTrue(0.0 < chain.plane_deviation < 0.03)
+
+        # all the joints sit on the fitted plane and share its normal
+        normal = chain.perpendicular_vec
+        centroid = chain.guide_fit.centroid
+        for jnt in chain.chain:
+            matrix = jnt.world_matrix()
+            self.assertAlmostEqual(float((matrix[3, :3] - centroid) @ normal), 0.0)
+            self.assertAlmostEqual(abs(float(matrix[2, :3] @ normal)), 1.0)
+
+        self.assertRaises(ValueError, chain.planar_chain, pos_list, planar_mode="snap")
+
+        print ("Successfully ran test_planar_chain_fit")
+
+    def test_arbitrary_chain(self):
+        pos_list = [(0, 0, 0), (0, 3, 0), (2, 3, 0)]
+        orient_list = [(0, 0, 90), (0, 0, 0), (0, 0, 0)]
+        chain = JointChain("tail")
+        chain.arbitrary_chain(pos_list, orient_list)
+
+        # the joints are created under each other with local values, nothing is compensated
+        self.assertEqual(chain.chain[2].parent(), chain.chain[1])
+        self.assertTrue(np.allclose(chain.chain[1].get_attr("translate"), (3, 0, 0)))
+        self.assertTrue(np.allclose(chain.chain[1].get_attr("jointOrient"), (0, 0, -90)))
+        for jnt, pos, ori in zip(chain.chain, pos_list, orient_list):
+            self.assertEqual(jnt.get_attr("rotate"), (0.0, 0.0, 0.0))
+            matrix = jnt.world_matrix()
+            self.assertTrue(np.allclose(matrix[3, :3], pos))
+            self.assertTrue(np.allclose(matrix[:3, :3], orient_utils.euler_to_matrix(ori)[0]))
+
+        print ("Successfully ran test_arbitrary_chain")
+
+    def test_from_curve(self):
+        angles = np.linspace(0, np.pi, 7)
+        curve_points = np.stack([np.cos(angles)*5, np.sin(angles)*5, np.zeros(7)], axis=1)
+        chain = JointChain("tentacle")
+        chain.from_curve(curve_points, 200, aim_axis="+x", twist_axis="+z", up_vec=(0, 0, 1))
+
+        self.assertEqual(chain.chain_length(), 200)
+        matrices = np.array([jnt.world_matrix() for jnt in chain.chain])
+        positions = matrices[:, 3, :3]
+        np.testing.assert_allclose(positions[[0, -1]], curve_points[[0, -1]], atol=1e-9)
+        # evenly spaced and close to the circle the guides sit on
+        spacing = np.linalg.norm(np.diff(positions, axis=0), axis=1)
+        self.assertLess(np.ptp(spacing) / spacing.mean(), 0.01)
+        np.testing.assert_allclose(np.linalg.norm(positions, axis=1), 5.0, rtol=3e-2)
+
+        # every joint aims at the next one and keeps the twist axis on the plane normal
+        for jnt, matrix, aim in zip(chain.chain, matrices, np.diff(positions, axis=0)):
+            np.testing.assert_allclose(matrix[0, :3], aim/np.linalg.norm(aim), atol=1e-9)
+            np.testing.assert_allclose(matrix[2, :3], (0, 0, 1), atol=1e-9)
+            self.assertAlmostEqual(float(jnt.get_attr("jointOrient")[0]), 0.0)
+        self.assertEqual(chain.chain[-1].get_attr("jointOrient"), (0.0, 0.0, 0.0))
+
+        eased = JointChain("eased")
+        eased.from_curve([(0, 0, 0), (10, 0, 0)], 5, distribution="ease_in", smooth=False)
+        np.testing.assert_allclose([jnt.get_attr("translateX") for jnt in eased.chain],
+                                   [0, 0.625, 1.875, 3.125, 4.375])
+        self.assertRaises(ValueError, eased.from_curve, [(0, 0, 0), (0, 0, 0)], 5)
+
+        print ("Successfully ran test_from_curve")
+
+    def test_build_many(self):
+        leg = [(0, 10, 0), (0, 6, 1), (0, 2, 0), (0, 0, 1)]
+        specs = [ChainSpec("leg", [(x+p[0], p[1], z+p[2]) for p in leg], side=side, 
+                           aim_axis="+x", twist_axis="+z")
+                 for x, side in ((4, "L"), (-4, "R")) for z in (5, -5)]
+        specs.append(ChainSpec("neck", [(0, 10, 5), (0, 12, 7), (0, 14, 9)], mode="linear",
+                               aim_axis="+y", twist_axis="+x", twist_vec=(1, 0, 0)))
+        specs.append(ChainSpec("tail", [(0, 10, -5), (0, 9, -8)], mode="arbitrary",
+                               orient_list=[(0, 45, 0), (0, 90, 0)], zero_orient_last=True))
+        patterns = []
+        list_names = self.backend.list_names
+        self.backend.list_names = lambda pattern="*": patterns.append(pattern) or list_names(pattern)
+        chains, timings = JointChain.build_many(specs)
+        # only the names sharing the chain prefixes are read, not the whole scene
+        self.assertEqual(sorted(patterns), ["leg_L_*", "leg_R_*", "neck_M_*", "tail_M_*"])
+        del self.backend.list_names
+
+        self.assertEqual([chain.chain_length() for chain in chains], [4, 4, 4, 4, 3, 2])
+        self.assertEqual(set(timings), {"validate", "orients", "names", "dag"})
+        self.assertEqual(self.backend.undo_steps, ["JointChain"])
+        # chains sharing a base name and side get their own numbers
+        self.assertEqual(chains[0].chain[0].name(), "leg_L_jnt_01")
+        self.assertEqual(chains[1].chain[0].name(), "leg_L_jnt_05")
+        self.assertEqual(chains[2].chain[-1].name(), "leg_R_jnt_04")
+        for chain in chains:
+            self.assertIsNone(chain.chain[0].parent())
+            for parent, child in zip(chain.chain[:-1], chain.chain[1:]):
+                self.assertEqual(child.parent(), parent)
+        self.assertEqual(chains[-1].chain[-1].get_attr("jointOrient"), (0.0, 0.0, 0.0))
+
+        # the same result as building the chains one by one
+        single = JointChain("single", side="L")
+        single.planar_chain(specs[0].pos_list, aim_axis="+x", twist_axis="+z")
+        for batch_jnt, single_jnt in zip(chains[0].chain, single.chain):
+            self.assertTrue(np.allclose(batch_jnt.world_matrix(), single_jnt.world_matrix()))
+        single = JointChain("single")
+        single.linear_chain(specs[4].pos_list, "+y", "+x", twist_vec=(1, 0, 0))
+        for batch_jnt, single_jnt in zip(chains[4].chain, single.chain):
+            self.assertTrue(np.allclose(batch_jnt.world_matrix(), single_jnt.world_matrix()))
+
+        print ("Successfully ran test_build_many")
+
+    def test_build_many_validation(self):
+        specs = [ChainSpec("arm", [(0, 0, 0), (2, 0, -1), (4, 0, 0)]),
+                 ChainSpec("arm", [(0, 0, 0), (2, 0, -1), (4, 1, 0), (5, 0, 3)], side="R")]
+        with self.assertRaisesRegex(ValueError, "Chain 1 \\(arm\\): .*not coplanar"):
+            JointChain.build_many(specs)
+        with self.assertRaisesRegex(ValueError, "Chain 0 .*side"):
+            JointChain.build_many([specs[0]._replace(side="X")])
+        with self.assertRaisesRegex(ValueError, "mode"):
+            JointChain.build_many([specs[0]._replace(mode="spline")])
+        self.assertRaises(ValueError, JointChain.build_many, [])
+        # nothing is created until all the specs are valid
+        self.assertEqual(len(self.backend), 0)
+
+        print ("Successfully ran test_build_many_validation")
+
+    def test_mirror(self):
+        hips = scene.create_node("transform", name="hips_L_grp")
+        hips_r = scene.create_node("transform", name="hips_R_grp")
+        hips_r.set_attr("translate", (-3, 8, 1))
+        hips_r.set_attr("rotate", (0, 30, 10))
+        legs = [JointChain("leg", side="L"), JointChain("leg", side="L")]
+        legs[0].planar_chain([(4, 10, 0), (4, 6, 1), (4, 2, 0), (4, 0, 1)], "+x", "+z")
+        legs[1].planar_chain([(2, 10, 3), (3, 6, 4), (2, 2, 5)], "-y", "+x")
+        legs[0].chain[0].set_parent(hips)
+        reflection = np.diag([-1.0, 1.0, 1.0])
+
+        mirrored = JointChain.mirror_many(legs)
+        self.assertEqual(self.backend.undo_steps[-1], "JointChain")
+        self.assertEqual(mirrored[0].chain[0].name(), "leg_R_jnt_01")
+        self.assertEqual(mirrored[1].chain[-1].name(), "leg_R_jnt_07")
+        self.assertEqual(mirrored[0].chain[0].parent().name(), "hips_R_grp")
+        self.assertIsNone(mirrored[1].chain[0].parent())
+        for leg, mirrored_leg in zip(legs, mirrored):
+            self.assertEqual(mirrored_leg.chain_length(), leg.chain_length())
+            for jnt, mirrored_jnt in zip(leg.chain, mirrored_leg.chain):
+                matrix = jnt.world_matrix()
+                mirrored_matrix = mirrored_jnt.world_matrix()
+                self.assertTrue(np.allclose(mirrored_matrix[3, :3], matrix[3, :3] @ reflection))
+                self.assertTrue(np.allclose(mirrored_matrix[:3, :3], 
+                                            -(matrix[:3, :3] @ reflection)))
+
+        spine = JointChain("spine")
+        spine.linear_chain([(0, 10, 0), (0, 12, 0)], "+y", "+z", twist_vec=(0, 0, 1))
+        copy = spine.mirror(mode="orientation")
+        self.assertEqual(copy.chain[0].name(), "spine_M_jnt_03")
+        self.assertTrue(np.allclose(copy.chain[0].world_matrix(), spine.chain[0].world_matrix()))
+        self.assertRaises(ValueError, JointChain("empty").mirror)
+
+        print ("Successfully ran test_mirror")
+
+
+def benchmark_chain(sizes=(10, 100, 1000)):
+    '''
+    The function builds chains of different lengths by creating the joints in the world
+    and reparenting them afterwards and with JointChain, which creates them parent first
+    @param sizes: int list, numbers of joints in the chains
+    @return dict: size -> (float, float), time in seconds for the reparenting and JointChain
+    '''
+    results = {}
+    for size in sizes:
+        pos_list = [(i, np.sin(i*0.1), 0) for i in range(size)]
+        orient_list = [(0, 0, 0)]*size
+
+        start = time.perf_counter()
+        joints = []
+        for i, (pos, ori) in enumerate(zip(pos_list, orient_list)):
+            jnt = scene.create_node("joint", name=f"reparented_M_jnt_{i+1:02d}")
+            jnt.set_attr("translate", pos)
+            jnt.set_attr("jointOrient", ori)
+            joints.append(jnt)
+        for child, parent in zip(reversed(joints[1:]), reversed(joints[:-1])):
+            child.set_parent(parent)
+        reparent_time = time.perf_counter() - start
+        scene.delete(joints[0])
+
+        start = time.perf_counter()
+        chain = JointChain("created")
+        chain.arbitrary_chain(pos_list, orient_list)
+        chain_time = time.perf_counter() - start
+        scene.delete(chain.chain[0])
+
+        results[size] = (reparent_time, chain_time)
+        scene.display_info(f"{size} joints - reparented: {reparent_time:.4f}s, "
+                           f"parent first: {chain_time:.4f}s")
+
+    return results
+
+
+def benchmark_build_many(count=24):
+    '''
+    The function builds the same linear chains one by one and with JointChain.build_many
+    @param count: int, number of chains
+    @return (float, float): time in seconds for the single chains and build_many
+    '''
+    pos_list = [(i*2.0, 0, 0) for i in range(8)]
+    axes = [(aim, twist) for aim, twist in itertools.product(orient_utils.VALID_AXES, repeat=2)
+            if aim[1] != twist[1]]
+    specs = [ChainSpec("bench", pos_list, mode="linear", aim_axis=axes[i % len(axes)][0], 
+                       twist_axis=axes[i % len(axes)][1], twist_vec=(0, 0.6, 0.8)) 
+             for i in range(count)]
+
+    start = time.perf_counter()
+    roots = []
+    for spec in specs:
+        chain = JointChain(spec.base_name)
+        chain.linear_chain(spec.pos_list, spec.aim_axis, spec.twist_axis, spec.twist_vec)
+        roots.append(chain.chain[0])
+    single_time = time.perf_counter() - start
+    scene.delete(*roots)
+
+    start = time.perf_counter()
+    chains, timings = JointChain.build_many(specs)
+    batch_time = time.perf_counter() - start
+    scene.delete(*[chain.chain[0] for chain in chains])
+
+    scene.display_info(f"{count} chains - single: {single_time:.4f}s, "
+                       f"build_many: {batch_time:.4f}s")
+    return single_time, batch_time
 
 
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -1,7 +1,23 @@
-from . import xform_utils
-from . import plug_utils
-from . import name_utils
-from . import meta_utils
-from . import hierarchy_utils
-from . import attr_utils
-from .test_utils import test_attr_utils
\ No newline at end of file
+try:
+    from .. import _lazy
+except ImportError: # the package is imported as a top level package
+    import _lazy
+
+# attribute name -> submodule, imported on first access (PEP 562)
+_SUBMODULES = {"scene": ".scene",
+               "xform_utils": ".xform_utils",
+               "plug_utils": ".plug_utils",
+               "name_registry": ".name_registry",
+               "name_utils": ".name_utils",
+               "quat_utils": ".quat_utils",
+               "orient_utils": ".orient_utils",
+               "curve_utils": ".curve_utils",
+               "mirror_utils": ".mirror_utils",
+               "geo_utils": ".geo_utils",
+               "spatial_utils": ".spatial_utils",
+               "meta_utils": ".meta_utils",
+               "hierarchy_utils": ".hierarchy_utils",
+               "attr_utils": ".attr_utils"}
+
+
+_lazy.attach(__name__, globals(), _SUBMODULES)
@@ -3,8 +3,8 @@ Created on 24. 12. 2023
 
 @author: mstolarz
 '''
-import pymel.core as pm
-import maya.OpenMaya as om
+from functools import lru_cache
+from utils import scene
 
 
 VALID_INPUT = ["all", "a", "translate", "t", "rotate", "r", 
@@ -24,6 +24,11 @@ ATTR_REMAP = {"translateX": ["all", "a", "translate", "t", "translateX", "tx", "
              "scaleZ": ["all", "a", "scale", "s", "scaleZ", "sz", "z"],
              "visibility": ["all", "a", "visibility", "v"]
              }
+ATTR_INDEX = {attr: i for i, attr in enumerate(ATTR_REMAP)}
+# every valid input token as a bitmask of the attributes it stands for, bit i is ATTR_INDEX i
+TOKEN_MASKS = {token: sum(1 << ATTR_INDEX[attr] for attr, tokens in ATTR_REMAP.items() 
+                          if token in tokens) 
+               for token in VALID_INPUT}
 
 
 
@@ -77,30 +82,86 @@ def validate_input(input_list):
 
 def remap_input(input_list):
     '''
-    This method takes the validated input and checks each item in the list
-    for the key it represents in the dictionary ATTR_REMAP
-    '''
-    attrs = []
-    if "all" in input_list or "a" in input_list:
-        return list(ATTR_REMAP.keys())
-        
-        
-    for key, values in ATTR_REMAP.items():
-        for item in input_list:
-            if item in values:
-                attrs.append(key)
-                
-    attrs = list(set(attrs))
-    attrs.sort(key=sort_by_key_index)
-    
-    return attrs
-        
+    This method takes the validated input and returns the attributes 
+    the items stand for in the order of ATTR_REMAP
+    '''
+    mask = 0
+    for item in input_list:
+        mask |= TOKEN_MASKS.get(item, 0)
+
+    return list(mask_attrs(mask))
+
+
 def sort_by_key_index(attr):
     '''
     This function returns index of a key in a dictionary ATTR_REMAP
     '''
     
-    return list(ATTR_REMAP.keys()).index(attr)            
+    return ATTR_INDEX[attr]
+
+
+def attr_mask(*input_vals):
+    '''
+    The function validates the input and returns the bitmask of the attributes it stands for
+    @param input_vals: str or [str], values valid for lock_and_hide, None is ignored
+    @return int: bit i is set if the attribute with ATTR_INDEX i is included
+    '''
+    mask = 0
+    for item in normalize_spec(input_vals):
+        mask |= TOKEN_MASKS[item]
+
+    return mask
+
+
+def mask_attrs(mask):
+    '''
+    The function returns the attributes of a bitmask in the order of ATTR_REMAP
+    @param mask: int
+    @return tuple: attribute names
+    '''
+    return tuple(attr for attr, i in ATTR_INDEX.items() if mask >> i & 1)
+
+
+def normalize_spec(*input_vals):
+    '''
+    The function validates the input and returns it in a form usable as a cache key
+    @param input_vals: str or [str], values valid for lock_and_hide, None is ignored
+    @return tuple: sorted unique tokens
+    '''
+    input_list = [item for item in get_flat_list(input_vals) if item is not None]
+    validate_input(input_list)
+
+    return tuple(sorted(set(input_list)))
+
+
+def compile_attr_spec(lock=["all"], not_lock=None):
+    '''
+    The function returns the attributes lock_and_hide locks and hides. 
+    The same specs are written again and again in a rig, 
+    so the results are cached by the normalized tokens
+    @param lock: [str], see lock_and_hide
+    @param not_lock: [str], see lock_and_hide
+    @return tuple: attribute names in the order of ATTR_REMAP
+    '''
+    return _compile_attr_spec(normalize_spec(lock), normalize_spec(not_lock))
+
+
+@lru_cache(maxsize=256)
+def _compile_attr_spec(lock_tokens, not_lock_tokens):
+    '''
+    The function returns the attributes of the normalized specs, see compile_attr_spec
+    '''
+    return mask_attrs(lock_mask(lock_tokens, not_lock_tokens))
+
+
+def lock_mask(lock=["all"], not_lock=None):
+    '''
+    The function returns the bitmask of the attributes lock_and_hide locks and hides
+    @param lock: [str], see lock_and_hide
+    @param not_lock: [str], see lock_and_hide
+    @return int
+    '''
+    return attr_mask(lock) & ~attr_mask(not_lock)
 
 
 def lock_and_hide(obj, lock=["all"], not_lock=None):
@@ -109,6 +170,7 @@ def lock_and_hide(obj, lock=["all"], not_lock=None):
     The function adds up all the attributes defined in the 'lock' parameter
     and from that it extracts all the attributes defined in the 'not_lock' parameter.
     This way it gets the list of the attributes which should be locked and hidden.
+    @param obj: SceneNode, PyNode or str
     @param lock: [str] takes values: all, a, translate, t, rotate, r, 
                                     scale, s, visibility, v,
                                     translateX, tx, translateY, ty, 
@@ -131,31 +193,41 @@ def lock_and_hide(obj, lock=["all"], not_lock=None):
     
     if not obj:
         raise ValueError("Object not defined")
-    if not pm.objExists(obj):
+    if not scene.exists(obj):
         raise ValueError(f"Object '{obj}' does not exist")
+    obj = scene.node(obj)
     
-    lock_input = get_flat_list(lock)
     try:
-        validate_input(lock_input)
+        attrs_to_lock = compile_attr_spec(lock, not_lock)
     except ValueError as e:
-        om.MGlobal.displayError(e)
+        scene.display_error(e)
         return None        
-    lock_attrs = remap_input(lock_input)
 
-    not_lock_input = get_flat_list(not_lock)
+    for a in attrs_to_lock:
+        obj.set_attr_state(a, locked=True, keyable=False, channel_box=False)
+
+
+def lock_and_hide_many(objs, lock=["all"], not_lock=None):
+    '''
+    The function locks and hides the same attributes of many objects, e.g. all the controls
+    of a rig. The attributes are resolved once and all the objects are changed in one batch
+    @param objs: [SceneNode, PyNode or str]
+    @param lock: [str], see lock_and_hide
+    @param not_lock: [str], see lock_and_hide
+    '''
+    if not objs:
+        raise ValueError("Objects not defined")
+    missing = [str(obj) for obj in objs if not scene.exists(obj)]
+    if missing:
+        raise ValueError(f"Objects do not exist: {', '.join(missing)}")
+
     try:
-        validate_input(not_lock_input)
+        attrs_to_lock = compile_attr_spec(lock, not_lock)
     except ValueError as e:
-        om.MGlobal.displayError(e)
-        return None        
-    not_lock_attrs = remap_input(not_lock_input)
+        scene.display_error(e)
+        return None
 
-    attrs_to_lock = list(set(lock_attrs)-set(not_lock_attrs))
-    attrs_to_lock.sort(key=sort_by_key_index)
-
-    for a in attrs_to_lock:
-        obj.attr(a).lock()
-        obj.attr(a).setKeyable(0)
-        obj.attr(a).showInChannelBox(0)
+    scene.set_attrs_state(objs, attrs_to_lock, 
+                          locked=True, keyable=False, channel_box=False)
 
 
@@ -0,0 +1,157 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import numpy as np
+from utils.orient_utils import as_vectors, normalize, TOLERANCE
+
+
+DISTRIBUTIONS = ("uniform", "ease_in", "ease_out", "ease_in_out")
+
+
+def arc_length_table(points):
+    '''
+    The function calculates the arc length from the first point to every point of a polyline
+    @param points: float[3] list or numpy.ndarray (N,3)
+    @return numpy.ndarray: shape (N,), starts at 0, ends at the length of the polyline
+    '''
+    points = as_vectors(points)
+    if len(points) < 2:
+        raise ValueError("At least 2 points are needed to measure a curve")
+
+    lengths = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    table = np.concatenate([[0.0], np.cumsum(lengths)])
+    if table[-1] < TOLERANCE:
+        raise ValueError("The curve has zero length")
+
+    return table
+
+
+def distribute(count, distribution="uniform"):
+    '''
+    The function returns parameters between 0 and 1 the joints are placed at
+    @param count: int, number of parameters
+    @param distribution: str, one of DISTRIBUTIONS,
+                         a function remapping uniform parameters (numpy.ndarray -> numpy.ndarray)
+                         or a list of increasing parameters between 0 and 1
+    @return numpy.ndarray: shape (count,)
+    '''
+    if count < 2:
+        raise ValueError("At least 2 parameters are needed")
+
+    params = np.linspace(0.0, 1.0, count)
+    if callable(distribution):
+        params = np.asarray(distribution(params), dtype=float)
+    elif isinstance(distribution, str):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"distribution has to be one of {DISTRIBUTIONS}, "
+                             f"got: {distribution}")
+        if distribution == "ease_in":
+            params = params**2
+        elif distribution == "ease_out":
+            params = 1.0 - (1.0 - params)**2
+        elif distribution == "ease_in_out":
+            params = params*params*(3.0 - 2.0*params)
+    else:
+        params = np.asarray(distribution, dtype=float)
+
+    if params.shape != (count,):
+        raise ValueError(f"The distribution has to give {count} parameters")
+    if np.any(params < 0.0) or np.any(params > 1.0) or np.any(np.diff(params) < 0.0):
+        raise ValueError("The parameters have to increase from 0 to 1")
+
+    return params
+
+
+def sample_at_lengths(points, lengths, table=None):
+    '''
+    The function finds the positions at the arc lengths along a polyline
+    @param points: float[3] list or numpy.ndarray (N,3)
+    @param lengths: numpy.ndarray (M,), arc lengths measured from the first point
+    @param table: numpy.ndarray (N,), result of arc_length_table if already calculated
+    @return numpy.ndarray: shape (M,3)
+    '''
+    points = as_vectors(points)
+    table = arc_length_table(points) if table is None else table
+    lengths = np.clip(np.asarray(lengths, dtype=float), 0.0, table[-1])
+
+    # index of the segment each length falls into, zero length segments are skipped
+    index = np.clip(np.searchsorted(table, lengths, side="right") - 1, 0, len(points) - 2)
+    seg_lengths = table[index+1] - table[index]
+    ratio = np.divide(lengths - table[index], seg_lengths,
+                      out=np.zeros_like(lengths), where=seg_lengths > TOLERANCE)
+
+    return points[index] + ratio[:, None]*(points[index+1] - points[index])
+
+
+def resample(points, count, distribution="uniform"):
+    '''
+    The function places points along a polyline by its arc length
+    @param points: float[3] list or numpy.ndarray (N,3)
+    @param count: int, number of new points
+    @param distribution: see distribute
+    @return numpy.ndarray: shape (count,3)
+    '''
+    table = arc_length_table(points)
+    return sample_at_lengths(points, distribute(count, distribution)*table[-1], table)
+
+
+def catmull_rom(points, samples=8):
+    '''
+    The function smooths a polyline with a Catmull-Rom spline going through all the points,
+    the ends are extended by mirroring the neighbouring points
+    @param points: float[3] list or numpy.ndarray (N,3)
+    @param samples: int, number of points per span
+    @return numpy.ndarray: shape ((N-1)*samples+1, 3)
+    '''
+    points = as_vectors(points)
+    if len(points) < 3:
+        return points
+    if samples < 1:
+        raise ValueError("samples has to be at least 1")
+
+    padded = np.concatenate([[2*points[0] - points[1]], points, [2*points[-1] - points[-2]]])
+    p0, p1, p2, p3 = (padded[i:len(padded)-3+i, None] for i in range(4))
+
+    t = np.linspace(0.0, 1.0, samples, endpoint=False)[None, :, None]
+    spans = 0.5*(2*p1 + (p2 - p0)*t + (2*p0 - 5*p1 + 4*p2 - p3)*t**2
+                 + (3*p1 - p0 - 3*p2 + p3)*t**3)
+
+    return np.concatenate([spans.reshape(-1, 3), points[-1:]])
+
+
+def parallel_transport(tangents, up_vec=None):
+    '''
+    The function carries an up vector along the tangents with the smallest rotation
+    between each pair of tangents, so the frames don't twist (rotation minimizing frames)
+    @param tangents: numpy.ndarray (N,3)
+    @param up_vec: float[3], the up vector of the first frame, it is made perpendicular 
+                   to the first tangent, if None the world axis most perpendicular 
+                   to the first tangent is used
+    @return numpy.ndarray: shape (N,3), normalized up vectors perpendicular to the tangents
+    '''
+    tangents = normalize(as_vectors(tangents))
+    if up_vec is None:
+        up_vec = np.identity(3)[np.argmin(np.abs(tangents[0]))]
+
+    up_vec = as_vectors(up_vec)[0]
+    up_vec = up_vec - (up_vec @ tangents[0])*tangents[0]
+    if np.linalg.norm(up_vec) < TOLERANCE:
+        raise ValueError("The up vector cannot be parallel to the curve")
+
+    ups = np.empty_like(tangents)
+    ups[0] = up_vec / np.linalg.norm(up_vec)
+    for i in range(1, len(tangents)):
+        prev, cur = tangents[i-1], tangents[i]
+        axis = np.cross(prev, cur)
+        sin = np.linalg.norm(axis)
+        cos = prev @ cur
+        up = ups[i-1]
+        if sin > TOLERANCE: # Rodrigues rotation taking prev to cur
+            axis /= sin
+            up = up*cos + np.cross(axis, up)*sin + axis*(axis @ up)*(1.0 - cos)
+        up = up - (up @ cur)*cur
+        ups[i] = up / np.linalg.norm(up)
+
+    return ups
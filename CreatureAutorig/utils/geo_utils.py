@@ -0,0 +1,129 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+from collections import namedtuple
+import numpy as np
+from utils.orient_utils import as_vectors
+
+
+TOLERANCE = 1e-10 # default distance below which points are treated as sitting on a line/plane
+
+PointsFit = namedtuple("PointsFit", ["centroid", "direction", "normal", "rank",
+                                     "line_deviations", "plane_deviations"])
+PointsFit.__doc__ = '''
+Result of fit_points
+centroid: numpy.ndarray (3,), the average position
+direction: numpy.ndarray (3,), direction of the best-fit line, None if all points overlap
+normal: numpy.ndarray (3,), normal of the best-fit plane, None if the points are collinear
+rank: int, 0 - all points overlap, 1 - collinear, 2 - coplanar, 3 - not coplanar
+line_deviations: numpy.ndarray (N,), distance of each point from the best-fit line
+plane_deviations: numpy.ndarray (N,), signed distance of each point from the best-fit plane
+'''
+
+
+def fit_points(points, tolerance=TOLERANCE):
+    '''
+    The function fits a line and a plane to the points with a single SVD
+    @param points: float[3] list or numpy.ndarray (N,3)
+    @param tolerance: float, distance from the line/plane below which a point is treated
+                      as sitting on it
+    @return PointsFit
+    '''
+    points = as_vectors(points)
+    if not len(points):
+        raise ValueError("No positions defined")
+
+    centroid = points.mean(axis=0)
+    centered = points - centroid
+    _, _, vt = np.linalg.svd(centered, full_matrices=False)
+    if len(vt) < 3: # fewer than 3 points, complete the basis
+        vt = np.linalg.svd(np.vstack([centered, np.zeros((3-len(vt), 3))]))[2]
+
+    along = centered @ vt[0]
+    line_deviations = np.linalg.norm(centered - along[:, None]*vt[0], axis=1)
+    plane_deviations = centered @ vt[2]
+
+    if np.all(np.linalg.norm(centered, axis=1) <= tolerance):
+        rank = 0
+    elif np.all(line_deviations <= tolerance):
+        rank = 1
+    elif np.all(np.abs(plane_deviations) <= tolerance):
+        rank = 2
+    else:
+        rank = 3
+
+    direction = __orient_direction(points, vt[0]) if rank > 0 else None
+    normal = __orient_normal(points, vt[2], tolerance) if rank > 1 else None
+    if normal is not None and normal @ vt[2] < 0:
+        plane_deviations = -plane_deviations
+
+    return PointsFit(centroid, direction, normal, rank, line_deviations, plane_deviations)
+
+
+def __orient_direction(points, direction):
+    '''
+    This method flips the line direction so it goes from the first point towards the last one
+    '''
+    if (points[-1] - points[0]) @ direction < 0:
+        return -direction
+
+    return direction
+
+
+def __orient_normal(points, normal, tolerance):
+    '''
+    This method flips the plane normal so it matches (p2-p0) ^ (p1-p0)
+    of the first three consecutive points which are not collinear
+    '''
+    crosses = np.cross(points[2:] - points[:-2], points[1:-1] - points[:-2])
+    valid = np.flatnonzero(np.linalg.norm(crosses, axis=1) > tolerance)
+    if len(valid) and crosses[valid[0]] @ normal < 0:
+        return -normal
+
+    return normal
+
+
+def project_to_plane(points, fit=None):
+    '''
+    The function projects the points onto their best-fit plane
+    @param points: float[3] list or numpy.ndarray (N,3)
+    @param fit: PointsFit, result of fit_points for the same points if already calculated
+    @return (numpy.ndarray, float): projected points (N,3) and the largest distance 
+            of a point from the plane
+    '''
+    points = as_vectors(points)
+    if fit is None:
+        fit = fit_points(points)
+    if fit.normal is None:
+        raise ValueError("The points are collinear, the plane cannot be defined")
+
+    projected = points - fit.plane_deviations[:, None]*fit.normal
+    max_deviation = float(np.abs(fit.plane_deviations).max())
+
+    return projected, max_deviation
+
+
+def check_coplanar(points, tolerance=TOLERANCE):
+    '''
+    The function checks if the points sit on a single plane
+    @param points: float[3] list or numpy.ndarray (N,3)
+    @param tolerance: float, maximum distance of a point from the best-fit plane
+    @return (bool, PointsFit)
+    '''
+    fit = fit_points(points, tolerance)
+
+    return fit.rank <= 2, fit
+
+
+def check_collinear(points, tolerance=TOLERANCE):
+    '''
+    The function checks if the points sit on a single line
+    @param points: float[3] list or numpy.ndarray (N,3)
+    @param tolerance: float, maximum distance of a point from the best-fit line
+    @return (bool, PointsFit)
+    '''
+    fit = fit_points(points, tolerance)
+
+    return fit.rank <= 1, fit
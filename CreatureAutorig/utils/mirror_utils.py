@@ -0,0 +1,111 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import numpy as np
+from utils import name_utils
+from utils import scene
+from utils.orient_utils import as_vectors, AXIS_INDEX
+
+
+MIRROR_MODES = ("behavior", "orientation")
+# behavior - all the axes of the mirrored object point the opposite way, 
+#            so the same rotation values give a mirrored pose
+# orientation - the mirrored object keeps the world orientation of the original
+
+
+def reflection(axis="x"):
+    '''
+    The function returns the matrix mirroring across the plane perpendicular to the axis,
+    e.g. "x" mirrors across the YZ plane, which swaps the L and R sides
+    @param axis: str, takes: "x", "y", "z"
+    @return numpy.ndarray: shape (3,3)
+    '''
+    if axis not in AXIS_INDEX:
+        raise ValueError(f"Mirror axis has to be one of {tuple(AXIS_INDEX)}, got: {axis}")
+
+    matrix = np.identity(3)
+    matrix[AXIS_INDEX[axis], AXIS_INDEX[axis]] = -1.0
+    return matrix
+
+
+def mirror_positions(points, axis="x"):
+    '''
+    The function mirrors positions
+    @param points: float[3] list or numpy.ndarray (N,3)
+    @param axis: str, normal of the mirror plane, takes: "x", "y", "z"
+    @return numpy.ndarray: shape (N,3)
+    '''
+    return as_vectors(points) @ reflection(axis)
+
+
+def mirror_frames(frames, axis="x", mode="behavior"):
+    '''
+    The function mirrors orientation matrices, the results stay right-handed
+    @param frames: numpy.ndarray (N,3,3) or (3,3), rows are the axes of the objects
+    @param axis: str, normal of the mirror plane, takes: "x", "y", "z"
+    @param mode: str, one of MIRROR_MODES
+    @return numpy.ndarray: shape (N,3,3)
+    '''
+    frames = np.asarray(frames, dtype=float).reshape(-1, 3, 3)
+    if mode not in MIRROR_MODES:
+        raise ValueError(f"Mirror mode has to be one of {MIRROR_MODES}, got: {mode}")
+
+    if mode == "orientation":
+        return frames.copy()
+
+    # the reflected axes make a left-handed frame, flipping all of them fixes that
+    return -(frames @ reflection(axis))
+
+
+def mirror_matrices(matrices, axis="x", mode="behavior"):
+    '''
+    The function mirrors world matrices, the scale of the axes is kept
+    @param matrices: numpy.ndarray (N,4,4) or (4,4)
+    @param axis: str, normal of the mirror plane, takes: "x", "y", "z"
+    @param mode: str, one of MIRROR_MODES
+    @return numpy.ndarray: shape (N,4,4)
+    '''
+    matrices = np.asarray(matrices, dtype=float).reshape(-1, 4, 4)
+
+    result = matrices.copy()
+    result[:, :3, :3] = mirror_frames(matrices[:, :3, :3], axis, mode)
+    result[:, 3, :3] = mirror_positions(matrices[:, 3, :3], axis)
+
+    return result
+
+
+def local_mirror(matrix, mirrored, axis="x"):
+    '''
+    The function returns the matrix which mirrors points defined in the local space
+    of the original object into the local space of the mirrored object 
+    (e.g. CVs of a control shape)
+    @param matrix: numpy.ndarray (4,4), world matrix of the original
+    @param mirrored: numpy.ndarray (4,4), world matrix of the mirrored object
+    @param axis: str, normal of the mirror plane, takes: "x", "y", "z"
+    @return numpy.ndarray: shape (3,3)
+    '''
+    matrix = np.asarray(matrix, dtype=float)
+    mirrored = np.asarray(mirrored, dtype=float)
+
+    return matrix[:3, :3] @ reflection(axis) @ np.linalg.inv(mirrored[:3, :3])
+
+
+def mirror_parent(node):
+    '''
+    The function returns the node the mirrored copy of the node should be parented under.
+    That is the opposite side counterpart of its parent if it exists, 
+    otherwise the same parent
+    @param node: SceneNode
+    @return SceneNode: None if the node is under the world
+    '''
+    parent = node.parent()
+    if parent is None:
+        return None
+
+    name = name_utils.mirror_name(parent.name())
+    if name != parent.name() and scene.exists(name):
+        return scene.node(name)
+
+    return parent
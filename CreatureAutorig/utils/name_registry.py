@@ -0,0 +1,173 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import autorig_settings as sett
+
+
+class NameRegistry(object):
+    '''
+    The class keeps track of the node names used during a build session,
+    so unique names can be generated without querying the scene for every candidate.
+    It is seeded once from a snapshot of existing names (e.g. a single 'ls' call)
+    and every name it hands out is reserved straight away.
+    It does not depend on Maya, so the naming logic can be tested outside of it.
+    '''
+    def __init__(self, names=None, padding=None):
+        '''
+        This is the constructor
+        @param names: [str], names which already exist (e.g. all the nodes in the scene)
+        @param padding: int, zero padding used for numbers,
+                        defaults to ZERO_PADDING defined in autorig_settings
+        '''
+        self.padding = sett.ZERO_PADDING if padding is None else padding
+        self._names = set() # every reserved name
+        self._used = {} # prefix -> set of numbers in use
+        self._counters = {} # prefix -> lowest number which may still be free
+
+        if names:
+            self.seed(names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return self.exists(name)
+
+    @staticmethod
+    def split_name(name):
+        '''
+        This method splits the name into a prefix and a trailing number
+        @param name: str
+        @return (str, int): prefix and number, number is None if the name doesn't end with one
+        '''
+        res = name.rsplit("_", 1)
+        if res[-1].isdigit():
+            prefix = res[0] if len(res) > 1 else ""
+            return prefix, int(res[-1])
+
+        return name, None
+
+    def join_name(self, prefix, num):
+        '''
+        This method builds a name out of a prefix and a number using zero padding
+        @param prefix: str
+        @param num: int
+        @return str
+        '''
+        pad_num = str(num).zfill(self.padding)
+        if not prefix:
+            return pad_num
+
+        return prefix + "_" + pad_num
+
+    def seed(self, names):
+        '''
+        This method registers names that already exist
+        @param names: [str], DAG paths are shortened to their leaf names
+        '''
+        for name in names:
+            self.reserve(name.split("|")[-1])
+
+    def exists(self, name):
+        '''
+        This method checks if the name is already taken
+        @param name: str
+        @return bool
+        '''
+        if name in self._names:
+            return True
+
+        prefix, num = self.split_name(name)
+        if num is None:
+            return False
+
+        return num in self._used.get(prefix, ())
+
+    def reserve(self, name):
+        '''
+        This method marks the name as taken
+        @param name: str
+        '''
+        self._names.add(name)
+
+        prefix, num = self.split_name(name)
+        if num is None:
+            return
+
+        used = self._used.setdefault(prefix, set())
+        used.add(num)
+        counter = self._counters.get(prefix, 1)
+        if num == counter:
+            while counter in used:
+                counter += 1
+            self._counters[prefix] = counter
+
+    def release(self, name):
+        '''
+        This method frees the name so it can be generated again (e.g. after deleting a node)
+        @param name: str
+        '''
+        self._names.discard(name)
+
+        prefix, num = self.split_name(name)
+        if num is None or prefix not in self._used:
+            return
+
+        self._used[prefix].discard(num)
+        if num < self._counters.get(prefix, 1):
+            self._counters[prefix] = num
+
+    def __first_free(self, prefix, start, count=1):
+        '''
+        This method finds the lowest number, not lower than start, followed by
+        count-1 numbers which are all free
+        '''
+        used = self._used.get(prefix, ())
+        counter = self._counters.get(prefix, 1)
+
+        num = max(start, counter)
+        while True:
+            taken = [n for n in range(num, num+count) if n in used]
+            if not taken:
+                return num
+            num = taken[-1] + 1
+
+    def unique_name(self, name):
+        '''
+        This method returns the given name if it is free,
+        otherwise it increments the trailing number (or adds one) until the name is unique.
+        The returned name is reserved.
+        @param name: str
+        @return str
+        '''
+        if not self.exists(name):
+            self.reserve(name)
+            return name
+
+        prefix, num = self.split_name(name)
+        if num is None:
+            num = 1
+
+        name = self.join_name(prefix, self.__first_free(prefix, num))
+        self.reserve(name)
+
+        return name
+
+    def reserve_block(self, prefix, count, start=1):
+        '''
+        This method reserves a contiguous block of numbered names
+        @param prefix: str, the name without the number
+        @param count: int, number of names in the block
+        @param start: int, the lowest number the block can start from
+        @return int: the first number of the block
+        '''
+        if count < 1:
+            raise ValueError("count has to be greater than 0")
+
+        first = self.__first_free(prefix, start, count)
+        for num in range(first, first+count):
+            self.reserve(self.join_name(prefix, num))
+
+        return first
@@ -5,9 +5,50 @@
 @author: mstolarz
 '''
 
-import maya.OpenMaya as om
-from maya import cmds
 import autorig_settings as sett
+from utils.name_registry import NameRegistry
+from utils import scene
+
+
+_registry = None # NameRegistry of the active build session
+
+
+def get_registry():
+    '''
+    The function returns the name registry of the active build session
+    @return NameRegistry: None if there is no active registry
+    '''
+    return _registry
+
+
+def set_registry(registry):
+    '''
+    The function sets the name registry used to generate unique names.
+    While there is no registry set, the names are checked directly in the scene.
+    @param registry: NameRegistry or None
+    @return NameRegistry: the previously active registry
+    '''
+    global _registry
+    previous = _registry
+    _registry = registry
+    return previous
+
+
+def registry_from_scene(patterns=None):
+    '''
+    The function creates a name registry seeded with the names of the nodes
+    in the scene using a single 'ls' query per pattern
+    @param patterns: [str], wildcard patterns of the names which can clash with 
+                     the generated ones, if None all the nodes in the scene are read
+    @return NameRegistry
+    '''
+    if patterns is None:
+        return NameRegistry(scene.list_names())
+
+    registry = NameRegistry()
+    for pattern in sorted(set(patterns)):
+        registry.seed(scene.list_names(pattern))
+    return registry
 
 def add_padding(start_num=1, end_num=1, padding=None, step=1, iterations=None) -> [str]:
     '''
@@ -56,6 +97,57 @@ def build_unique_name(base_name, side, suffix, front_or_hind=None,
     @return str: the generated name
     '''
     
+    pad_num = None
+    if num:
+        pad_num = str(num).zfill(sett.ZERO_PADDING)
+           
+    name = __join_name(base_name, side, suffix, front_or_hind, ik_or_fk, suffix1, pad_num)
+    
+    if _registry is not None:
+        return _registry.unique_name(name)
+
+    name = __unique_name(name)
+    return name
+
+
+def build_unique_names(base_name, side, suffix, count, front_or_hind=None, 
+                       ik_or_fk=None, suffix1=None, num=None):
+    '''
+    The function generates names for a whole set of nodes (e.g. joints of a chain) at once.
+    It reserves a contiguous block of numbered names, so every name in the list
+    shares the same prefix and the numbers follow one another
+    @param base_name: str, this is the base_name of the name, body part name
+    @param side: str, this is the side of the name (available options defined in autorig_settings)
+    @param suffix: str, main suffix (available options defined in autorig_settings)
+    @param count: int, number of names to generate
+    @param front_or_hind: str, front or hind (available options defined in autorig_settings)
+    @param ik_or_fk: str, ik or fk (available options defined in autorig_settings)
+    @param suffix1: str, additional suffix (available options defined in autorig_settings)
+    @param num: int, the lowest number the block can start from, defaults to 1
+    @return [str]: the generated names
+    '''
+    if count < 1:
+        raise ValueError("count has to be greater than 0")
+
+    prefix = __join_name(base_name, side, suffix, front_or_hind, ik_or_fk, suffix1)
+
+    registry = _registry
+    if registry is None:
+        # a single query for the names sharing the prefix instead of one per name
+        registry = NameRegistry(scene.list_names(prefix + "_*"))
+
+    first = registry.reserve_block(prefix, count, start=num or 1)
+
+    return [prefix + "_" + pad_num for pad_num in add_padding(first, iterations=count)]
+
+
+def __join_name(base_name, side, suffix, front_or_hind=None, 
+                ik_or_fk=None, suffix1=None, pad_num=None):
+    '''
+    This method validates the name tokens and joins them in the order 
+    defined by the naming convention
+    '''
+    
     if not side in sett.sides:
         raise ValueError("Side is not valid")
   
@@ -75,40 +167,64 @@ def build_unique_name(base_name, side, suffix, front_or_hind=None,
         if not suffix1 in sett.suffixes:
             raise ValueError(f"{suffix1} is not a valid suffix")
     
-    pad_num = None
-    if num:
-        pad_num = str(num).zfill(sett.ZERO_PADDING)
-           
-    name = "_".join(filter(None, [base_name, side, front_or_hind, 
+    return "_".join(filter(None, [base_name, side, front_or_hind, 
                                   ik_or_fk, suffix1, suffix, pad_num]))
-    
-    name = __unique_name(name)
-    return name
                      
     
 
 def __unique_name(name):
     '''
-    This method ensures the name is unique 
+    This method ensures the name is unique by checking it in the scene.
+    It is used when there is no name registry set.
     '''
     
     security = 2000
     
     i = 1
-    while cmds.objExists(name)==1:
-        if i < security:            
-            res = name.split("_")
-            if res[-1].isnumeric():
-                new_num = str(int(res[-1])+1).zfill(sett.ZERO_PADDING)
-                name = "_".join(res[:-1]+[new_num])           
-            else:
-                num = str(i).zfill(sett.ZERO_PADDING)
-                name = name +"_" + num
-            i+=1
+    while scene.exists(name):
+        if i >= security:
+            raise ValueError(f"Failed to generate a unique name for '{name}' "
+                             f"in {security} attempts")
+        res = name.split("_")
+        if res[-1].isnumeric():
+            new_num = str(int(res[-1])+1).zfill(sett.ZERO_PADDING)
+            name = "_".join(res[:-1]+[new_num])           
+        else:
+            num = str(i).zfill(sett.ZERO_PADDING)
+            name = name +"_" + num
+        i+=1
         
     return name
 
 
+def mirror_side(side):
+    '''
+    The function returns the opposite side
+    @param side: str, side defined in autorig_settings
+    @return str
+    '''
+    if side not in sett.mirror_sides:
+        raise ValueError(f"Side '{side}' is not valid")
+
+    return sett.mirror_sides[side]
+
+
+def mirror_name(name):
+    '''
+    The function swaps the side token of a name following the naming convention,
+    e.g. arm_L_ctrl_01 -> arm_R_ctrl_01. Names without a side token are returned unchanged
+    @param name: str
+    @return str
+    '''
+    tokens = name.split("_")
+    for i, token in enumerate(tokens[1:], 1): # the first token is the base name
+        if token in sett.mirror_sides:
+            tokens[i] = sett.mirror_sides[token]
+            break
+
+    return "_".join(tokens)
+
+
 def check_name(name):
     '''
     TODO: not completed
@@ -118,11 +234,11 @@ def check_name(name):
         res = name.split("_")
         if res[-1].isnumeric():
             if len(res[-1]) != sett.ZERO_PADDING:
-                om.MGlobal.displayError("Name invalid. Wrong zero padding")
+                scene.display_error("Name invalid. Wrong zero padding")
                 return False
         else:
             if not res[-1] in sett.suffixes:
-                om.MGlobal.displayError("Name invalid. Wrong suffix")
+                scene.display_error("Name invalid. Wrong suffix")
                 return False
             
 
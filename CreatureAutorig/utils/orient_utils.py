@@ -0,0 +1,294 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import numpy as np
+from utils import quat_utils
+
+
+VALID_AXES = ["+x", "-x", "+y", "-y", "+z", "-z"]
+AXIS_INDEX = {"x": 0, "y": 1, "z": 2}
+TOLERANCE = 1e-10 # vectors shorter than that are treated as zero length
+ROTATE_ORDERS = ("xyz", "yzx", "zxy", "xzy", "yxz", "zyx") # in the order of the rotateOrder enum
+
+
+def validate_axes(aim_axis, twist_axis):
+    '''
+    The function checks if aim and twist axes are valid and don't share the same axis
+    @param aim_axis: str, takes values: "+x", "-x", "+y", "-y", "+z", "-z"
+    @param twist_axis: str, takes values: "+x", "-x", "+y", "-y", "+z", "-z"
+    '''
+    if aim_axis not in VALID_AXES or twist_axis not in VALID_AXES:
+        raise ValueError("aim_axis and twist_axis can only take values: "
+                         "'+x', '-x', '+y', '-y', '+z', '-z'")
+
+    if aim_axis[1] == twist_axis[1]:
+        raise ValueError("aim_axis and twist_axis cannot share same axis")
+
+    return True
+
+
+def as_vectors(vecs):
+    '''
+    The function converts a vector or a list of vectors (tuples, lists, MVectors)
+    into a float array of shape (N,3)
+    @param vecs: float[3] or float[3] list
+    @return numpy.ndarray
+    '''
+    if isinstance(vecs, np.ndarray):
+        return vecs.astype(float).reshape(-1, 3)
+
+    if len(vecs) == 3 and np.isscalar(vecs[0]): # a single vector
+        vecs = [vecs]
+
+    return np.array([[v[0], v[1], v[2]] for v in vecs], dtype=float)
+
+
+def normalize(vecs):
+    '''
+    The function normalizes an array of vectors of shape (N,3)
+    @param vecs: numpy.ndarray
+    @return numpy.ndarray
+    '''
+    lengths = np.linalg.norm(vecs, axis=-1, keepdims=True)
+    if np.any(lengths < TOLERANCE):
+        raise ValueError("Cannot normalize a vector of zero length")
+
+    return vecs / lengths
+
+
+def segment_vectors(positions):
+    '''
+    The function returns normalized vectors between consecutive positions
+    @param positions: float[3] list or numpy.ndarray of shape (N,3)
+    @return numpy.ndarray: shape (N-1,3)
+    '''
+    positions = as_vectors(positions)
+    if len(positions) < 2:
+        raise ValueError("At least 2 positions are needed to get a direction")
+
+    try:
+        return normalize(np.diff(positions, axis=0))
+    except ValueError:
+        raise ValueError("Some consecutive positions are overlapping") from None
+
+
+def orient_frames(aim_vecs, twist_vecs, aim_axis="+x", twist_axis="+y"):
+    '''
+    The function builds orientation matrices from aim and twist directions.
+    The rows of each matrix are the X, Y and Z axes of the oriented object in world space.
+    Twist vectors are made perpendicular to the aim vectors, the third axis
+    is calculated so the frame is always right-handed.
+    @param aim_vecs: numpy.ndarray (N,3), directions the aim_axis should point at
+    @param twist_vecs: numpy.ndarray (N,3) or (3,), directions the twist_axis should point at
+    @param aim_axis: str, takes values: "+x", "-x", "+y", "-y", "+z", "-z"
+    @param twist_axis: str, takes values: "+x", "-x", "+y", "-y", "+z", "-z"
+    @return numpy.ndarray: shape (N,3,3)
+    '''
+    validate_axes(aim_axis, twist_axis)
+
+    aim_vecs = normalize(np.asarray(aim_vecs, dtype=float).reshape(-1, 3))
+    twist_vecs = np.broadcast_to(np.asarray(twist_vecs, dtype=float).reshape(-1, 3),
+                                 aim_vecs.shape)
+
+    # remove the part of the twist vector which goes along the aim vector
+    dots = np.einsum("ij,ij->i", twist_vecs, aim_vecs)[:, None]
+    try:
+        twist_vecs = normalize(twist_vecs - dots*aim_vecs)
+    except ValueError:
+        raise ValueError("Aim vector and twist vector cannot be parallel") from None
+
+    if aim_axis[0] == "-":
+        aim_vecs = -aim_vecs
+    if twist_axis[0] == "-":
+        twist_vecs = -twist_vecs
+
+    aim_index = AXIS_INDEX[aim_axis[1]]
+    twist_index = AXIS_INDEX[twist_axis[1]]
+    third_index = 3 - aim_index - twist_index
+
+    frames = np.empty((len(aim_vecs), 3, 3))
+    frames[:, aim_index] = aim_vecs
+    frames[:, twist_index] = twist_vecs
+    # X = Y ^ Z, Y = Z ^ X, Z = X ^ Y
+    frames[:, third_index] = np.cross(frames[:, (third_index+1) % 3],
+                                      frames[:, (third_index+2) % 3])
+
+    return frames
+
+
+def matrix_to_euler(matrices, rotate_order="xyz"):
+    '''
+    The function converts rotation matrices into euler angles in degrees
+    @param matrices: numpy.ndarray (N,3,3) or (3,3), rows are the rotated axes
+    @param rotate_order: str or int, one of ROTATE_ORDERS or the value of rotateOrder
+    @return numpy.ndarray: shape (N,3), angles around x, y and z
+    '''
+    axes, sign = __order_axes(rotate_order)
+    m = np.asarray(matrices, dtype=float).reshape(-1, 3, 3)[:, axes][:, :, axes]
+
+    sin_y = np.clip(-m[:, 0, 2], -1.0, 1.0)
+    cos_y = np.hypot(m[:, 0, 0], m[:, 0, 1])
+    gimbal = cos_y < 1e-9
+
+    rot_x = np.where(gimbal, np.arctan2(-m[:, 2, 1], m[:, 1, 1]),
+                     np.arctan2(m[:, 1, 2], m[:, 2, 2]))
+    rot_y = np.arctan2(sin_y, cos_y)
+    rot_z = np.where(gimbal, 0.0, np.arctan2(m[:, 0, 1], m[:, 0, 0]))
+
+    eulers = np.empty((len(m), 3))
+    eulers[:, axes] = np.degrees(np.stack([rot_x, rot_y, rot_z], axis=-1)) * sign
+    return eulers
+
+
+def euler_to_matrix(eulers, rotate_order="xyz"):
+    '''
+    The function converts euler angles in degrees into rotation matrices
+    @param eulers: numpy.ndarray (N,3) or float[3], angles around x, y and z
+    @param rotate_order: str or int, one of ROTATE_ORDERS or the value of rotateOrder
+    @return numpy.ndarray: shape (N,3,3), rows are the rotated axes
+    '''
+    axes, sign = __order_axes(rotate_order)
+    rad = np.radians(np.asarray(eulers, dtype=float).reshape(-1, 3))[:, axes] * sign
+    cx, cy, cz = np.cos(rad).T
+    sx, sy, sz = np.sin(rad).T
+
+    m = np.empty((len(rad), 3, 3))
+    m[:, 0] = np.stack([cy*cz, cy*sz, -sy], axis=-1)
+    m[:, 1] = np.stack([sx*sy*cz - cx*sz, sx*sy*sz + cx*cz, sx*cy], axis=-1)
+    m[:, 2] = np.stack([cx*sy*cz + sx*sz, cx*sy*sz - sx*cz, cx*cy], axis=-1)
+
+    inverse = np.argsort(axes)
+    return m[:, inverse][:, :, inverse]
+
+
+def __order_axes(rotate_order):
+    '''
+    This function returns the axes in the order they are rotated around and the sign 
+    of the angles. Both conversions permute the axes so the order becomes xyz,
+    odd permutations mirror the space, so the angles flip
+    '''
+    if not isinstance(rotate_order, str) and rotate_order in range(len(ROTATE_ORDERS)):
+        rotate_order = ROTATE_ORDERS[rotate_order]
+    if rotate_order not in ROTATE_ORDERS:
+        raise ValueError(f"Rotate order has to be one of {ROTATE_ORDERS}, got: {rotate_order}")
+
+    sign = 1.0 if rotate_order in ROTATE_ORDERS[:3] else -1.0
+    return [AXIS_INDEX[axis] for axis in rotate_order], sign
+
+
+def euler_to_quat(eulers):
+    '''
+    The function converts euler angles in degrees (xyz rotate order) into quaternions
+    @param eulers: numpy.ndarray (N,3) or float[3]
+    @return numpy.ndarray: shape (N,4), (x, y, z, w)
+    '''
+    return quat_utils.from_matrix(euler_to_matrix(eulers))
+
+
+def quat_to_euler(quats):
+    '''
+    The function converts quaternions into euler angles in degrees using xyz rotate order
+    @param quats: numpy.ndarray (N,4) or float[4], (x, y, z, w)
+    @return numpy.ndarray: shape (N,3)
+    '''
+    return matrix_to_euler(quat_utils.to_matrix(quats))
+
+
+def linear_chain_frames(positions, aim_axis="+x", twist_axis="+y", twist_vec=None, count=None):
+    '''
+    The function calculates world space joint orientations for collinear positions.
+    All the joints share the orientation defined by the first segment of the chain
+    @param positions: float[3] list or numpy.ndarray (N,3)
+    @param aim_axis: str, axis going down the chain
+    @param twist_axis: str, secondary axis controlling the twist
+    @param twist_vec: float[3], a direction at which twist_axis should aim
+    @param count: int, number of joints, defaults to the number of positions
+    @return numpy.ndarray: shape (count,3,3), rows are the joint axes
+    '''
+    if twist_vec is None:
+        raise ValueError("twist_vec not defined")
+
+    positions = as_vectors(positions)
+    count = len(positions) if count is None else count
+
+    aim_vec = segment_vectors(positions[:2])
+    frame = orient_frames(aim_vec, as_vectors(twist_vec), aim_axis, twist_axis)
+
+    return np.repeat(frame, count, axis=0)
+
+
+def planar_chain_frames(positions, aim_axis="+x", twist_axis="+y", normal=None, count=None):
+    '''
+    The function calculates world space joint orientations for coplanar positions.
+    Every joint aims at the next position, joints past the last segment
+    keep the orientation of the previous joint
+    @param positions: float[3] list or numpy.ndarray (N,3)
+    @param aim_axis: str, axis going down the chain
+    @param twist_axis: str, secondary axis, it is aligned with the plane normal
+    @param normal: float[3], normal of the plane the positions sit on
+    @param count: int, number of joints, defaults to the number of positions
+    @return numpy.ndarray: shape (count,3,3), rows are the joint axes
+    '''
+    if normal is None:
+        raise ValueError("normal not defined")
+
+    positions = as_vectors(positions)
+    count = len(positions) if count is None else count
+
+    aim_vecs = segment_vectors(positions)[:count]
+    frames = orient_frames(aim_vecs, as_vectors(normal), aim_axis, twist_axis)
+
+    if count > len(frames):
+        frames = np.concatenate([frames, np.repeat(frames[-1:], count-len(frames), axis=0)])
+
+    return frames
+
+
+def linear_chain_orients(positions, aim_axis="+x", twist_axis="+y", twist_vec=None, count=None):
+    '''
+    The function returns linear_chain_frames as euler angles
+    @return numpy.ndarray: shape (count,3), jointOrient values in degrees
+    '''
+    return matrix_to_euler(linear_chain_frames(positions, aim_axis, twist_axis, twist_vec, count))
+
+
+def planar_chain_orients(positions, aim_axis="+x", twist_axis="+y", normal=None, count=None):
+    '''
+    The function returns planar_chain_frames as euler angles
+    @return numpy.ndarray: shape (count,3), jointOrient values in degrees
+    '''
+    return matrix_to_euler(planar_chain_frames(positions, aim_axis, twist_axis, normal, count))
+
+
+def chain_local_transforms(positions, quats, roots=None):
+    '''
+    The function converts world space positions and orientations of chains
+    into the values the joints need when every joint is parented under the previous one.
+    The relative rotations are calculated with quaternions and turned into euler angles
+    only once at the end. The first joint of every chain keeps its world values
+    @param positions: float[3] list or numpy.ndarray (N,3), world positions
+    @param quats: numpy.ndarray (N,4), world orientations as quaternions
+    @param roots: int list, indices of the joints which start a chain, 
+                  several chains can be solved at once, defaults to [0]
+    @return (numpy.ndarray, numpy.ndarray): shape (N,3) translates and (N,3) jointOrients
+    '''
+    positions = as_vectors(positions)
+    quats = quat_utils.normalize(quats)
+    if len(positions) != len(quats):
+        raise ValueError("The number of positions and orientations doesn't match")
+
+    children = np.ones(len(positions), dtype=bool)
+    children[[0] if roots is None else list(roots)] = False
+    children = np.flatnonzero(children)
+    parent_inv = quat_utils.conjugate(quats[children-1])
+
+    translates = positions.copy()
+    local_quats = quats.copy()
+    if len(children):
+        translates[children] = quat_utils.rotate(positions[children] - positions[children-1],
+                                                 parent_inv)
+        local_quats[children] = quat_utils.multiply(quats[children], parent_inv)
+
+    return translates, quat_to_euler(local_quats)
@@ -0,0 +1,156 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import numpy as np
+
+
+# Quaternions are stored as (x, y, z, w) like MQuaternion and they follow Maya's
+# row vector convention: to_matrix(multiply(a, b)) == to_matrix(a) @ to_matrix(b),
+# which means rotating by a first and by b after that
+
+IDENTITY = np.array([0.0, 0.0, 0.0, 1.0])
+TOLERANCE = 1e-10 # quaternions shorter than that can't be normalized
+
+
+def as_quats(quats):
+    '''
+    The function converts a quaternion or a list of quaternions into a float array of shape (N,4)
+    @param quats: float[4] or float[4] list, (x, y, z, w)
+    @return numpy.ndarray
+    '''
+    return np.asarray(quats, dtype=float).reshape(-1, 4)
+
+
+def normalize(quats):
+    '''
+    The function normalizes quaternions and flips them so w is not negative
+    @param quats: float[4] list or numpy.ndarray (N,4)
+    @return numpy.ndarray: shape (N,4)
+    '''
+    quats = as_quats(quats)
+    lengths = np.linalg.norm(quats, axis=1, keepdims=True)
+    if np.any(lengths < TOLERANCE):
+        raise ValueError("Cannot normalize a quaternion of zero length")
+
+    return quats / lengths * np.where(quats[:, 3:] < 0, -1.0, 1.0)
+
+
+def conjugate(quats):
+    '''
+    The function returns the inverse rotations of unit quaternions
+    @param quats: float[4] list or numpy.ndarray (N,4)
+    @return numpy.ndarray: shape (N,4)
+    '''
+    return as_quats(quats) * (-1.0, -1.0, -1.0, 1.0)
+
+
+def multiply(first, second):
+    '''
+    The function combines rotations, the first one is applied first
+    @param first: float[4] list or numpy.ndarray (N,4) or (4,)
+    @param second: float[4] list or numpy.ndarray (N,4) or (4,)
+    @return numpy.ndarray: shape (N,4)
+    '''
+    ax, ay, az, aw = np.moveaxis(as_quats(first), -1, 0)
+    bx, by, bz, bw = np.moveaxis(as_quats(second), -1, 0)
+
+    # Hamilton product second * first
+    return np.stack([bw*ax + bx*aw + by*az - bz*ay,
+                     bw*ay - bx*az + by*aw + bz*ax,
+                     bw*az + bx*ay - by*ax + bz*aw,
+                     bw*aw - bx*ax - by*ay - bz*az], axis=-1)
+
+
+def rotate(vecs, quats):
+    '''
+    The function rotates vectors by quaternions
+    @param vecs: numpy.ndarray (N,3) or (3,)
+    @param quats: numpy.ndarray (N,4) or (4,)
+    @return numpy.ndarray: shape (N,3)
+    '''
+    vecs = np.asarray(vecs, dtype=float).reshape(-1, 3)
+    matrices = to_matrix(quats)
+    count = max(len(vecs), len(matrices))
+
+    return np.einsum("ni,nij->nj", np.broadcast_to(vecs, (count, 3)),
+                     np.broadcast_to(matrices, (count, 3, 3)))
+
+
+def from_axis_angle(axes, angles):
+    '''
+    The function creates quaternions rotating around the axes
+    @param axes: numpy.ndarray (N,3) or (3,), rotation axes
+    @param angles: float or numpy.ndarray (N,), angles in degrees
+    @return numpy.ndarray: shape (N,4)
+    '''
+    axes = np.asarray(axes, dtype=float).reshape(-1, 3)
+    lengths = np.linalg.norm(axes, axis=1, keepdims=True)
+    if np.any(lengths < TOLERANCE):
+        raise ValueError("Rotation axis cannot be of zero length")
+
+    half = np.radians(np.asarray(angles, dtype=float)).reshape(-1, 1) / 2.0
+    vecs = axes / lengths * np.sin(half)
+    return np.concatenate([vecs, np.broadcast_to(np.cos(half), (len(vecs), 1))], axis=1)
+
+
+def to_matrix(quats):
+    '''
+    The function converts quaternions into rotation matrices
+    @param quats: float[4] list or numpy.ndarray (N,4)
+    @return numpy.ndarray: shape (N,3,3), rows are the rotated axes
+    '''
+    x, y, z, w = normalize(quats).T
+
+    m = np.empty((len(x), 3, 3))
+    m[:, 0] = np.stack([1 - 2*(y*y + z*z), 2*(x*y + z*w), 2*(x*z - y*w)], axis=-1)
+    m[:, 1] = np.stack([2*(x*y - z*w), 1 - 2*(x*x + z*z), 2*(y*z + x*w)], axis=-1)
+    m[:, 2] = np.stack([2*(x*z + y*w), 2*(y*z - x*w), 1 - 2*(x*x + y*y)], axis=-1)
+
+    return m
+
+
+def from_matrix(matrices):
+    '''
+    The function converts rotation matrices into quaternions.
+    For every matrix the formula with the largest denominator is used,
+    so the result is stable for 180 degree rotations too
+    @param matrices: numpy.ndarray (N,3,3) or (3,3), rows are the rotated axes
+    @return numpy.ndarray: shape (N,4)
+    '''
+    m = np.asarray(matrices, dtype=float).reshape(-1, 3, 3)
+    m00, m01, m02 = m[:, 0].T
+    m10, m11, m12 = m[:, 1].T
+    m20, m21, m22 = m[:, 2].T
+
+    # 4 * the square of each component, the largest one is divided by
+    diagonals = np.stack([1 + m00 - m11 - m22, 1 - m00 + m11 - m22,
+                          1 - m00 - m11 + m22, 1 + m00 + m11 + m22], axis=-1)
+    case = np.argmax(diagonals, axis=1)
+    scale = 2.0 * np.sqrt(np.maximum(diagonals[np.arange(len(m)), case], TOLERANCE))
+
+    # columns: x, y, z, w for the cases where x, y, z or w is the largest component
+    sums_and_diffs = {
+        0: [scale/4, (m10 + m01)/scale, (m20 + m02)/scale, (m12 - m21)/scale],
+        1: [(m10 + m01)/scale, scale/4, (m21 + m12)/scale, (m20 - m02)/scale],
+        2: [(m20 + m02)/scale, (m21 + m12)/scale, scale/4, (m01 - m10)/scale],
+        3: [(m12 - m21)/scale, (m20 - m02)/scale, (m01 - m10)/scale, scale/4]}
+
+    quats = np.empty((len(m), 4))
+    for index, values in sums_and_diffs.items():
+        mask = case == index
+        quats[mask] = np.stack(values, axis=-1)[mask]
+
+    return normalize(quats)
+
+
+def angle_between(first, second):
+    '''
+    The function returns the angles between rotations
+    @param first: float[4] list or numpy.ndarray (N,4)
+    @param second: float[4] list or numpy.ndarray (N,4)
+    @return numpy.ndarray: shape (N,), angles in degrees
+    '''
+    dots = np.abs(np.sum(normalize(first) * normalize(second), axis=1))
+    return np.degrees(2.0 * np.arccos(np.clip(dots, 0.0, 1.0)))
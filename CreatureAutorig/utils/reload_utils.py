@@ -4,9 +4,18 @@ Created on 24. 12. 2023
 @author: mstolarz
 '''
 import importlib
+from utils import scene
+from utils.scene import scene_node, adapter, maya_backend, fake_backend
 from utils import xform_utils
 from utils import plug_utils
+from utils import name_registry
 from utils import name_utils
+from utils import quat_utils
+from utils import orient_utils
+from utils import geo_utils
+from utils import curve_utils
+from utils import mirror_utils
+from utils import spatial_utils
 from utils import meta_utils
 from utils import hierarchy_utils
 from utils import attr_utils
@@ -14,7 +23,19 @@ from utils.test_utils import test_attr_utils
 
 
 def reload_it():
+    importlib.reload(scene_node)
+    importlib.reload(adapter)
+    importlib.reload(maya_backend)
+    importlib.reload(fake_backend)
+    importlib.reload(scene)
+    importlib.reload(name_registry)
     importlib.reload(name_utils)
+    importlib.reload(quat_utils)
+    importlib.reload(orient_utils)
+    importlib.reload(geo_utils)
+    importlib.reload(curve_utils)
+    importlib.reload(mirror_utils)
+    importlib.reload(spatial_utils)
     importlib.reload(xform_utils)
     importlib.reload(hierarchy_utils)
     importlib.reload(plug_utils)
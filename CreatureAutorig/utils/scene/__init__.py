@@ -0,0 +1,11 @@
+'''
+Thin layer between the autorig and the scene. The functions are sent to the active backend,
+which is Maya by default and a FakeBackend in tests.
+'''
+from .scene_node import SceneNode
+from .adapter import (get_backend, set_backend, node, nodes, exists, list_names, selected,
+                      create_node, create_nodes, create_joints, create_chain, create_curve,
+                      create_curves, curve_data, delete,
+                      display_error, display_warning, display_info, undo_chunk,
+                      set_attrs, set_attrs_state, set_matrices,
+                      to_pymel)
@@ -0,0 +1,293 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+from contextlib import contextmanager
+from numbers import Integral
+import numpy as np
+
+
+_backend = None # the active backend, the Maya backend is created on first use
+
+
+def get_backend():
+    '''
+    The function returns the active scene backend
+    @return MayaBackend or FakeBackend
+    '''
+    global _backend
+    if _backend is None:
+        from utils.scene.maya_backend import MayaBackend
+        _backend = MayaBackend()
+
+    return _backend
+
+
+def set_backend(backend):
+    '''
+    The function sets the backend all the scene functions are sent to
+    (e.g. a FakeBackend in tests)
+    @param backend: MayaBackend, FakeBackend or None to go back to Maya
+    @return: the previously active backend
+    '''
+    global _backend
+    previous = _backend
+    _backend = backend
+    return previous
+
+
+def node(obj):
+    '''
+    The function returns a handle for an existing node
+    @param obj: str, SceneNode or PyNode
+    @return SceneNode
+    '''
+    return get_backend().node(obj)
+
+
+def nodes(objs):
+    '''
+    The function returns handles for a list of existing nodes
+    @param objs: [str, SceneNode or PyNode]
+    @return [SceneNode]
+    '''
+    backend = get_backend()
+    return [backend.node(obj) for obj in objs]
+
+
+def exists(obj):
+    '''
+    The function checks if a node exists
+    @param obj: str, SceneNode or PyNode
+    @return bool
+    '''
+    return get_backend().exists(obj)
+
+
+def list_names(pattern="*"):
+    '''
+    The function returns the short names of the nodes matching the pattern
+    @param pattern: str, wildcard pattern
+    @return [str]
+    '''
+    return get_backend().list_names(pattern)
+
+
+def selected():
+    '''
+    The function returns the selected nodes
+    @return [SceneNode]
+    '''
+    return get_backend().selected()
+
+
+def create_node(node_type, name=None, parent=None):
+    '''
+    The function creates a node
+    @param node_type: str, e.g. "transform", "joint"
+    @param name: str
+    @param parent: SceneNode, parent of a DAG node, None creates it under the world
+    @return SceneNode
+    '''
+    return get_backend().create_node(node_type, name, parent)
+
+
+def create_joints(names, translates, orients, parents):
+    '''
+    The function creates joints in one pass, every joint is created directly 
+    under its parent, so nothing has to be reparented afterwards
+    @param names: [str], joint names
+    @param translates: numpy.ndarray (N,3), translates relative to the parent
+    @param orients: numpy.ndarray (N,3), jointOrients in degrees relative to the parent
+    @param parents: list, for every joint the index of an earlier joint in the list,
+                    a SceneNode or None to create it under the world
+    @return [SceneNode]
+    '''
+    if not len(names) == len(translates) == len(orients) == len(parents):
+        raise ValueError("The number of names, translates, orients and parents doesn't match")
+    __check_parent_indices(parents, "Joint")
+
+    return get_backend().create_joints(names, translates, orients, parents)
+
+
+def create_nodes(node_types, names, parents):
+    '''
+    The function creates many DAG nodes in one pass, every node is created directly
+    under its parent, so nothing has to be reparented afterwards
+    @param node_types: [str], e.g. "transform"
+    @param names: [str]
+    @param parents: list, for every node the index of an earlier node in the list,
+                    a SceneNode or None to create it under the world
+    @return [SceneNode]
+    '''
+    if not len(node_types) == len(names) == len(parents):
+        raise ValueError("The number of node types, names and parents doesn't match")
+    __check_parent_indices(parents, "Node")
+
+    return get_backend().create_nodes(list(node_types), list(names), list(parents))
+
+
+def __check_parent_indices(parents, label):
+    '''
+    This function checks that the parent indices point to earlier nodes
+    '''
+    for i, parent in enumerate(parents):
+        if isinstance(parent, Integral) and not 0 <= parent < i:
+            raise ValueError(f"{label} {i}: parent index has to point to "
+                             f"an earlier {label.lower()}")
+
+
+def create_chain(names, translates, orients, parent=None):
+    '''
+    The function creates a joint chain in one pass, every joint is created
+    directly under the previous one
+    @param names: [str], joint names
+    @param translates: numpy.ndarray (N,3), translates relative to the parent joint
+    @param orients: numpy.ndarray (N,3), jointOrients in degrees relative to the parent joint
+    @param parent: SceneNode, parent of the first joint, None creates it under the world
+    @return [SceneNode]
+    '''
+    return create_joints(names, translates, orients, [parent] + list(range(len(names)-1)))
+
+
+def set_attrs_state(objs, attrs, locked=None, keyable=None, channel_box=None):
+    '''
+    The function changes the state of the same attributes of many nodes in one batch,
+    the states which are None are kept
+    @param objs: [SceneNode]
+    @param attrs: [str], long names of the attributes
+    @param locked: bool
+    @param keyable: bool
+    @param channel_box: bool, shown in the Channel Box while not keyable
+    '''
+    get_backend().set_attrs_state(nodes(objs), list(attrs), locked, keyable, channel_box)
+
+
+def set_attrs(objs, attr, values):
+    '''
+    The function sets the same numeric attribute of many nodes in one batch
+    @param objs: [SceneNode]
+    @param attr: str, long name of the attribute, e.g. "overrideColorRGB"
+    @param values: list, one value (bool, number or numbers of a compound) for every node
+    '''
+    if len(objs) != len(values):
+        raise ValueError("The number of nodes and values doesn't match")
+
+    get_backend().set_attrs(nodes(objs), attr, list(values))
+
+
+def set_matrices(objs, matrices):
+    '''
+    The function sets the matrices of many transforms relative to their parents in one batch,
+    only translate, rotate, scale and shear change, the offsetParentMatrix, rotateAxis 
+    and jointOrient are kept and taken into account
+    @param objs: [SceneNode], transforms
+    @param matrices: numpy.ndarray (N,4,4) or float[16] list for every node
+    '''
+    matrices = np.asarray(matrices, dtype=float).reshape(-1, 4, 4)
+    if len(objs) != len(matrices):
+        raise ValueError("The number of nodes and matrices doesn't match")
+
+    get_backend().set_matrices(nodes(objs), matrices)
+
+
+@contextmanager
+def undo_chunk(name="autorig"):
+    '''
+    The context manager groups all the scene changes done inside it into one undo step
+    @param name: str, name of the undo step
+    '''
+    backend = get_backend()
+    backend.open_undo_chunk(name)
+    try:
+        yield
+    finally:
+        backend.close_undo_chunk()
+
+
+def create_curve(points, knots, degree, periodic=False, name=None, parent=None):
+    '''
+    The function creates a nurbs curve shape without construction history
+    @param points: float[3] list or numpy.ndarray (N,3), CV positions in the local space,
+                   periodic curves repeat the first 'degree' CVs at the end
+    @param knots: float list
+    @param degree: int
+    @param periodic: bool
+    @param name: str, name of the shape node
+    @param parent: SceneNode, the transform the shape is created under,
+                   if None a new transform is created
+    @return SceneNode: the shape node
+    '''
+    return get_backend().create_curve(points, knots, degree, periodic, name, parent)
+
+
+def create_curves(curves, names, parents):
+    '''
+    The function creates many nurbs curve shapes without construction history in one pass
+    @param curves: [(points, knots, degree, periodic)], the arguments of create_curve,
+                   shapes sharing the same tuple share the geometry created from it
+    @param names: [str], names of the shape nodes
+    @param parents: [SceneNode], the transforms the shapes are created under
+    @return [SceneNode]: the shape nodes
+    '''
+    if not len(curves) == len(names) == len(parents):
+        raise ValueError("The number of curves, names and parents doesn't match")
+    if any(parent is None for parent in parents):
+        raise ValueError("Every curve needs a parent transform")
+
+    return get_backend().create_curves(list(curves), list(names), nodes(parents))
+
+
+def curve_data(shape):
+    '''
+    The function returns the data a nurbs curve shape is built from
+    @param shape: SceneNode, nurbs curve shape
+    @return (int, bool, numpy.ndarray, [float]): degree, periodic, 
+            CV positions (N,3) in the local space (unique CVs for periodic curves), knots
+    '''
+    return get_backend().curve_data(shape)
+
+
+def delete(*objs):
+    '''
+    The function deletes the nodes
+    @param objs: SceneNode, str or PyNode
+    '''
+    objs = [obj for obj in objs if obj is not None]
+    if objs:
+        get_backend().delete(objs)
+
+
+def display_error(message):
+    '''
+    The function reports an error
+    @param message: str
+    '''
+    get_backend().display_error(str(message))
+
+
+def display_warning(message):
+    '''
+    The function reports a warning
+    @param message: str
+    '''
+    get_backend().display_warning(str(message))
+
+
+def display_info(message):
+    '''
+    The function reports a message
+    @param message: str
+    '''
+    get_backend().display_info(str(message))
+
+
+def to_pymel(obj):
+    '''
+    The function converts a handle to a PyNode, pymel is only imported when needed
+    @param obj: SceneNode
+    @return PyNode
+    '''
+    import pymel.core as pm
+    return pm.PyNode(str(obj))
@@ -0,0 +1,387 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import re
+import fnmatch
+import itertools
+from numbers import Integral
+import numpy as np
+from utils import orient_utils
+from utils.scene.scene_node import SceneNode, COMPOUND_ATTRS, CHILD_ATTRS, MATRIX_ATTRS
+
+
+TRANSFORM_TYPES = ("transform", "joint")
+SHAPE_TYPES = ("nurbsCurve", "mesh", "locator")
+
+# attributes every node of the type starts with and their default values
+DEFAULT_ATTRS = {"transform": {"translate": (0.0, 0.0, 0.0), "rotate": (0.0, 0.0, 0.0),
+                               "scale": (1.0, 1.0, 1.0), "visibility": True,
+                               "rotateOrder": 0, "rotateAxis": (0.0, 0.0, 0.0),
+                               "offsetParentMatrix": tuple(np.identity(4).ravel().tolist())},
+                 "joint": {"jointOrient": (0.0, 0.0, 0.0), "radius": 1.0}}
+DRAW_OVERRIDE_ATTRS = {"overrideEnabled": False, "overrideRGBColors": False,
+                       "overrideColorRGB": (0.0, 0.0, 0.0)}
+KEYABLE_ATTRS = ("translate", "rotate", "scale", "visibility")
+
+
+class FakeNode(SceneNode):
+    '''
+    The class is a node of the fake scene. It keeps its attributes in a dictionary
+    and calculates the transforms the same way Maya does 
+    (scale, rotateAxis, rotate in its rotate order, jointOrient, translate)
+    leaving out pivots and shear
+    '''
+    _ids = itertools.count()
+
+    def __init__(self, backend, node_type, name):
+        '''
+        This is the constructor
+        @param backend: FakeBackend, the scene the node belongs to
+        @param node_type: str
+        @param name: str, unique name
+        '''
+        self._backend = backend
+        self._id = next(self._ids)
+        self._type = node_type
+        self._name = name
+        self._parent = None
+        self._children = []
+        self._alive = True
+        self._curve = None # (degree, periodic, points, knots) of nurbs curves
+        self._local = (None, None) # transform values and the local matrix made from them
+
+        self._attrs = {}
+        if node_type in TRANSFORM_TYPES:
+            self._attrs.update(DEFAULT_ATTRS["transform"])
+        if node_type in DEFAULT_ATTRS:
+            self._attrs.update(DEFAULT_ATTRS[node_type])
+        if node_type in TRANSFORM_TYPES + SHAPE_TYPES:
+            self._attrs.update(DRAW_OVERRIDE_ATTRS)
+
+        self._states = {} # attr -> [locked, keyable, channel_box]
+
+    def _key(self):
+        return self._id
+
+    def name(self):
+        return self._name
+
+    def path(self):
+        if self._type not in TRANSFORM_TYPES + SHAPE_TYPES:
+            return self._name
+        names = [n._name for n in reversed(self.ancestors())] + [self._name]
+        return "|" + "|".join(names)
+
+    def node_type(self):
+        return self._type
+
+    def exists(self):
+        return self._alive
+
+    def parent(self):
+        return self._parent
+
+    def set_parent(self, parent):
+        if parent is self._parent:
+            return
+        if parent is not None and parent._type not in TRANSFORM_TYPES:
+            raise ValueError(f"'{parent}' is not a transform")
+        if parent is not None and (parent is self or self in parent.ancestors()):
+            raise ValueError(f"'{parent}' is a descendant of '{self}'")
+
+        world = self.world_matrix() if not self.is_shape() else None
+        if self._parent is not None:
+            self._parent._children.remove(self)
+        self._parent = parent
+        if parent is not None:
+            parent._children.append(self)
+        if world is not None:
+            self.set_matrix(world)
+
+    def ancestors(self):
+        '''
+        This method returns all the parents of the node up to the world
+        @return [FakeNode]
+        '''
+        res = []
+        parent = self._parent
+        while parent is not None:
+            res.append(parent)
+            parent = parent._parent
+        return res
+
+    def children(self):
+        return list(self._children)
+
+    def is_transform(self):
+        return self._type in TRANSFORM_TYPES
+
+    def is_shape(self):
+        return self._type in SHAPE_TYPES
+
+    def __split_attr(self, attr):
+        '''
+        This method returns the attribute holding the value and the index of the child
+        '''
+        if attr in self._attrs:
+            return attr, None
+        if attr in CHILD_ATTRS and CHILD_ATTRS[attr][0] in self._attrs:
+            return CHILD_ATTRS[attr]
+        raise ValueError(f"No object matches name: {self._name}.{attr}")
+
+    def get_attr(self, attr):
+        attr, index = self.__split_attr(attr)
+        value = self._attrs[attr]
+        return value if index is None else value[index]
+
+    def set_attr(self, attr, value):
+        key, index = self.__split_attr(attr)
+        if self.attr_state(attr)[0] or (index is not None and self.attr_state(key)[0]):
+            raise RuntimeError(f"The attribute '{self._name}.{attr}' is locked")
+
+        if index is not None:
+            values = list(self._attrs[key])
+            values[index] = float(value)
+            self._attrs[key] = tuple(values)
+        elif key in COMPOUND_ATTRS or key in MATRIX_ATTRS:
+            self._attrs[key] = tuple(float(v) for v in np.ravel(value))
+        else:
+            self._attrs[key] = type(self._attrs[key])(value)
+
+    def add_attr(self, attr, value):
+        '''
+        This method adds a custom attribute, the fake counterpart of addAttr
+        @param attr: str
+        @param value: the default value, its type is kept when the attribute is set
+        '''
+        if attr in self._attrs:
+            raise ValueError(f"Attribute '{attr}' already exists on '{self._name}'")
+        self._attrs[attr] = value
+
+    def attr_state(self, attr):
+        self.__split_attr(attr)
+        default = [False, attr in KEYABLE_ATTRS or CHILD_ATTRS.get(attr, ("",))[0] in KEYABLE_ATTRS,
+                   False]
+        return tuple(self._states.get(attr, default))
+
+    def set_attr_state(self, attr, locked=None, keyable=None, channel_box=None):
+        state = list(self.attr_state(attr))
+        for i, value in enumerate((locked, keyable, channel_box)):
+            if value is not None:
+                state[i] = bool(value)
+        self._states[attr] = state
+
+    def local_matrix(self):
+        '''
+        This method returns the matrix of the node relative to its parent
+        @return numpy.ndarray: shape (4,4)
+        '''
+        if self._type not in TRANSFORM_TYPES:
+            return np.identity(4)
+
+        key = tuple(self._attrs.get(attr) for attr in ("translate", "rotate", "scale",
+                                                        "rotateOrder", "rotateAxis",
+                                                        "jointOrient", "offsetParentMatrix"))
+        if self._local[0] == key:
+            return self._local[1].copy()
+
+        matrix = np.identity(4)
+        rotation = (orient_utils.euler_to_matrix(self._attrs["rotateAxis"])[0]
+                    @ orient_utils.euler_to_matrix(self._attrs["rotate"], 
+                                                   self._attrs["rotateOrder"])[0])
+        if self._type == "joint":
+            rotation = rotation @ orient_utils.euler_to_matrix(self._attrs["jointOrient"])[0]
+        matrix[:3, :3] = np.diag(self._attrs["scale"]) @ rotation
+        matrix[3, :3] = self._attrs["translate"]
+        matrix = matrix @ np.reshape(self._attrs["offsetParentMatrix"], (4, 4))
+        self._local = (key, matrix)
+
+        return matrix.copy()
+
+    def world_matrix(self):
+        matrix = self.local_matrix()
+        for parent in self.ancestors():
+            matrix = matrix @ parent.local_matrix()
+        return matrix
+
+    def set_matrix(self, matrix, world=True):
+        if self._type not in TRANSFORM_TYPES:
+            raise ValueError(f"'{self._name}' is not a transform")
+
+        matrix = np.asarray(matrix, dtype=float).reshape(4, 4)
+        if world and self._parent is not None:
+            matrix = matrix @ np.linalg.inv(self._parent.world_matrix())
+        matrix = matrix @ np.linalg.inv(np.reshape(self._attrs["offsetParentMatrix"], (4, 4)))
+
+        scale = np.linalg.norm(matrix[:3, :3], axis=1)
+        rotation = orient_utils.euler_to_matrix(self._attrs["rotateAxis"])[0].T \
+                   @ matrix[:3, :3] / scale[:, None]
+        if self._type == "joint":
+            rotation = rotation @ orient_utils.euler_to_matrix(self._attrs["jointOrient"])[0].T
+
+        self.set_attr("translate", matrix[3, :3])
+        self.set_attr("rotate", orient_utils.matrix_to_euler(rotation, 
+                                                             self._attrs["rotateOrder"])[0])
+        self.set_attr("scale", scale)
+
+
+class FakeBackend(object):
+    '''
+    The class is a pure Python scene used instead of Maya in tests.
+    It supports the operations the autorig does through the scene adapter:
+    creating, naming, parenting and deleting nodes, attributes, matrices and curves
+    '''
+    def __init__(self):
+        '''
+        This is the constructor
+        '''
+        self._nodes = {} # name -> FakeNode
+        self.selection = [] # nodes returned by selected()
+        self.messages = [] # (level, message) of everything displayed
+        self.undo_chunks = [] # names of the open undo chunks
+        self.undo_steps = [] # names of the closed undo chunks
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def node(self, obj):
+        if isinstance(obj, FakeNode):
+            if not obj.exists():
+                raise ValueError(f"Object '{obj.name()}' does not exist")
+            return obj
+
+        name = str(obj).split("|")[-1].split(".")[0]
+        if name not in self._nodes:
+            raise ValueError(f"Object '{obj}' does not exist")
+        return self._nodes[name]
+
+    def exists(self, obj):
+        if isinstance(obj, FakeNode):
+            return obj.exists()
+        return str(obj).split("|")[-1] in self._nodes
+
+    def list_names(self, pattern="*"):
+        return fnmatch.filter(self._nodes, pattern)
+
+    def selected(self):
+        return [n for n in self.selection if n.exists()]
+
+    def __unique_name(self, name):
+        '''
+        This method increments the trailing number of the name until it is unique,
+        the same way Maya renames new nodes
+        '''
+        if name not in self._nodes:
+            return name
+
+        base, num = re.match(r"(.*?)(\d*)$", name).groups()
+        num = int(num) if num else 0
+        while True:
+            num += 1
+            if base + str(num) not in self._nodes:
+                return base + str(num)
+
+    def create_node(self, node_type, name=None, parent=None):
+        if parent is not None and node_type not in TRANSFORM_TYPES + SHAPE_TYPES:
+            raise ValueError(f"'{node_type}' is not a DAG node")
+        if node_type in SHAPE_TYPES and parent is None:
+            parent = self.create_node("transform", node_type+"1")
+
+        name = self.__unique_name(name or node_type+"1")
+        new_node = FakeNode(self, node_type, name)
+        self._nodes[name] = new_node
+        if parent is not None:
+            new_node._parent = self.node(parent)
+            new_node._parent._children.append(new_node)
+
+        return new_node
+
+    def create_joints(self, names, translates, orients, parents):
+        joints = []
+        for name, translate, orient, parent in zip(names, translates, orients, parents):
+            if isinstance(parent, Integral):
+                parent = joints[parent]
+            jnt = self.create_node("joint", name, parent)
+            jnt._attrs["translate"] = tuple(float(v) for v in translate)
+            jnt._attrs["jointOrient"] = tuple(float(v) for v in orient)
+            joints.append(jnt)
+
+        return joints
+
+    def create_nodes(self, node_types, names, parents):
+        created = []
+        for node_type, name, parent in zip(node_types, names, parents):
+            if isinstance(parent, Integral):
+                parent = created[parent]
+            created.append(self.create_node(node_type, name, parent))
+
+        return created
+
+    def set_attrs(self, nodes, attr, values):
+        for fake_node, value in zip(nodes, values):
+            fake_node.set_attr(attr, value)
+
+    def set_matrices(self, nodes, matrices):
+        for fake_node, matrix in zip(nodes, matrices):
+            fake_node.set_matrix(matrix, world=False)
+
+    def set_attrs_state(self, nodes, attrs, locked=None, keyable=None, channel_box=None):
+        for fake_node in nodes:
+            for attr in attrs:
+                fake_node.set_attr_state(attr, locked, keyable, channel_box)
+
+    def open_undo_chunk(self, name):
+        self.undo_chunks.append(name)
+
+    def close_undo_chunk(self):
+        self.undo_steps.append(self.undo_chunks.pop())
+
+    def create_curve(self, points, knots, degree, periodic=False, name=None, parent=None):
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        knots = [float(k) for k in knots]
+        if len(knots) != len(points) + degree - 1:
+            raise ValueError("Wrong number of knots")
+        if periodic and not np.allclose(points[:degree], points[-degree:]):
+            raise ValueError("The last CVs of a periodic curve have to overlap the first ones")
+
+        shape = self.create_node("nurbsCurve", name or "curveShape1", parent)
+        shape._curve = (degree, periodic, points[:len(points)-degree] if periodic else points,
+                        knots)
+        return shape
+
+    def create_curves(self, curves, names, parents):
+        return [self.create_curve(*curve, name=name, parent=parent)
+                for curve, name, parent in zip(curves, names, parents)]
+
+    def curve_data(self, shape):
+        shape = self.node(shape)
+        if shape._curve is None:
+            raise ValueError(f"'{shape.name()}' is not a nurbs curve")
+
+        degree, periodic, points, knots = shape._curve
+        return degree, periodic, points.copy(), list(knots)
+
+    def delete(self, objs):
+        for obj in objs:
+            if not self.exists(obj):
+                continue
+            fake_node = self.node(obj)
+            if fake_node._parent is not None:
+                fake_node._parent._children.remove(fake_node)
+            stack = [fake_node] # deep chains would hit the recursion limit
+            while stack:
+                current = stack.pop()
+                stack.extend(current._children)
+                current._alive = False
+                del self._nodes[current.name()]
+
+    def display_error(self, message):
+        self.messages.append(("error", message))
+
+    def display_warning(self, message):
+        self.messages.append(("warning", message))
+
+    def display_info(self, message):
+        self.messages.append(("info", message))
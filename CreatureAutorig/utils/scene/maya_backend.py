@@ -0,0 +1,430 @@
+# pylint: disable=import-error
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+from numbers import Integral
+import numpy as np
+from maya import cmds
+import maya.api.OpenMaya as om2
+from utils.scene.scene_node import SceneNode, MATRIX_ATTRS
+
+
+class MayaNode(SceneNode):
+    '''
+    The class is a lightweight handle of a Maya node backed by MObjectHandle.
+    The DAG path is looked up from the handle when needed,
+    so the handle survives renaming and reparenting.
+    Changes go through maya.cmds, so they end up in the undo queue.
+    '''
+    def __init__(self, obj):
+        '''
+        This is the constructor
+        @param obj: MObject
+        '''
+        self._handle = om2.MObjectHandle(obj)
+        self._is_dag = obj.hasFn(om2.MFn.kDagNode)
+
+    def _key(self):
+        return self._handle.hashCode()
+
+    def mobject(self):
+        '''
+        This method returns the MObject of the node
+        @return MObject
+        '''
+        if not self.exists():
+            raise ValueError("The node no longer exists")
+        return self._handle.object()
+
+    def dag_path(self):
+        '''
+        This method returns the MDagPath of the node
+        @return MDagPath
+        '''
+        return om2.MDagPath.getAPathTo(self.mobject())
+
+    def name(self):
+        return om2.MFnDependencyNode(self.mobject()).name()
+
+    def path(self):
+        if self._is_dag:
+            return self.dag_path().fullPathName()
+        return self.name()
+
+    def node_type(self):
+        return om2.MFnDependencyNode(self.mobject()).typeName
+
+    def exists(self):
+        return self._handle.isValid() and self._handle.isAlive()
+
+    def parent(self):
+        if not self._is_dag:
+            return None
+        parent = om2.MFnDagNode(self.mobject()).parent(0)
+        if parent.hasFn(om2.MFn.kWorld):
+            return None
+        return MayaNode(parent)
+
+    def set_parent(self, parent):
+        if parent == self.parent():
+            return
+        if parent is None:
+            cmds.parent(self.path(), world=True)
+        else:
+            cmds.parent(self.path(), str(parent))
+
+    def children(self):
+        if not self._is_dag:
+            return []
+        fn_dag = om2.MFnDagNode(self.mobject())
+        return [MayaNode(fn_dag.child(i)) for i in range(fn_dag.childCount())]
+
+    def is_transform(self):
+        return self.mobject().hasFn(om2.MFn.kTransform)
+
+    def is_shape(self):
+        return self.mobject().hasFn(om2.MFn.kShape)
+
+    def get_attr(self, attr):
+        value = cmds.getAttr(f"{self.path()}.{attr}")
+        if attr in MATRIX_ATTRS:
+            return tuple(value)
+        if isinstance(value, list) and len(value) == 1 and isinstance(value[0], tuple):
+            return value[0]
+        return value
+
+    def set_attr(self, attr, value):
+        if attr in MATRIX_ATTRS:
+            cmds.setAttr(f"{self.path()}.{attr}", *[float(v) for v in np.ravel(value)], 
+                         type="matrix")
+        elif isinstance(value, (list, tuple, np.ndarray)):
+            cmds.setAttr(f"{self.path()}.{attr}", *[float(v) for v in value])
+        else:
+            cmds.setAttr(f"{self.path()}.{attr}", value)
+
+    def attr_state(self, attr):
+        plug = f"{self.path()}.{attr}"
+        return (cmds.getAttr(plug, lock=True), cmds.getAttr(plug, keyable=True),
+                cmds.getAttr(plug, channelBox=True))
+
+    def set_attr_state(self, attr, locked=None, keyable=None, channel_box=None):
+        plug = f"{self.path()}.{attr}"
+        if locked is not None:
+            cmds.setAttr(plug, lock=locked)
+        if keyable is not None:
+            cmds.setAttr(plug, keyable=keyable)
+        if channel_box is not None:
+            cmds.setAttr(plug, channelBox=channel_box)
+
+    def world_matrix(self):
+        matrix = self.dag_path().inclusiveMatrix()
+        return np.array([[matrix.getElement(r, c) for c in range(4)] for r in range(4)])
+
+    def set_matrix(self, matrix, world=True):
+        flat = [float(v) for v in np.ravel(matrix)]
+        cmds.xform(self.path(), matrix=flat, worldSpace=world, objectSpace=not world)
+
+
+class MayaBackend(object):
+    '''
+    The class sends the scene functions to Maya
+    '''
+    def node(self, obj):
+        if isinstance(obj, MayaNode):
+            return obj
+        if isinstance(obj, om2.MObject):
+            return MayaNode(obj)
+
+        sel = om2.MSelectionList()
+        try:
+            sel.add(str(obj))
+        except RuntimeError:
+            raise ValueError(f"Object '{obj}' does not exist") from None
+
+        return MayaNode(sel.getDependNode(0))
+
+    def exists(self, obj):
+        if isinstance(obj, MayaNode):
+            return obj.exists()
+        return cmds.objExists(str(obj))
+
+    def list_names(self, pattern="*"):
+        return cmds.ls(pattern, shortNames=True)
+
+    def selected(self):
+        sel = om2.MGlobal.getActiveSelectionList()
+        return [MayaNode(sel.getDependNode(i)) for i in range(sel.length())]
+
+    def create_node(self, node_type, name=None, parent=None):
+        kwargs = {"skipSelect": True}
+        if name:
+            kwargs["name"] = name
+        if parent is not None:
+            kwargs["parent"] = str(parent)
+        res = cmds.createNode(node_type, **kwargs)
+
+        if parent is not None: # the name doesn't have to be unique, look it up under the parent
+            return self.node(f"{parent}|{res}")
+        return self.node(res)
+
+    def create_joints(self, names, translates, orients, parents):
+        if cmds.undoInfo(query=True, state=True):
+            return self.__create_joints_undoable(names, translates, orients, parents)
+
+        # with the undo queue off nothing has to be recorded, so all the joints
+        # are created and set by a single modifier
+        mod = om2.MDagModifier()
+        objs = []
+        for name, translate, orient, parent in zip(names, np.asarray(translates).tolist(),
+                                                   np.radians(orients).tolist(), parents):
+            if isinstance(parent, Integral):
+                parent_obj = objs[parent]
+            else:
+                parent_obj = parent.mobject() if parent is not None else om2.MObject.kNullObj
+            obj = mod.createNode("joint", parent_obj)
+            mod.renameNode(obj, name)
+            fn_node = om2.MFnDependencyNode(obj)
+            for i, axis in enumerate("XYZ"):
+                mod.newPlugValueDouble(fn_node.findPlug("translate"+axis, False), translate[i])
+                mod.newPlugValueMAngle(fn_node.findPlug("jointOrient"+axis, False),
+                                       om2.MAngle(orient[i]))
+            objs.append(obj)
+        mod.doIt()
+
+        return [MayaNode(obj) for obj in objs]
+
+    def __create_joints_undoable(self, names, translates, orients, parents):
+        '''
+        This method creates the joints with maya.cmds, so they end up in the undo queue
+        '''
+        joints = []
+        for name, translate, orient, parent in zip(names, np.asarray(translates).tolist(),
+                                                   np.asarray(orients).tolist(), parents):
+            if isinstance(parent, Integral):
+                parent = joints[parent]
+            jnt = self.create_node("joint", name, parent)
+            cmds.setAttr(f"{jnt}.translate", *translate)
+            cmds.setAttr(f"{jnt}.jointOrient", *orient)
+            joints.append(jnt)
+
+        return joints
+
+    def create_nodes(self, node_types, names, parents):
+        if cmds.undoInfo(query=True, state=True):
+            created = []
+            for node_type, name, parent in zip(node_types, names, parents):
+                if isinstance(parent, Integral):
+                    parent = created[parent]
+                created.append(self.create_node(node_type, name, parent))
+            return created
+
+        # with the undo queue off all the nodes are created by a single modifier
+        mod = om2.MDagModifier()
+        objs = []
+        for node_type, name, parent in zip(node_types, names, parents):
+            if isinstance(parent, Integral):
+                parent_obj = objs[parent]
+            else:
+                parent_obj = parent.mobject() if parent is not None else om2.MObject.kNullObj
+            obj = mod.createNode(node_type, parent_obj)
+            if name:
+                mod.renameNode(obj, name)
+            objs.append(obj)
+        mod.doIt()
+
+        return [MayaNode(obj) for obj in objs]
+
+    def set_attrs(self, nodes, attr, values):
+        if cmds.undoInfo(query=True, state=True):
+            for node, value in zip(nodes, values):
+                node.set_attr(attr, value)
+            return
+
+        mod = om2.MDGModifier()
+        for node, value in zip(nodes, values):
+            self.__queue_value(mod, om2.MFnDependencyNode(node.mobject()).findPlug(attr, False), 
+                               value)
+        mod.doIt()
+
+    def __queue_value(self, mod, plug, value):
+        '''
+        This method adds setting a numeric plug to the modifier, 
+        compound values are set child by child
+        '''
+        if isinstance(value, (list, tuple, np.ndarray)):
+            for i, child_value in enumerate(value):
+                self.__queue_value(mod, plug.child(i), child_value)
+        elif isinstance(value, (bool, np.bool_)):
+            mod.newPlugValueBool(plug, bool(value))
+        elif isinstance(value, Integral):
+            mod.newPlugValueInt(plug, int(value))
+        else:
+            mod.newPlugValueDouble(plug, float(value))
+
+    def set_matrices(self, nodes, matrices):
+        # the matrices are split into the transform attributes the same way 
+        # with the undo queue on and off, so both give the same transforms
+        values = [self.__matrix_values(om2.MFnDependencyNode(node.mobject()), matrix)
+                  for node, matrix in zip(nodes, matrices)]
+
+        if cmds.undoInfo(query=True, state=True):
+            for node, (translation, rotation, scale, shear) in zip(nodes, values):
+                path = node.path()
+                cmds.setAttr(f"{path}.translate", *translation)
+                cmds.setAttr(f"{path}.rotate", *[np.degrees(r) for r in rotation])
+                cmds.setAttr(f"{path}.scale", *scale)
+                cmds.setAttr(f"{path}.shear", *shear)
+            return
+
+        # with the undo queue off the attributes are set by a single modifier
+        mod = om2.MDGModifier()
+        for node, (translation, rotation, scale, shear) in zip(nodes, values):
+            fn_node = om2.MFnDependencyNode(node.mobject())
+            for i, axis in enumerate("XYZ"):
+                mod.newPlugValueDouble(fn_node.findPlug("translate"+axis, False), translation[i])
+                mod.newPlugValueMAngle(fn_node.findPlug("rotate"+axis, False),
+                                       om2.MAngle(rotation[i]))
+                mod.newPlugValueDouble(fn_node.findPlug("scale"+axis, False), scale[i])
+            for i, attr in enumerate(("shearXY", "shearXZ", "shearYZ")):
+                mod.newPlugValueDouble(fn_node.findPlug(attr, False), shear[i])
+        mod.doIt()
+
+    @staticmethod
+    def __matrix_values(fn_node, matrix):
+        '''
+        This method splits a matrix relative to the parent into translate, rotate (radians),
+        scale and shear of the node. The offsetParentMatrix, rotateAxis and jointOrient
+        of the node are kept, so they are taken out of the matrix first
+        @return ([float], [float], [float], [float])
+        '''
+        def euler_matrix(attr):
+            return om2.MEulerRotation([fn_node.findPlug(attr+axis, False).asMAngle().asRadians()
+                                       for axis in "XYZ"]).asMatrix()
+
+        matrix = om2.MMatrix([float(v) for v in np.ravel(matrix)])
+        offset = fn_node.findPlug("offsetParentMatrix", False).asMObject()
+        matrix *= om2.MFnMatrixData(offset).matrix().inverse()
+
+        # scale * shear * rotateAxis * rotate * jointOrient, then the translation
+        translation = [matrix.getElement(3, i) for i in range(3)]
+        for i in range(3):
+            matrix.setElement(3, i, 0.0)
+        if fn_node.object().hasFn(om2.MFn.kJoint):
+            matrix *= euler_matrix("jointOrient").transpose()
+
+        xform = om2.MTransformationMatrix(matrix)
+        rotation = euler_matrix("rotateAxis").transpose() \
+                   * xform.rotation(asQuaternion=True).asMatrix()
+        rotation = om2.MTransformationMatrix(rotation).rotation()
+        rotation.reorderIt(fn_node.findPlug("rotateOrder", False).asInt())
+
+        return (translation, [rotation.x, rotation.y, rotation.z],
+                list(xform.scale(om2.MSpace.kTransform)), 
+                list(xform.shear(om2.MSpace.kTransform)))
+
+    def set_attrs_state(self, nodes, attrs, locked=None, keyable=None, channel_box=None):
+        if cmds.undoInfo(query=True, state=True):
+            # setAttr changes a single plug, so the flags are set plug by plug
+            for node in nodes:
+                for attr in attrs:
+                    node.set_attr_state(attr, locked, keyable, channel_box)
+            return
+
+        # with the undo queue off the plugs are changed directly, without running any command
+        for node in nodes:
+            fn_node = om2.MFnDependencyNode(node.mobject())
+            for attr in attrs:
+                plug = fn_node.findPlug(attr, False)
+                if keyable is not None:
+                    plug.isKeyable = keyable
+                if channel_box is not None:
+                    plug.isChannelBox = channel_box
+                if locked is not None:
+                    plug.isLocked = locked
+
+    def open_undo_chunk(self, name):
+        cmds.undoInfo(openChunk=True, chunkName=name)
+
+    def close_undo_chunk(self):
+        cmds.undoInfo(closeChunk=True)
+
+    def create_curve(self, points, knots, degree, periodic=False, name=None, parent=None):
+        if parent is None:
+            parent = self.create_node("transform", "curve1")
+
+        return self.create_curves([(points, knots, degree, periodic)], [name], [parent])[0]
+
+    def create_curves(self, curves, names, parents):
+        if cmds.undoInfo(query=True, state=True):
+            return [self.__create_curve_undoable(curve, name, parent)
+                    for curve, name, parent in zip(curves, names, parents)]
+
+        # with the undo queue off all the shapes are created and filled with the curve data
+        # by a single modifier, shapes sharing a curve share its data
+        mod = om2.MDagModifier()
+        curve_data = {}
+        objs = []
+        for curve, name, parent in zip(curves, names, parents):
+            if id(curve) not in curve_data:
+                curve_data[id(curve)] = self.__curve_data(*curve)
+            obj = mod.createNode("nurbsCurve", parent.mobject())
+            if name:
+                mod.renameNode(obj, name)
+            mod.newPlugValue(om2.MFnDependencyNode(obj).findPlug("cached", False),
+                             curve_data[id(curve)])
+            objs.append(obj)
+        mod.doIt()
+
+        return [MayaNode(obj) for obj in objs]
+
+    def __create_curve_undoable(self, curve, name, parent):
+        '''
+        This method creates the shape under the parent with maya.cmds and fills it 
+        with the curve data by a single setAttr, so both steps end up in the undo queue
+        '''
+        points, knots, degree, periodic = curve
+        points = [tuple(p) for p in np.asarray(points, dtype=float).tolist()]
+        knots = [float(k) for k in knots]
+        shape = self.create_node("nurbsCurve", name, parent)
+        cmds.setAttr(f"{shape.path()}.cached", degree, len(points) - degree, 
+                     2 if periodic else 0, False, 3, knots, len(knots), len(points), *points,
+                     type="nurbsCurve")
+
+        return shape
+
+    @staticmethod
+    def __curve_data(points, knots, degree, periodic):
+        '''
+        This method creates nurbs curve data, the geometry a nurbsCurve node is filled with
+        @return MObject
+        '''
+        form = om2.MFnNurbsCurve.kPeriodic if periodic else om2.MFnNurbsCurve.kOpen
+        data_obj = om2.MFnNurbsCurveData().create()
+        om2.MFnNurbsCurve().create([om2.MPoint(p) for p in np.asarray(points).tolist()],
+                                   om2.MDoubleArray([float(k) for k in knots]),
+                                   degree, form, False, False, data_obj)
+        return data_obj
+
+    def curve_data(self, shape):
+        fn_curve = om2.MFnNurbsCurve(shape.dag_path())
+        periodic = fn_curve.form == om2.MFnNurbsCurve.kPeriodic
+        count = fn_curve.numCVs - fn_curve.degree if periodic else fn_curve.numCVs
+        points = np.array([[p.x, p.y, p.z] for p in fn_curve.cvPositions(om2.MSpace.kObject)])
+
+        return fn_curve.degree, periodic, points[:count], list(fn_curve.knots())
+
+    def delete(self, objs):
+        paths = [str(self.node(obj)) for obj in objs if self.exists(obj)]
+        if paths:
+            cmds.delete(paths)
+
+    def display_error(self, message):
+        om2.MGlobal.displayError(message)
+
+    def display_warning(self, message):
+        om2.MGlobal.displayWarning(message)
+
+    def display_info(self, message):
+        om2.MGlobal.displayInfo(message)
@@ -0,0 +1,168 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+
+
+# compound attributes and the names of their children
+COMPOUND_ATTRS = {"translate": ("translateX", "translateY", "translateZ"),
+                  "rotate": ("rotateX", "rotateY", "rotateZ"),
+                  "scale": ("scaleX", "scaleY", "scaleZ"),
+                  "jointOrient": ("jointOrientX", "jointOrientY", "jointOrientZ"),
+                  "rotateAxis": ("rotateAxisX", "rotateAxisY", "rotateAxisZ"),
+                  "overrideColorRGB": ("overrideColorR", "overrideColorG", "overrideColorB")}
+CHILD_ATTRS = {child: (parent, i) for parent, children in COMPOUND_ATTRS.items()
+               for i, child in enumerate(children)}
+# matrix attributes, their values are 16 floats (rows of the 4x4 matrix)
+MATRIX_ATTRS = ("offsetParentMatrix",)
+
+
+class SceneNode(object):
+    '''
+    The base class of the node handles returned by the scene backends.
+    A handle keeps a reference to the node itself rather than its name,
+    so it stays valid when the node is renamed or reparented.
+    Handles can be compared, used as dict keys and converted to a string (full path),
+    so they can be passed straight to maya.cmds.
+    '''
+    def __str__(self):
+        return self.path()
+
+    def __repr__(self):
+        return f"{type(self).__name__}('{self.path()}')"
+
+    def __eq__(self, other):
+        if not isinstance(other, SceneNode):
+            return False
+        return self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def _key(self):
+        '''
+        This method returns a value identifying the node, used for comparison and hashing
+        '''
+        raise NotImplementedError
+
+    def name(self):
+        '''
+        This method returns the short name of the node
+        @return str
+        '''
+        raise NotImplementedError
+
+    def path(self):
+        '''
+        This method returns the full DAG path of the node (the name for DG nodes)
+        @return str
+        '''
+        raise NotImplementedError
+
+    def node_type(self):
+        '''
+        This method returns the type of the node
+        @return str
+        '''
+        raise NotImplementedError
+
+    def exists(self):
+        '''
+        This method checks if the node still exists
+        @return bool
+        '''
+        raise NotImplementedError
+
+    def parent(self):
+        '''
+        This method returns the parent of the node
+        @return SceneNode: None if the node is parented to the world
+        '''
+        raise NotImplementedError
+
+    def set_parent(self, parent):
+        '''
+        This method reparents the node, keeping its world transforms
+        @param parent: SceneNode, None parents the node to the world
+        '''
+        raise NotImplementedError
+
+    def children(self):
+        '''
+        This method returns the child nodes (transforms and shapes)
+        @return [SceneNode]
+        '''
+        raise NotImplementedError
+
+    def shapes(self):
+        '''
+        This method returns the shape nodes of a transform
+        @return [SceneNode]
+        '''
+        return [c for c in self.children() if c.is_shape()]
+
+    def is_transform(self):
+        '''
+        This method checks if the node is a transform (joints included)
+        @return bool
+        '''
+        raise NotImplementedError
+
+    def is_shape(self):
+        '''
+        This method checks if the node is a shape
+        @return bool
+        '''
+        raise NotImplementedError
+
+    def get_attr(self, attr):
+        '''
+        This method returns the value of an attribute, compound attributes return a tuple
+        @param attr: str, long name of the attribute
+        '''
+        raise NotImplementedError
+
+    def set_attr(self, attr, value):
+        '''
+        This method sets the value of an attribute, angles are in degrees
+        @param attr: str, long name of the attribute
+        @param value: float, bool or float list for compound attributes
+        '''
+        raise NotImplementedError
+
+    def attr_state(self, attr):
+        '''
+        This method returns the state of an attribute in the Channel Box
+        @param attr: str, long name of the attribute
+        @return (bool, bool, bool): locked, keyable, shown in the Channel Box
+        '''
+        raise NotImplementedError
+
+    def set_attr_state(self, attr, locked=None, keyable=None, channel_box=None):
+        '''
+        This method changes the state of an attribute, the states which are None are kept
+        @param attr: str, long name of the attribute
+        @param locked: bool
+        @param keyable: bool
+        @param channel_box: bool, shown in the Channel Box while not keyable
+        '''
+        raise NotImplementedError
+
+    def world_matrix(self):
+        '''
+        This method returns the world matrix of the node
+        @return numpy.ndarray: shape (4,4), rows are the X, Y, Z axes and the position
+        '''
+        raise NotImplementedError
+
+    def set_matrix(self, matrix, world=True):
+        '''
+        This method sets the transforms of the node from a matrix
+        @param matrix: numpy.ndarray (4,4) or float[16]
+        @param world: bool, True if the matrix is in world space, False for the local space
+        '''
+        raise NotImplementedError
@@ -0,0 +1,273 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import itertools
+import numpy as np
+from utils.orient_utils import as_vectors
+
+
+TOLERANCE = 1e-10 # default distance below which points are treated as overlapping
+
+# half of the 26 neighbouring cells, the other half is covered by swapping the pair
+_NEIGHBOUR_OFFSETS = [off for off in itertools.product((-1, 0, 1), repeat=3)
+                      if off > (0, 0, 0)]
+# odd multipliers hashing a cell (x, y, z) into a single uint64 key
+_CELL_HASH = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9],
+                      dtype=np.uint64)
+
+
+def find_overlapping(points, tolerance=TOLERANCE):
+    '''
+    The function finds all pairs of points which are closer to each other than the tolerance.
+    The points are sorted into a grid of cells as big as the tolerance, so only points 
+    in the same or neighbouring cells are compared. It takes O(n log n) as long as 
+    the cells hold a few points each, which is true unless most points overlap
+    @param points: float[3] list or numpy.ndarray (N,3)
+    @param tolerance: float, maximum distance between overlapping points
+    @return numpy.ndarray: shape (M,2), index pairs (i, j) with i < j, sorted
+    '''
+    points = as_vectors(points)
+    num = len(points)
+    if num < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    # cells can be bigger than the tolerance, they only must fit into int64 
+    extent = np.ptp(points, axis=0).max()
+    cell_size = max(tolerance, extent * 2.0**-60, np.finfo(float).tiny)
+    cells = np.floor((points - points.min(axis=0)) / cell_size).astype(np.int64)
+
+    # the keys are hashed cells, different cells with the same key only add pairs 
+    # which fail the distance test
+    keys = __cell_keys(cells)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    sorted_cells = cells[order]
+    sorted_points = points[order]
+    index = np.arange(num)
+
+    first, second = [], []
+
+    # pairs inside the same cell
+    hi = np.searchsorted(sorted_keys, sorted_keys, side="right")
+    src, dst = _expand_ranges(index, index+1, hi)
+    first.append(src)
+    second.append(dst)
+
+    # pairs with the neighbouring cells
+    for off in _NEIGHBOUR_OFFSETS:
+        neighbour_keys = __cell_keys(sorted_cells + off)
+        lo = np.searchsorted(sorted_keys, neighbour_keys, side="left")
+        hi = np.searchsorted(sorted_keys, neighbour_keys, side="right")
+        src, dst = _expand_ranges(index, lo, hi)
+        first.append(src)
+        second.append(dst)
+
+    first = np.concatenate(first)
+    second = np.concatenate(second)
+
+    dist = np.linalg.norm(sorted_points[first] - sorted_points[second], axis=1)
+    close = dist <= tolerance
+
+    pairs = np.sort(np.stack([order[first[close]], order[second[close]]], axis=1), axis=1)
+    if not len(pairs):
+        return pairs
+
+    return np.unique(pairs, axis=0)
+
+
+def __cell_keys(cells):
+    '''
+    This function hashes grid cells (N,3) into uint64 keys, multiplications overflow on purpose
+    '''
+    hashed = cells.astype(np.uint64) * _CELL_HASH
+
+    return hashed[:, 0] ^ hashed[:, 1] ^ hashed[:, 2]
+
+
+def _expand_ranges(index, lo, hi):
+    '''
+    This method pairs every index with all the values in its [lo, hi) range
+    '''
+    counts = np.maximum(hi - lo, 0)
+    total = counts.sum()
+    src = np.repeat(index, counts)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    dst = np.arange(total) - starts + np.repeat(lo, counts)
+
+    return src, dst
+
+
+def count_unique(points, tolerance=TOLERANCE, pairs=None):
+    '''
+    The function counts points which don't overlap any point that comes before them
+    @param points: float[3] list or numpy.ndarray (N,3)
+    @param tolerance: float, maximum distance between overlapping points
+    @param pairs: numpy.ndarray (M,2), result of find_overlapping if already calculated
+    @return int
+    '''
+    if pairs is None:
+        pairs = find_overlapping(points, tolerance)
+
+    return len(points) - len(np.unique(pairs[:, 1]))
+
+
+class KDTree(object):
+    '''
+    The class is a k-d tree of points built once and queried for many points at once.
+    It is a balanced tree stored in arrays, node n has children 2n+1 and 2n+2 
+    and every leaf holds a range of the sorted points.
+    A query walks all the query points down the tree together, level by level, 
+    and skips the nodes whose bounding box is further than the k-th nearest point found 
+    around the query point, so it doesn't loop over the points in Python
+    '''
+    def __init__(self, points, leaf_size=16):
+        '''
+        This is the constructor
+        @param points: float[3] list or numpy.ndarray (N,3)
+        @param leaf_size: int, minimum number of points in a leaf
+        '''
+        points = as_vectors(points)
+        if not len(points):
+            raise ValueError("KDTree needs at least one point")
+
+        self.points = points
+        self.depth = max(int(np.floor(np.log2(len(points) / leaf_size))), 0)
+
+        num_nodes = 2**(self.depth+1) - 1
+        self.first_leaf = 2**self.depth - 1
+        self.order = np.arange(len(points)) # tree order -> index of the point
+        self.starts = np.zeros(num_nodes, dtype=np.int64)
+        self.ends = np.zeros(num_nodes, dtype=np.int64)
+        self.mins = np.zeros((num_nodes, 3))
+        self.maxs = np.zeros((num_nodes, 3))
+        self.split_axes = np.zeros(num_nodes, dtype=np.int64)
+        self.split_values = np.zeros(num_nodes)
+
+        self.ends[0] = len(points)
+        for node in range(num_nodes):
+            start, end = self.starts[node], self.ends[node]
+            node_points = points[self.order[start:end]]
+            self.mins[node] = node_points.min(axis=0)
+            self.maxs[node] = node_points.max(axis=0)
+            if node >= self.first_leaf:
+                continue
+
+            axis = int(np.argmax(self.maxs[node] - self.mins[node]))
+            half = (end - start) // 2
+            part = np.argpartition(node_points[:, axis], half)
+            self.order[start:end] = self.order[start:end][part]
+            self.split_axes[node] = axis
+            self.split_values[node] = points[self.order[start+half], axis]
+            self.starts[2*node+1], self.ends[2*node+1] = start, start + half
+            self.starts[2*node+2], self.ends[2*node+2] = start + half, end
+
+        # the points of every leaf in a row padded with points in the infinity,
+        # so the distances to all the points of many leaves are calculated at once
+        leaf_starts = self.starts[self.first_leaf:]
+        leaf_counts = self.ends[self.first_leaf:] - leaf_starts
+        slots = np.arange(leaf_counts.max())
+        used = slots < leaf_counts[:, None]
+        self.leaf_indices = np.where(used, self.order[np.minimum(leaf_starts[:, None] + slots, 
+                                                                  len(points) - 1)], -1)
+        self.leaf_points = np.where(used[:, :, None], points[self.leaf_indices], np.inf)
+
+    def __len__(self):
+        return len(self.points)
+
+    def query(self, points, k=1, chunk_size=16384):
+        '''
+        This method finds the k nearest points of the tree for every query point
+        @param points: float[3] list or numpy.ndarray (M,3)
+        @param k: int, number of neighbours, at most the number of points in the tree
+        @param chunk_size: int, number of query points processed together, limits the memory
+        @return (numpy.ndarray, numpy.ndarray): distances (M,k) and point indices (M,k),
+                sorted from the nearest
+        '''
+        points = as_vectors(points)
+        if not 1 <= k <= len(self.points):
+            raise ValueError(f"k has to be between 1 and {len(self.points)}, got: {k}")
+
+        distances = np.empty((len(points), k))
+        indices = np.empty((len(points), k), dtype=np.int64)
+        for start in range(0, len(points), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            distances[chunk], indices[chunk] = self.__query(points[chunk], k)
+
+        return distances, indices
+
+    def __query(self, points, k):
+        '''
+        This method finds the k nearest points for a chunk of query points
+        '''
+        queries = np.arange(len(points))
+
+        # the leaf of every query point gives the first estimate of the search radius,
+        # leaves smaller than k are replaced by their parents until they are big enough
+        nodes = np.zeros(len(points), dtype=np.int64)
+        for _ in range(self.depth):
+            right = points[queries, self.split_axes[nodes]] >= self.split_values[nodes]
+            nodes = 2*nodes + 1 + right
+        small = self.ends[nodes] - self.starts[nodes] < k
+        while small.any():
+            nodes[small] = (nodes[small] - 1) // 2
+            small = self.ends[nodes] - self.starts[nodes] < k
+
+        pair_queries, tree_index = _expand_ranges(queries, self.starts[nodes], self.ends[nodes])
+        diff = self.points[self.order[tree_index]] - points[pair_queries]
+        dist_sq, _ = self.__k_smallest(len(points), pair_queries, 
+                                       np.einsum("ij,ij->i", diff, diff), tree_index, k)
+        radius_sq = dist_sq[:, -1]
+
+        # all the leaves closer than the radius
+        nodes = np.zeros(len(points), dtype=np.int64)
+        for _ in range(self.depth):
+            queries = np.repeat(queries, 2)
+            nodes = 2*np.repeat(nodes, 2) + 1 + np.tile((0, 1), len(nodes))
+            query_points = points[queries]
+            box = np.maximum(self.mins[nodes] - query_points, 0.0) + \
+                  np.maximum(query_points - self.maxs[nodes], 0.0)
+            close = np.einsum("ij,ij->i", box, box) <= radius_sq[queries]
+            queries = queries[close]
+            nodes = nodes[close]
+
+        # the k nearest points in every leaf and then the k nearest of those
+        leaves = nodes - self.first_leaf
+        diff = self.leaf_points[leaves] - points[queries, None]
+        dist_sq = np.einsum("ijk,ijk->ij", diff, diff)
+        leaf_k = min(k, dist_sq.shape[1])
+        nearest = np.argpartition(dist_sq, leaf_k-1, axis=1)[:, :leaf_k]
+        dist_sq = np.take_along_axis(dist_sq, nearest, axis=1)
+        indices = self.leaf_indices[leaves[:, None], nearest]
+
+        dist_sq, indices = self.__k_smallest(len(points), np.repeat(queries, leaf_k), 
+                                             dist_sq.ravel(), indices.ravel(), k)
+        return np.sqrt(dist_sq), indices
+
+    @staticmethod
+    def __k_smallest(num, queries, dist_sq, candidates, k):
+        '''
+        This method returns the k nearest candidates of every query point
+        @param num: int, number of query points
+        @param queries: numpy.ndarray (P,), query point of every candidate, sorted
+        @param dist_sq: numpy.ndarray (P,), squared distance of every candidate
+        @param candidates: numpy.ndarray (P,), index of every candidate
+        @param k: int, every query point has to have at least k candidates
+        @return (numpy.ndarray, numpy.ndarray): squared distances (num,k) and indices (num,k)
+        '''
+        # the candidates of every query point in a row padded with infinite distances
+        rank = np.arange(len(queries)) - np.searchsorted(queries, queries)
+        padded_dist = np.full((num, rank.max() + 1), np.inf)
+        padded_dist[queries, rank] = dist_sq
+        padded_index = np.full(padded_dist.shape, -1, dtype=np.int64)
+        padded_index[queries, rank] = candidates
+
+        if k < padded_dist.shape[1]:
+            nearest = np.argpartition(padded_dist, k-1, axis=1)[:, :k]
+            padded_dist = np.take_along_axis(padded_dist, nearest, axis=1)
+            padded_index = np.take_along_axis(padded_index, nearest, axis=1)
+        order = np.argsort(padded_dist, axis=1, kind="stable")
+
+        return (np.take_along_axis(padded_dist, order, axis=1), 
+                np.take_along_axis(padded_index, order, axis=1))
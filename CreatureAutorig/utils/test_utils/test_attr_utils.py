@@ -3,8 +3,46 @@ Created on 20. 4. 2024
 
 @author: mstolarz
 '''
+import time
 import unittest
+from utils import attr_utils
 from utils.attr_utils import get_flat_list, remap_input
+from utils import scene
+from utils.scene.fake_backend import FakeBackend
+
+
+def legacy_attr_spec(lock=["all"], not_lock=None):
+    '''
+    The function resolves the attributes the way lock_and_hide did before compile_attr_spec:
+    flatten, validate and remap both specs by looking up every token in ATTR_REMAP, 
+    subtract them and sort the result by the key index. Used as a reference
+    (None is taken as an empty spec, the old code rejected it)
+    '''
+    keys = list(attr_utils.ATTR_REMAP.keys())
+
+    def remap(input_list):
+        if "all" in input_list or "a" in input_list:
+            return keys
+        attrs = [key for key, values in attr_utils.ATTR_REMAP.items() 
+                 for item in input_list if item in values]
+        return sorted(set(attrs), key=keys.index)
+
+    resolved = []
+    for spec in (lock, not_lock):
+        input_list = get_flat_list(spec if spec is not None else [])
+        attr_utils.validate_input(input_list)
+        resolved.append(remap(input_list))
+
+    return sorted(set(resolved[0]) - set(resolved[1]), key=keys.index)
+
+
+def attr_specs():
+    '''
+    The function returns (lock, not_lock) specs covering every valid token
+    '''
+    tokens = attr_utils.VALID_INPUT
+    return ([([token], None) for token in tokens] + [(["all"], [token]) for token in tokens] 
+            + [(tokens, None), (["t", ("r", "s")], ["x", "v"])])
 
 
 class TestGetFlatList(unittest.TestCase):
@@ -65,6 +103,138 @@ class TestGetFlatList(unittest.TestCase):
         
         print ("Successfully ran test_remap_input")
 
+    def test_attr_mask(self):
+        for token in attr_utils.VALID_INPUT:
+            self.assertEqual(attr_utils.mask_attrs(attr_utils.attr_mask(token)), 
+                             tuple(remap_input([token])))
+        self.assertEqual(attr_utils.attr_mask(None), 0)
+        self.assertEqual(attr_utils.mask_attrs(attr_utils.lock_mask(["all"], ["t", "rx"])),
+                         ("rotateY", "rotateZ", "scaleX", "scaleY", "scaleZ", "visibility"))
+        self.assertEqual(attr_utils.mask_attrs(attr_utils.lock_mask("y", [["ty"]])),
+                         ("rotateY", "scaleY"))
+        self.assertRaises(ValueError, attr_utils.attr_mask, ["t", "translateW"])
+
+        print ("Successfully ran test_attr_mask")
+
+    def test_compile_attr_spec(self):
+        for token in attr_utils.VALID_INPUT:
+            self.assertEqual(attr_utils.compile_attr_spec(token), tuple(remap_input([token])))
+        self.assertEqual(attr_utils.compile_attr_spec(["r", "x"], "rx"), 
+                         ("translateX", "rotateY", "rotateZ", "scaleX"))
+        self.assertRaises(ValueError, attr_utils.compile_attr_spec, ["all"], ["tw"])
+
+        # the same tokens in a different order and nesting share the cache entry
+        attr_utils.compile_attr_spec(["t", ("s", "v")], None)
+        hits = attr_utils._compile_attr_spec.cache_info().hits
+        result = attr_utils.compile_attr_spec(["v", "s", "t", "t"])
+        self.assertEqual(attr_utils._compile_attr_spec.cache_info().hits, hits + 1)
+        self.assertEqual(result, tuple(remap_input(["t", "s", "v"])))
+
+        for lock, not_lock in attr_specs():
+            self.assertEqual(list(attr_utils.compile_attr_spec(lock, not_lock)), 
+                             legacy_attr_spec(lock, not_lock))
+
+        print ("Successfully ran test_compile_attr_spec")
+
+
+class TestLockAndHide(unittest.TestCase):
+    def setUp(self):
+        self.previous_backend = scene.set_backend(FakeBackend())
+        self.nodes = [scene.create_node("transform", name=f"ctrl{i}") for i in range(3)]
+
+    def tearDown(self):
+        scene.set_backend(self.previous_backend)
+
+    def test_lock_and_hide(self):
+        # not_lock is optional
+        attr_utils.lock_and_hide(self.nodes[0])
+        for attr in attr_utils.ATTR_REMAP:
+            self.assertEqual(self.nodes[0].attr_state(attr), (True, False, False))
+
+        attr_utils.lock_and_hide(self.nodes[1], ["t", "s"], ["tx"])
+        self.assertEqual(self.nodes[1].attr_state("translateX"), (False, True, False))
+        self.assertEqual(self.nodes[1].attr_state("scaleZ"), (True, False, False))
+        self.assertRaises(ValueError, attr_utils.lock_and_hide, "missing")
+
+        print ("Successfully ran test_lock_and_hide")
+
+    def test_lock_and_hide_many(self):
+        attr_utils.lock_and_hide_many(self.nodes, ["all"], ["r", "v"])
+        for node in self.nodes:
+            for attr in attr_utils.ATTR_REMAP:
+                locked = attr.startswith(("translate", "scale"))
+                self.assertEqual(node.attr_state(attr), (locked, not locked, False))
+
+        with self.assertRaisesRegex(ValueError, "missing"):
+            attr_utils.lock_and_hide_many(self.nodes + ["missing"])
+        self.assertRaises(ValueError, attr_utils.lock_and_hide_many, [])
+        # invalid attributes are reported and nothing is changed
+        attr_utils.lock_and_hide_many(self.nodes, ["rotate", "spin"])
+        self.assertEqual(self.nodes[0].attr_state("rotateX"), (False, True, False))
+
+        print ("Successfully ran test_lock_and_hide_many")
+
+
+def benchmark_compile_attr_spec(iterations=1000):
+    '''
+    The function resolves lock_and_hide specs covering every valid token 
+    the way it was done before compile_attr_spec and with the cached compile_attr_spec
+    and compares the times
+    @param iterations: int, how many times all the specs are resolved
+    @return (float, float): time in seconds for the old pipeline and compile_attr_spec
+    '''
+    specs = attr_specs()
+
+    results = []
+    for resolve_function in (legacy_attr_spec, attr_utils.compile_attr_spec):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for lock, not_lock in specs:
+                resolve_function(lock, not_lock)
+        results.append(time.perf_counter() - start)
+
+    print (f"{iterations}x{len(specs)} specs - validate/remap/sort: {results[0]:.3f}s, "
+           f"compile_attr_spec: {results[1]:.3f}s")
+    return tuple(results)
+
+
+def benchmark_lock_and_hide(count=500):
+    '''
+    The function locks and hides the attributes of many transforms one by one 
+    and with lock_and_hide_many and compares the times with the undo queue on 
+    (interactive use) and off (batch builds)
+    @param count: int, number of transforms
+    @return dict: undo queue state -> (float, float), time in seconds for the single calls 
+            and the batch
+    '''
+    from maya import cmds
+
+    undo_state = cmds.undoInfo(query=True, state=True)
+    results = {}
+    try:
+        for state in (True, False):
+            cmds.undoInfo(stateWithoutFlush=state)
+            grps = [scene.create_node("transform", name="lockBenchmark") for _ in range(count)]
+
+            start = time.perf_counter()
+            for grp in grps:
+                attr_utils.lock_and_hide(grp, ["all"], ["t", "r"])
+            single_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            attr_utils.lock_and_hide_many(grps, ["all"], ["t", "r"])
+            batch_time = time.perf_counter() - start
+            scene.delete(*grps)
+
+            results[state] = (single_time, batch_time)
+            scene.display_info(f"{count} transforms, undo {'on' if state else 'off'} - "
+                               f"single: {single_time:.3f}s, batch: {batch_time:.3f}s")
+    finally:
+        cmds.undoInfo(stateWithoutFlush=undo_state)
+
+    return results
+
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
\ No newline at end of file
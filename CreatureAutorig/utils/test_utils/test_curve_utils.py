@@ -0,0 +1,74 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import unittest
+import numpy as np
+from utils import curve_utils
+
+
+class TestCurveUtils(unittest.TestCase):
+    def test_resample(self):
+        points = [(0, 0, 0), (2, 0, 0), (2, 0, 0), (2, 3, 0)]
+        np.testing.assert_allclose(curve_utils.arc_length_table(points), [0, 2, 2, 5])
+
+        positions = curve_utils.resample(points, 6)
+        np.testing.assert_allclose(positions, [(0, 0, 0), (1, 0, 0), (2, 0, 0), (2, 1, 0),
+                                               (2, 2, 0), (2, 3, 0)], atol=1e-12)
+
+        positions = curve_utils.resample(points, 3, distribution=[0.0, 0.2, 1.0])
+        np.testing.assert_allclose(positions[1], (1, 0, 0))
+        self.assertRaises(ValueError, curve_utils.arc_length_table, [(1, 1, 1), (1, 1, 1)])
+
+        print ("Successfully ran test_resample")
+
+    def test_distribute(self):
+        np.testing.assert_allclose(curve_utils.distribute(3), [0, 0.5, 1])
+        np.testing.assert_allclose(curve_utils.distribute(3, "ease_in"), [0, 0.25, 1])
+        np.testing.assert_allclose(curve_utils.distribute(3, "ease_out"), [0, 0.75, 1])
+        ease = curve_utils.distribute(5, "ease_in_out")
+        np.testing.assert_allclose(ease, 1 - ease[::-1])
+        self.assertLess(ease[1], 0.25)
+        np.testing.assert_allclose(curve_utils.distribute(3, np.sqrt), [0, np.sqrt(0.5), 1])
+
+        self.assertRaises(ValueError, curve_utils.distribute, 3, "bounce")
+        self.assertRaises(ValueError, curve_utils.distribute, 3, [0, 0.8, 0.5])
+        self.assertRaises(ValueError, curve_utils.distribute, 1)
+
+        print ("Successfully ran test_distribute")
+
+    def test_catmull_rom(self):
+        points = np.array([(0, 0, 0), (1, 1, 0), (2, 0, 0), (3, 1, 0)], dtype=float)
+        smooth = curve_utils.catmull_rom(points, samples=4)
+        self.assertEqual(len(smooth), 13)
+        # the spline goes through all the points
+        np.testing.assert_allclose(smooth[::4], points, atol=1e-12)
+
+        print ("Successfully ran test_catmull_rom")
+
+    def test_parallel_transport(self):
+        # a helix, the frames turn with the curve but don't twist around it
+        angles = np.linspace(0, 4*np.pi, 400)
+        tangents = np.stack([-np.sin(angles), np.cos(angles), np.full_like(angles, 0.5)], axis=1)
+        ups = curve_utils.parallel_transport(tangents, up_vec=(0, 0, 1))
+
+        tangents /= np.linalg.norm(tangents, axis=1, keepdims=True)
+        np.testing.assert_allclose(np.einsum("ij,ij->i", ups, tangents), 0, atol=1e-12)
+        np.testing.assert_allclose(np.linalg.norm(ups, axis=1), 1)
+        # consecutive up vectors only change as much as the tangents do
+        up_turn = np.arccos(np.clip(np.einsum("ij,ij->i", ups[1:], ups[:-1]), -1, 1))
+        tangent_turn = np.arccos(np.clip(np.einsum("ij,ij->i", tangents[1:], tangents[:-1]),
+                                         -1, 1))
+        self.assertTrue(np.all(up_turn <= tangent_turn + 1e-9))
+
+        ups = curve_utils.parallel_transport([(1, 0, 0), (1, 0, 0)])
+        np.testing.assert_allclose(ups, [(0, 1, 0), (0, 1, 0)])
+        self.assertRaises(ValueError, curve_utils.parallel_transport, [(1, 0, 0)], (2, 0, 0))
+
+        print ("Successfully ran test_parallel_transport")
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,79 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import unittest
+import numpy as np
+from utils import geo_utils
+
+
+class TestFitPoints(unittest.TestCase):
+    def test_coplanar(self):
+        points = [(0, 0, 0), (0, 2, 0), (1, 3, 0), (3, 3, 0), (5, 1, 0)]
+        coplanar, fit = geo_utils.check_coplanar(points)
+        self.assertTrue(coplanar)
+        self.assertEqual(fit.rank, 2)
+        # same direction as (p2-p0) ^ (p1-p0)
+        np.testing.assert_allclose(fit.normal, [0, 0, 1], atol=1e-12)
+        np.testing.assert_allclose(fit.plane_deviations, 0, atol=1e-12)
+
+        coplanar, fit = geo_utils.check_coplanar(points + [(1, 1, 0.1)])
+        self.assertFalse(coplanar)
+        self.assertEqual(fit.rank, 3)
+        self.assertEqual(np.argmax(np.abs(fit.plane_deviations)), 5)
+
+        coplanar, fit = geo_utils.check_coplanar(points + [(1, 1, 0.1)], tolerance=0.1)
+        self.assertTrue(coplanar)
+
+        print ("Successfully ran test_coplanar")
+
+    def test_collinear(self):
+        points = np.array([(1, 1, 1), (2, 3, 4), (3, 5, 7), (3, 5, 7), (10, 19, 28)], dtype=float)
+        collinear, fit = geo_utils.check_collinear(points)
+        self.assertTrue(collinear)
+        self.assertEqual(fit.rank, 1)
+        self.assertIsNone(fit.normal)
+        np.testing.assert_allclose(fit.direction, np.array([1, 2, 3])/np.sqrt(14))
+
+        points[2] += (0.0, 0.0, 0.001)
+        collinear, fit = geo_utils.check_collinear(points)
+        self.assertFalse(collinear)
+        self.assertEqual(np.argmax(fit.line_deviations), 2)
+
+        _, fit = geo_utils.check_collinear([(1, 1, 1), (1, 1, 1)])
+        self.assertEqual(fit.rank, 0)
+        self.assertIsNone(fit.direction)
+
+        print ("Successfully ran test_collinear")
+
+    def test_many_points(self):
+        rng = np.random.default_rng(1)
+        points = rng.uniform(-10, 10, size=(5000, 3))
+        points[:, 2] = 0.5*points[:, 0] - 0.25*points[:, 1] + 3.0
+        coplanar, fit = geo_utils.check_coplanar(points, tolerance=1e-9)
+        self.assertTrue(coplanar)
+        normal = np.array([0.5, -0.25, -1.0])
+        normal /= np.linalg.norm(normal)
+        self.assertAlmostEqual(abs(fit.normal @ normal), 1.0)
+
+        print ("Successfully ran test_many_points")
+
+    def test_project_to_plane(self):
+        # the noise is orthogonal to a tilt, so the best-fit plane is z = 0
+        points = np.array([(0, 0, 0.05), (2, 0, -0.05), (0, 2, -0.05), (2, 2, 0.05)])
+        projected, max_deviation = geo_utils.project_to_plane(points)
+        np.testing.assert_allclose(projected[:, 2], 0, atol=1e-12)
+        np.testing.assert_allclose(projected[:, :2], points[:, :2], atol=1e-12)
+        self.assertAlmostEqual(max_deviation, 0.05)
+
+        coplanar, fit = geo_utils.check_coplanar(projected)
+        self.assertTrue(coplanar)
+        self.assertRaises(ValueError, geo_utils.project_to_plane, [(0, 0, 0), (1, 1, 1)])
+
+        print ("Successfully ran test_project_to_plane")
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,89 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import unittest
+import numpy as np
+from utils import mirror_utils
+from utils import name_utils
+from utils import orient_utils
+from utils import scene
+from utils.scene.fake_backend import FakeBackend
+
+
+class TestMirrorUtils(unittest.TestCase):
+    def setUp(self):
+        self.previous_backend = scene.set_backend(FakeBackend())
+
+    def tearDown(self):
+        scene.set_backend(self.previous_backend)
+
+    def test_reflection(self):
+        self.assertTrue(np.allclose(mirror_utils.reflection("x"), np.diag([-1, 1, 1])))
+        self.assertTrue(np.allclose(mirror_utils.reflection("z"), np.diag([1, 1, -1])))
+        self.assertRaises(ValueError, mirror_utils.reflection, "w")
+
+        points = mirror_utils.mirror_positions([(1, 2, 3), (-4, 5, 6)], "x")
+        self.assertTrue(np.allclose(points, [(-1, 2, 3), (4, 5, 6)]))
+
+        print ("Successfully ran test_reflection")
+
+    def test_mirror_frames(self):
+        rng = np.random.default_rng(3)
+        frames = orient_utils.normalize(rng.normal(size=(20, 3, 3)))
+        frames = np.array([np.linalg.qr(f)[0] for f in frames])
+        frames[np.linalg.det(frames) < 0] *= -1
+        reflection = mirror_utils.reflection("x")
+
+        behavior = mirror_utils.mirror_frames(frames, "x", "behavior")
+        self.assertTrue(np.allclose(np.linalg.det(behavior), 1.0))
+        # every axis is the reflected axis pointing the opposite way
+        self.assertTrue(np.allclose(behavior, -(frames @ reflection)))
+        # mirroring twice gives the original frames
+        self.assertTrue(np.allclose(mirror_utils.mirror_frames(behavior, "x"), frames))
+
+        orientation = mirror_utils.mirror_frames(frames, "x", "orientation")
+        self.assertTrue(np.allclose(orientation, frames))
+        self.assertRaises(ValueError, mirror_utils.mirror_frames, frames, "x", "scale")
+
+        matrices = np.tile(np.identity(4), (20, 1, 1))
+        matrices[:, :3, :3] = frames
+        matrices[:, 3, :3] = rng.normal(size=(20, 3))
+        mirrored = mirror_utils.mirror_matrices(matrices, "x")
+        self.assertTrue(np.allclose(mirrored[:, :3, :3], behavior))
+        self.assertTrue(np.allclose(mirrored[:, 3, :3], matrices[:, 3, :3] @ reflection))
+
+        # the local points mapped by local_mirror end up at the reflected world positions
+        local = mirror_utils.local_mirror(matrices[0], mirrored[0], "x")
+        points = rng.normal(size=(8, 3))
+        world = points @ matrices[0][:3, :3] + matrices[0][3, :3]
+        mirrored_world = (points @ local) @ mirrored[0][:3, :3] + mirrored[0][3, :3]
+        self.assertTrue(np.allclose(mirrored_world, world @ reflection))
+
+        print ("Successfully ran test_mirror_frames")
+
+    def test_mirror_names(self):
+        self.assertEqual(name_utils.mirror_side("L"), "R")
+        self.assertEqual(name_utils.mirror_side("M"), "M")
+        self.assertRaises(ValueError, name_utils.mirror_side, "X")
+        self.assertEqual(name_utils.mirror_name("arm_L_ctrl_01"), "arm_R_ctrl_01")
+        self.assertEqual(name_utils.mirror_name("R_R_jnt"), "R_L_jnt")
+        self.assertEqual(name_utils.mirror_name("rig"), "rig")
+
+        parent_l = scene.create_node("transform", name="arm_L_grp")
+        parent_r = scene.create_node("transform", name="arm_R_grp")
+        parent_m = scene.create_node("transform", name="spine_M_grp")
+        child = scene.create_node("transform", name="hand_L_grp", parent=parent_l)
+        self.assertEqual(mirror_utils.mirror_parent(child), parent_r)
+        child.set_parent(parent_m)
+        self.assertEqual(mirror_utils.mirror_parent(child), parent_m)
+        child.set_parent(None)
+        self.assertIsNone(mirror_utils.mirror_parent(child))
+
+        print ("Successfully ran test_mirror_names")
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
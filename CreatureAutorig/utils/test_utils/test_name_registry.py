@@ -0,0 +1,103 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import time
+import unittest
+from utils.name_registry import NameRegistry
+
+
+class TestNameRegistry(unittest.TestCase):
+    def test_split_name(self):
+        self.assertEqual(NameRegistry.split_name("spine_M_jnt_03"), ("spine_M_jnt", 3))
+        self.assertEqual(NameRegistry.split_name("spine_M_jnt"), ("spine_M_jnt", None))
+        self.assertEqual(NameRegistry.split_name("12"), ("", 12))
+
+        print ("Successfully ran test_split_name")
+
+    def test_unique_name(self):
+        registry = NameRegistry(["foot_L_ctrl", "foot_L_ctrl_01", "|grp|hand_L_ctrl"])
+        self.assertTrue(registry.exists("hand_L_ctrl"))
+        self.assertEqual(registry.unique_name("foot_L_ctrl"), "foot_L_ctrl_02")
+        self.assertEqual(registry.unique_name("foot_L_ctrl"), "foot_L_ctrl_03")
+        self.assertEqual(registry.unique_name("foot_R_ctrl"), "foot_R_ctrl")
+        self.assertEqual(registry.unique_name("foot_R_ctrl"), "foot_R_ctrl_01")
+        self.assertEqual(registry.unique_name("tail_M_jnt_05"), "tail_M_jnt_05")
+        self.assertEqual(registry.unique_name("tail_M_jnt_05"), "tail_M_jnt_06")
+        self.assertEqual(registry.unique_name("tail_M_jnt_01"), "tail_M_jnt_01")
+        self.assertEqual(registry.unique_name("tail_M_jnt_01"), "tail_M_jnt_02")
+
+        print ("Successfully ran test_unique_name")
+
+    def test_release(self):
+        registry = NameRegistry()
+        names = [registry.unique_name("ear_L_jnt_01") for _ in range(5)]
+        self.assertEqual(names[-1], "ear_L_jnt_05")
+        registry.release("ear_L_jnt_02")
+        self.assertFalse(registry.exists("ear_L_jnt_02"))
+        self.assertEqual(registry.unique_name("ear_L_jnt_01"), "ear_L_jnt_02")
+        self.assertEqual(registry.unique_name("ear_L_jnt_01"), "ear_L_jnt_06")
+
+        print ("Successfully ran test_release")
+
+    def test_padding(self):
+        registry = NameRegistry(["feather_L_jnt_1"], padding=3)
+        self.assertTrue(registry.exists("feather_L_jnt_001"))
+        self.assertEqual(registry.unique_name("feather_L_jnt_001"), "feather_L_jnt_002")
+        for _ in range(120):
+            name = registry.unique_name("feather_L_jnt")
+        self.assertEqual(name, "feather_L_jnt_121")
+
+        print ("Successfully ran test_padding")
+
+    def test_reserve_block(self):
+        registry = NameRegistry(["tail_M_jnt_01", "tail_M_jnt_04"])
+        self.assertEqual(registry.reserve_block("tail_M_jnt", 3), 5)
+        self.assertEqual(registry.reserve_block("tail_M_jnt", 1), 2)
+        self.assertEqual(registry.reserve_block("tail_M_jnt", 2), 8)
+        self.assertEqual(registry.reserve_block("neck_M_jnt", 4, start=3), 3)
+        self.assertTrue(registry.exists("neck_M_jnt_06"))
+        self.assertEqual(registry.unique_name("tail_M_jnt"), "tail_M_jnt")
+        self.assertEqual(registry.unique_name("tail_M_jnt"), "tail_M_jnt_03")
+        with self.assertRaises(ValueError):
+            registry.reserve_block("tail_M_jnt", 0)
+
+        print ("Successfully ran test_reserve_block")
+
+
+def benchmark_unique_names(count=2000):
+    '''
+    The function compares the registry with checking every candidate name
+    against a snapshot of the scene, which is what the scene-query loop does
+    @param count: int, how many names with the same prefix should be generated
+    @return dict: time in seconds for each approach
+    '''
+    existing = set()
+    start = time.perf_counter()
+    for _ in range(count):
+        name = "tail_M_jnt"
+        i = 1
+        while name in existing:
+            res = name.split("_")
+            if res[-1].isnumeric():
+                name = "_".join(res[:-1]+[str(int(res[-1])+1).zfill(2)])
+            else:
+                name = name + "_" + str(i).zfill(2)
+            i += 1
+        existing.add(name)
+    loop_time = time.perf_counter() - start
+
+    registry = NameRegistry()
+    start = time.perf_counter()
+    for _ in range(count):
+        registry.unique_name("tail_M_jnt")
+    registry_time = time.perf_counter() - start
+
+    print (f"{count} names - loop: {loop_time:.4f}s, registry: {registry_time:.4f}s")
+    return {"loop": loop_time, "registry": registry_time}
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,125 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import itertools
+import unittest
+import numpy as np
+from utils import orient_utils
+
+
+AXIS_COMBINATIONS = [(aim, twist) for aim, twist in 
+                     itertools.product(orient_utils.VALID_AXES, repeat=2) 
+                     if aim[1] != twist[1]]
+
+
+class TestOrientUtils(unittest.TestCase):
+    def test_orient_frames(self):
+        aim_vec = np.array([1.0, 2.0, 0.5])
+        twist_vec = np.array([-2.0, 1.0, 0.0])
+        aim_vec /= np.linalg.norm(aim_vec)
+        twist_vec /= np.linalg.norm(twist_vec)
+
+        self.assertEqual(len(AXIS_COMBINATIONS), 24)
+        for aim_axis, twist_axis in AXIS_COMBINATIONS:
+            frame = orient_utils.orient_frames(aim_vec, twist_vec, aim_axis, twist_axis)[0]
+            aim_sign = -1.0 if aim_axis[0] == "-" else 1.0
+            twist_sign = -1.0 if twist_axis[0] == "-" else 1.0
+            np.testing.assert_allclose(frame[orient_utils.AXIS_INDEX[aim_axis[1]]], 
+                                       aim_vec*aim_sign, atol=1e-12)
+            np.testing.assert_allclose(frame[orient_utils.AXIS_INDEX[twist_axis[1]]], 
+                                       twist_vec*twist_sign, atol=1e-12)
+            np.testing.assert_allclose(frame @ frame.T, np.identity(3), atol=1e-12)
+            self.assertAlmostEqual(np.linalg.det(frame), 1.0)
+
+        print ("Successfully ran test_orient_frames")
+
+    def test_invalid_axes(self):
+        with self.assertRaises(ValueError):
+            orient_utils.orient_frames([1, 0, 0], [0, 1, 0], "+x", "-x")
+        with self.assertRaises(ValueError):
+            orient_utils.orient_frames([1, 0, 0], [0, 1, 0], "x", "+y")
+        with self.assertRaises(ValueError):
+            orient_utils.orient_frames([1, 0, 0], [2, 0, 0], "+x", "+y")
+
+        print ("Successfully ran test_invalid_axes")
+
+    def test_euler(self):
+        np.testing.assert_allclose(orient_utils.euler_to_matrix([0, 0, 90])[0],
+                                   [[0, 1, 0], [-1, 0, 0], [0, 0, 1]], atol=1e-12)
+        np.testing.assert_allclose(orient_utils.euler_to_matrix([0, -90, 0])[0],
+                                   [[0, 0, 1], [0, 1, 0], [-1, 0, 0]], atol=1e-12)
+
+        rng = np.random.default_rng(0)
+        eulers = rng.uniform([-180, -89, -180], [180, 89, 180], size=(200, 3))
+        np.testing.assert_allclose(orient_utils.matrix_to_euler(
+                                   orient_utils.euler_to_matrix(eulers)), eulers, atol=1e-9)
+
+        # gimbal lock still has to give back the same matrix
+        gimbal = np.array([[30.0, 90.0, 0.0], [-45.0, -90.0, 20.0]])
+        matrices = orient_utils.euler_to_matrix(gimbal)
+        np.testing.assert_allclose(orient_utils.euler_to_matrix(
+                                   orient_utils.matrix_to_euler(matrices)), matrices, atol=1e-9)
+
+        # every rotate order rotates around its first axis first
+        eulers = rng.uniform(-80, 80, size=(50, 3))
+        single_axes = [orient_utils.euler_to_matrix(eulers * np.identity(3)[i]) for i in range(3)]
+        for i, rotate_order in enumerate(orient_utils.ROTATE_ORDERS):
+            first, second, third = (single_axes["xyz".index(axis)] for axis in rotate_order)
+            matrices = orient_utils.euler_to_matrix(eulers, rotate_order)
+            np.testing.assert_allclose(matrices, first @ second @ third, atol=1e-12)
+            np.testing.assert_allclose(orient_utils.euler_to_matrix(eulers, i), matrices)
+            np.testing.assert_allclose(orient_utils.matrix_to_euler(matrices, i), eulers, atol=1e-9)
+        self.assertRaises(ValueError, orient_utils.euler_to_matrix, eulers, "xxy")
+
+        print ("Successfully ran test_euler")
+
+    def test_chain_orients(self):
+        positions = [(0, 0, 0), (0, 2, 0), (1, 3, 0), (3, 3, 0)]
+        orients = orient_utils.planar_chain_orients(positions, "+x", "+z", 
+                                                    normal=(0, 0, 1))
+        np.testing.assert_allclose(orients, [[0, 0, 90], [0, 0, 45], [0, 0, 0], [0, 0, 0]], 
+                                   atol=1e-9)
+        orients = orient_utils.planar_chain_orients(positions, "+x", "+z", 
+                                                    normal=(0, 0, 1), count=3)
+        self.assertEqual(orients.shape, (3, 3))
+
+        orients = orient_utils.linear_chain_orients([(0, 0, 0), (0, 0, 5), (0, 0, 9)], 
+                                                    "+y", "-x", twist_vec=(1, 0, 0))
+        np.testing.assert_allclose(orient_utils.euler_to_matrix(orients), 
+                                   [[[-1, 0, 0], [0, 0, 1], [0, 1, 0]]]*3, atol=1e-9)
+        with self.assertRaises(ValueError):
+            orient_utils.linear_chain_orients([(0, 0, 0), (0, 0, 0)], twist_vec=(0, 1, 0))
+
+        print ("Successfully ran test_chain_orients")
+
+    def test_chain_local_transforms(self):
+        positions = np.array([(1, 0, 0), (1, 2, 0), (2, 3, 0), (4, 3, 1)])
+        orients = np.array([(0, 0, 90), (0, 0, 45), (10, -20, 30), (0, 0, 0)])
+        quats = orient_utils.euler_to_quat(orients)
+        translates, local_orients = orient_utils.chain_local_transforms(positions, quats)
+
+        np.testing.assert_allclose(translates[:2], [(1, 0, 0), (2, 0, 0)], atol=1e-9)
+        np.testing.assert_allclose(local_orients[:2], [(0, 0, 90), (0, 0, -45)], atol=1e-9)
+
+        # rebuild the world matrices by walking down the chain
+        world = np.identity(4)
+        for pos, ori, trans, local in zip(positions, orients, translates, local_orients):
+            matrix = np.identity(4)
+            matrix[:3, :3] = orient_utils.euler_to_matrix(local)[0]
+            matrix[3, :3] = trans
+            world = matrix @ world
+            np.testing.assert_allclose(world[3, :3], pos, atol=1e-9)
+            np.testing.assert_allclose(world[:3, :3], orient_utils.euler_to_matrix(ori)[0],
+                                       atol=1e-9)
+
+        with self.assertRaises(ValueError):
+            orient_utils.chain_local_transforms(positions, quats[:2])
+
+        print ("Successfully ran test_chain_local_transforms")
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
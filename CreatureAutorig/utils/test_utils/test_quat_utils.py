@@ -0,0 +1,66 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import unittest
+import numpy as np
+from utils import quat_utils
+from utils import orient_utils
+
+
+class TestQuatUtils(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.eulers = rng.uniform(-180, 180, size=(200, 3))
+        self.matrices = orient_utils.euler_to_matrix(self.eulers)
+
+    def test_matrix_round_trip(self):
+        quats = quat_utils.from_matrix(self.matrices)
+        np.testing.assert_allclose(np.linalg.norm(quats, axis=1), 1.0)
+        self.assertTrue(np.all(quats[:, 3] >= 0))
+        np.testing.assert_allclose(quat_utils.to_matrix(quats), self.matrices, atol=1e-12)
+
+        # 180 degree turns are where the naive formula divides by zero
+        half_turns = quat_utils.from_axis_angle(np.identity(3), 180)
+        matrices = quat_utils.to_matrix(half_turns)
+        np.testing.assert_allclose(quat_utils.to_matrix(quat_utils.from_matrix(matrices)),
+                                   matrices, atol=1e-12)
+        np.testing.assert_allclose(matrices[2], np.diag([-1, -1, 1]), atol=1e-12)
+
+        print ("Successfully ran test_matrix_round_trip")
+
+    def test_multiply(self):
+        quats = quat_utils.from_matrix(self.matrices)
+        first, second = quats[:100], quats[100:]
+        np.testing.assert_allclose(quat_utils.to_matrix(quat_utils.multiply(first, second)),
+                                   self.matrices[:100] @ self.matrices[100:], atol=1e-12)
+
+        identity = quat_utils.multiply(quats, quat_utils.conjugate(quats))
+        np.testing.assert_allclose(quat_utils.normalize(identity),
+                                   np.tile(quat_utils.IDENTITY, (200, 1)), atol=1e-12)
+
+        # row vectors: rotating X by 90 degrees around Z gives Y
+        rot_z = quat_utils.from_axis_angle((0, 0, 1), 90)
+        np.testing.assert_allclose(quat_utils.rotate((1, 0, 0), rot_z), [[0, 1, 0]], atol=1e-12)
+        np.testing.assert_allclose(rot_z, orient_utils.euler_to_quat((0, 0, 90)), atol=1e-12)
+
+        print ("Successfully ran test_multiply")
+
+    def test_euler(self):
+        quats = orient_utils.euler_to_quat(self.eulers)
+        # euler angles aren't unique, compare the rotations they describe
+        np.testing.assert_allclose(orient_utils.euler_to_matrix(orient_utils.quat_to_euler(quats)),
+                                   self.matrices, atol=1e-9)
+
+        angles = quat_utils.angle_between(quats, quat_utils.multiply(
+                                          quats, quat_utils.from_axis_angle((1, 0, 0), 30)))
+        np.testing.assert_allclose(angles, 30.0)
+        self.assertRaises(ValueError, quat_utils.normalize, (0, 0, 0, 0))
+
+        print ("Successfully ran test_euler")
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
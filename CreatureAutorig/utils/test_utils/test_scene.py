@@ -0,0 +1,142 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import unittest
+import numpy as np
+from utils import scene
+from utils import xform_utils
+from utils import attr_utils
+from utils import orient_utils
+from utils.scene.fake_backend import FakeBackend
+
+
+class TestFakeBackend(unittest.TestCase):
+    def setUp(self):
+        self.previous_backend = scene.set_backend(FakeBackend())
+
+    def tearDown(self):
+        scene.set_backend(self.previous_backend)
+
+    def test_nodes(self):
+        grp = scene.create_node("transform", name="arm_L_grp")
+        jnt = scene.create_node("joint", name="arm_L_jnt", parent=grp)
+        same = scene.create_node("transform", name="arm_L_grp")
+
+        self.assertEqual(same.name(), "arm_L_grp1")
+        self.assertEqual(jnt.path(), "|arm_L_grp|arm_L_jnt")
+        self.assertEqual(jnt.parent(), grp)
+        self.assertEqual(grp.children(), [jnt])
+        self.assertEqual(scene.node("arm_L_jnt"), jnt)
+        self.assertEqual(scene.list_names("arm_*_grp*"), ["arm_L_grp", "arm_L_grp1"])
+        self.assertTrue(jnt.is_transform())
+
+        scene.delete(grp)
+        self.assertFalse(jnt.exists())
+        self.assertFalse(scene.exists("arm_L_jnt"))
+        self.assertRaises(ValueError, scene.node, "arm_L_jnt")
+
+        print ("Successfully ran test_nodes")
+
+    def test_attrs(self):
+        node = scene.create_node("transform", name="box")
+        node.set_attr("translate", (1, 2, 3))
+        node.set_attr("rotateY", 45)
+        self.assertEqual(node.get_attr("translate"), (1.0, 2.0, 3.0))
+        self.assertEqual(node.get_attr("translateZ"), 3.0)
+        self.assertEqual(node.get_attr("rotate"), (0.0, 45.0, 0.0))
+        self.assertEqual(node.attr_state("translateX"), (False, True, False))
+
+        node.set_attr_state("translateX", locked=True, keyable=False)
+        self.assertEqual(node.attr_state("translateX"), (True, False, False))
+        self.assertRaises(RuntimeError, node.set_attr, "translateX", 1)
+        self.assertRaises(ValueError, node.get_attr, "notAnAttr")
+
+        print ("Successfully ran test_attrs")
+
+    def test_matrices(self):
+        parent = scene.create_node("transform", name="parent")
+        parent.set_attr("translate", (0, 5, 0))
+        parent.set_attr("rotate", (0, 90, 0))
+        jnt = scene.create_node("joint", name="child")
+        jnt.set_attr("translate", (1, 0, 0))
+        jnt.set_attr("jointOrient", (0, 0, 30))
+        world = jnt.world_matrix()
+
+        jnt.set_parent(parent)
+        self.assertTrue(np.allclose(jnt.world_matrix(), world))
+        self.assertEqual(jnt.get_attr("jointOrient"), (0.0, 0.0, 30.0))
+        self.assertTrue(np.allclose(jnt.get_attr("translate"), (0, -5, 1)))
+
+        expected = orient_utils.euler_to_matrix((0, 0, 30))[0]
+        self.assertTrue(np.allclose(jnt.world_matrix()[:3, :3], expected))
+
+        print ("Successfully ran test_matrices")
+
+    def test_curves(self):
+        points = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 0)]
+        shape = scene.create_curve(points, [0, 1, 2, 3, 4], 1, name="squareShape")
+        self.assertEqual(shape.parent().name(), "nurbsCurve1")
+
+        degree, periodic, cvs, knots = scene.curve_data(shape)
+        self.assertEqual((degree, periodic, knots), (1, False, [0, 1, 2, 3, 4]))
+        self.assertTrue(np.allclose(cvs, points))
+
+        self.assertRaises(ValueError, scene.create_curve, points, [0, 1], 1)
+
+        print ("Successfully ran test_curves")
+
+    def test_joints(self):
+        grp = scene.create_node("transform", name="rig_grp")
+        names = ["a_jnt", "b_jnt", "c_jnt", "d_jnt"]
+        translates = np.array([(1, 0, 0), (2, 0, 0), (0, 3, 0), (0, 0, 4)], dtype=float)
+        orients = np.zeros((4, 3))
+        with scene.undo_chunk("joints"):
+            joints = scene.create_joints(names, translates, orients, [grp, 0, None, 2])
+
+        self.assertEqual([jnt.parent() for jnt in joints], [grp, joints[0], None, joints[2]])
+        self.assertTrue(np.allclose(joints[1].world_matrix()[3, :3], (3, 0, 0)))
+        self.assertEqual(scene.get_backend().undo_steps, ["joints"])
+
+        chain = scene.create_chain(["e_jnt", "f_jnt"], translates[:2], orients[:2])
+        self.assertEqual(chain[1].parent(), chain[0])
+        self.assertRaises(ValueError, scene.create_joints, ["g_jnt"], translates[:1], 
+                          orients[:1], [0])
+
+        print ("Successfully ran test_joints")
+
+    def test_zero(self):
+        parent = scene.create_node("transform", name="root_M_grp")
+        parent.set_attr("translate", (0, 1, 0))
+        ctrl = scene.create_node("transform", name="hand_L_ctrl", parent=parent)
+        ctrl.set_attr("translate", (2, 0, 0))
+        ctrl.set_attr("rotate", (10, 20, 30))
+        world = ctrl.world_matrix()
+
+        grp = xform_utils.zero(ctrl)
+        self.assertEqual(grp.name(), "handZero_L_grp")
+        self.assertEqual(grp.parent(), parent)
+        self.assertEqual(ctrl.parent(), grp)
+        self.assertTrue(np.allclose(ctrl.world_matrix(), world))
+        self.assertTrue(np.allclose(ctrl.local_matrix(), np.identity(4)))
+
+        print ("Successfully ran test_zero")
+
+    def test_lock_and_hide(self):
+        ctrl = scene.create_node("transform", name="hand_L_ctrl")
+        attr_utils.lock_and_hide(ctrl, lock=["t", "r", "v"], not_lock=["tx"])
+
+        self.assertEqual(ctrl.attr_state("translateX"), (False, True, False))
+        for attr in ("translateY", "translateZ", "rotateX", "rotateY", "rotateZ", "visibility"):
+            self.assertEqual(ctrl.attr_state(attr), (True, False, False))
+        self.assertEqual(ctrl.attr_state("scaleX"), (False, True, False))
+
+        self.assertRaises(ValueError, attr_utils.lock_and_hide, "missing_L_ctrl")
+
+        print ("Successfully ran test_lock_and_hide")
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
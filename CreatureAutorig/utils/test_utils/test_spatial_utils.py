@@ -0,0 +1,136 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import time
+import unittest
+import numpy as np
+from utils import spatial_utils
+
+
+def brute_force_overlapping(points, tolerance):
+    '''
+    The function compares every pair of points, used as a reference
+    '''
+    points = np.asarray(points, dtype=float)
+    dist = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+    first, second = np.nonzero(np.triu(dist <= tolerance, k=1))
+    return np.stack([first, second], axis=1)
+
+
+class TestFindOverlapping(unittest.TestCase):
+    def test_find_overlapping(self):
+        points = [(0, 0, 0), (1, 0, 0), (0, 0, 0), (1, 0, 1e-12), (5, 5, 5), (0, 0, 0)]
+        pairs = spatial_utils.find_overlapping(points)
+        self.assertEqual(pairs.tolist(), [[0, 2], [0, 5], [1, 3], [2, 5]])
+        self.assertEqual(spatial_utils.count_unique(points), 3)
+
+        pairs = spatial_utils.find_overlapping([(0, 0, 0), (1, 0, 0)])
+        self.assertEqual(pairs.shape, (0, 2))
+        self.assertEqual(spatial_utils.find_overlapping([(0, 0, 0)]).shape, (0, 2))
+
+        print ("Successfully ran test_find_overlapping")
+
+    def test_against_brute_force(self):
+        rng = np.random.default_rng(2)
+        points = rng.uniform(-1, 1, size=(600, 3))
+        points[::7] = points[1::7][:len(points[::7])] + rng.normal(0, 0.01, size=(86, 3))
+        for tolerance in (0.0, 0.02, 0.2):
+            pairs = spatial_utils.find_overlapping(points, tolerance)
+            self.assertEqual(pairs.tolist(), 
+                             brute_force_overlapping(points, tolerance).tolist())
+
+        print ("Successfully ran test_against_brute_force")
+
+    def test_uneven_points(self):
+        # a chain of guides and one far away point, the grid must not depend on the extent
+        count = 20000
+        points = np.zeros((count + 1, 3))
+        points[:count, 0] = np.arange(count) * 0.01
+        points[count] = (1e6, 0, 0)
+        pairs = spatial_utils.find_overlapping(points, 0.015)
+        self.assertEqual(pairs.tolist(), [[i, i+1] for i in range(count-1)])
+
+        rng = np.random.default_rng(3)
+        points = np.concatenate([rng.normal(0, 0.05, size=(800, 3)), [(1e9, -1e9, 1e9)]])
+        for tolerance in (1e-12, 0.01):
+            pairs = spatial_utils.find_overlapping(points, tolerance)
+            self.assertEqual(pairs.tolist(), 
+                             brute_force_overlapping(points, tolerance).tolist())
+
+        print ("Successfully ran test_uneven_points")
+
+
+class TestKDTree(unittest.TestCase):
+    def test_query(self):
+        rng = np.random.default_rng(4)
+        points = rng.normal(size=(3000, 3))
+        points[100:110] = points[0] # duplicates
+        queries = np.concatenate([rng.normal(size=(500, 3)) * 2.0, points[:20]])
+        dist = np.linalg.norm(queries[:, None] - points[None], axis=-1)
+
+        tree = spatial_utils.KDTree(points)
+        self.assertEqual(len(tree), 3000)
+        for k in (1, 4, 40):
+            distances, indices = tree.query(queries, k, chunk_size=128)
+            self.assertEqual(indices.shape, (520, k))
+            self.assertTrue(np.allclose(distances, np.sort(dist, axis=1)[:, :k]))
+            self.assertTrue(np.allclose(np.take_along_axis(dist, indices, axis=1), distances))
+
+        # fewer points than a leaf
+        distances, indices = spatial_utils.KDTree(points[:5]).query(queries, 5)
+        self.assertTrue(np.allclose(distances, np.sort(dist[:, :5], axis=1)))
+        self.assertRaises(ValueError, tree.query, queries, 0)
+        self.assertRaises(ValueError, spatial_utils.KDTree, np.empty((0, 3)))
+
+        print ("Successfully ran test_query")
+
+
+def benchmark_find_overlapping(count=100000, tolerance=1e-3):
+    '''
+    The function measures how long it takes to find overlapping points in a dense guide set
+    @param count: int, number of points
+    @param tolerance: float
+    @return float: time in seconds
+    '''
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-100, 100, size=(count, 3))
+    points[::100] = points[1::100]
+
+    start = time.perf_counter()
+    pairs = spatial_utils.find_overlapping(points, tolerance)
+    result = time.perf_counter() - start
+
+    print (f"{count} points, {len(pairs)} overlapping pairs: {result:.4f}s")
+    return result
+
+
+def benchmark_kd_tree(count=100000, k=4):
+    '''
+    The function measures how long it takes to build a KD-tree of a dense mesh 
+    and to find the nearest points for the same number of query points
+    @param count: int, number of points in the tree and of query points
+    @param k: int, number of neighbours
+    @return (float, float): build and query time in seconds
+    '''
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-100, 100, size=(count, 3))
+    queries = rng.uniform(-100, 100, size=(count, 3))
+
+    start = time.perf_counter()
+    tree = spatial_utils.KDTree(points)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tree.query(queries, k)
+    query_time = time.perf_counter() - start
+
+    print (f"{count} points, {k} neighbours - build: {build_time:.3f}s, "
+           f"query: {query_time:.3f}s")
+    return build_time, query_time
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,186 @@
+'''
+Created on 18. 10. 2026
+
+@author: mstolarz
+'''
+import time
+import unittest
+import numpy as np
+from utils import scene
+from utils import xform_utils
+from utils.scene.fake_backend import FakeBackend
+
+
+def create_rig(limbs=10, depth=10):
+    '''
+    The function creates a synthetic rig, chains of nested controls 
+    with random transforms under a root
+    @param limbs: int, number of chains
+    @param depth: int, number of controls in a chain
+    @return [SceneNode]: the controls, parents before children
+    '''
+    rng = np.random.default_rng(0)
+    root = scene.create_node("transform", name="root_M_grp")
+    ctrls = []
+    for i in range(limbs):
+        parent = root
+        for _ in range(depth):
+            ctrl = scene.create_node("transform", name=f"limb{i}_L_ctrl", parent=parent)
+            ctrl.set_attr("translate", rng.uniform(-5, 5, 3))
+            ctrl.set_attr("rotate", rng.uniform(-90, 90, 3))
+            ctrls.append(ctrl)
+            parent = ctrl
+
+    return ctrls
+
+
+class TestXformUtils(unittest.TestCase):
+    def setUp(self):
+        self.backend = FakeBackend()
+        self.previous_backend = scene.set_backend(self.backend)
+
+    def tearDown(self):
+        scene.set_backend(self.previous_backend)
+
+    def test_zero_opm(self):
+        ctrls = create_rig(2, 3)
+        jnt = scene.create_node("joint", name="hand_L_jnt", parent=ctrls[-1])
+        jnt.set_attr("jointOrient", (0, 45, 0))
+        jnt.set_attr("translate", (1, 2, 3))
+        worlds = [node.world_matrix() for node in ctrls + [jnt]]
+        node_count = len(self.backend)
+
+        self.assertEqual(xform_utils.zero(ctrls[0], mode="opm"), ctrls[0])
+        self.assertEqual(xform_utils.zero_many(ctrls[1:] + [jnt], mode="opm"), ctrls[1:] + [jnt])
+        self.assertEqual(len(self.backend), node_count)
+        for node, world in zip(ctrls + [jnt], worlds):
+            self.assertTrue(np.allclose(node.world_matrix(), world))
+            self.assertEqual(node.get_attr("translate"), (0.0, 0.0, 0.0))
+            self.assertEqual(node.get_attr("rotate"), (0.0, 0.0, 0.0))
+        self.assertEqual(jnt.get_attr("jointOrient"), (0.0, 0.0, 0.0))
+
+        # the node can be moved after it is zeroed out, the offset is kept
+        ctrls[0].set_matrix(worlds[0])
+        self.assertTrue(np.allclose(ctrls[0].get_attr("rotate"), 0.0))
+        self.assertRaises(ValueError, xform_utils.zero, ctrls[0], "freeze")
+
+        print ("Successfully ran test_zero_opm")
+
+    def test_zero_many(self):
+        ctrls = create_rig(2, 3)
+        worlds = [ctrl.world_matrix() for ctrl in ctrls]
+
+        patterns = []
+        list_names = self.backend.list_names
+        self.backend.list_names = lambda pattern="*": patterns.append(pattern) or list_names(pattern)
+        grps = xform_utils.zero_many(ctrls[::-1])[::-1]
+        # only the names the groups can clash with are read, not the whole scene
+        self.assertEqual(patterns, ["limb0Zero_L_*", "limb1Zero_L_*"])
+        del self.backend.list_names
+        self.assertEqual(self.backend.undo_steps, ["zero"])
+        # children are zeroed out before their parents, so they get the first names
+        self.assertEqual(grps[2].name(), "limb0Zero_L_grp")
+        self.assertEqual(grps[0].name(), "limb0Zero_L_grp_02")
+        self.assertEqual(grps[5].name(), "limb1Zero_L_grp")
+        for ctrl, grp, world in zip(ctrls, grps, worlds):
+            self.assertEqual(ctrl.parent(), grp)
+            self.assertTrue(np.allclose(ctrl.world_matrix(), world))
+            self.assertTrue(np.allclose(ctrl.local_matrix(), np.identity(4)))
+        self.assertEqual(grps[1].parent(), ctrls[0])
+
+        print ("Successfully ran test_zero_many")
+
+    def test_zero_rotation(self):
+        rng = np.random.default_rng(1)
+        parent = scene.create_node("transform", name="root_M_grp")
+        parent.set_attr("scale", (2, 2, 2))
+        joints = []
+        for i in range(5):
+            jnt = scene.create_node("joint", name=f"arm_L_jnt_0{i}", 
+                                    parent=joints[-1] if joints else parent)
+            jnt.set_attr("translate", rng.uniform(-5, 5, 3))
+            jnt.set_attr("rotate", rng.uniform(-90, 90, 3))
+            jnt.set_attr("jointOrient", rng.uniform(-90, 90, 3))
+            jnt.set_attr("rotateOrder", i) # xyz, yzx, zxy, xzy, yxz
+            # non-uniform scale would shear the children, which groups cannot carry
+            jnt.set_attr("scale", [rng.uniform(0.5, 2)] * 3)
+            joints.append(jnt)
+
+        for target in xform_utils.ROTATION_TARGETS:
+            for jnt in joints:
+                jnt.set_attr("rotate", rng.uniform(-90, 90, 3))
+                jnt.set_attr("rotateAxis", rng.uniform(-45, 45, 3))
+            worlds = [jnt.world_matrix() for jnt in joints]
+            if target == "group":
+                # the groups don't carry the scale of the parents
+                scales = [np.linalg.norm(world[:3, :3], axis=1) for world in worlds]
+            else:
+                scales = [jnt.get_attr("scale") for jnt in joints]
+
+            result = xform_utils.zero_rotation(joints, target)
+            self.assertEqual(self.backend.undo_steps[-1], "zero_rotation")
+            self.assertEqual(len(result), len(joints))
+            for jnt, world, scale in zip(joints, worlds, scales):
+                self.assertTrue(np.allclose(jnt.world_matrix(), world))
+                self.assertTrue(np.allclose(jnt.get_attr("rotate"), 0.0))
+                self.assertTrue(np.allclose(jnt.get_attr("rotateAxis"), 0.0))
+                self.assertTrue(np.allclose(jnt.get_attr("scale"), scale))
+            if target == "group":
+                self.assertEqual(joints[1].parent(), result[1])
+                self.assertEqual(result[1].parent(), joints[0])
+
+        ctrl = scene.create_node("transform", name="arm_L_ctrl")
+        self.assertRaisesRegex(ValueError, "arm_L_ctrl", xform_utils.zero_rotation, ctrl)
+        self.assertRaises(ValueError, xform_utils.zero_rotation, ctrl, "scale")
+        self.assertEqual(xform_utils.zero_rotation(ctrl, "opm"), [ctrl])
+
+        print ("Successfully ran test_zero_rotation")
+
+
+def benchmark_zero(limbs=20, depth=10, evaluations=10):
+    '''
+    The function zeroes out the controls of a synthetic rig one by one with groups, 
+    in a batch with groups and in a batch with offsetParentMatrix. 
+    It compares the time, the number of nodes added and the time to evaluate 
+    the world matrices of the last controls of the chains after the root moves
+    @param limbs: int, number of chains
+    @param depth: int, number of controls in a chain
+    @param evaluations: int, how many times the root moves and the matrices are evaluated
+    @return {str: (float, int, float)}: zero time in seconds, nodes added 
+            and evaluation time in seconds for every variant
+    '''
+    variants = {"group": lambda ctrls: [xform_utils.zero(ctrl) for ctrl in ctrls],
+                "group batch": lambda ctrls: xform_utils.zero_many(ctrls),
+                "opm batch": lambda ctrls: xform_utils.zero_many(ctrls, mode="opm")}
+
+    results = {}
+    for variant, zero_function in variants.items():
+        ctrls = create_rig(limbs, depth)
+        node_count = len(scene.list_names())
+
+        start = time.perf_counter()
+        zero_function(ctrls)
+        zero_time = time.perf_counter() - start
+        nodes_added = len(scene.list_names()) - node_count
+
+        # moving the root dirties every control, so the matrices are evaluated again
+        root = scene.node("root_M_grp")
+        leaves = ctrls[depth-1::depth]
+        start = time.perf_counter()
+        for i in range(evaluations):
+            root.set_attr("translateX", float(i + 1))
+            for leaf in leaves:
+                leaf.world_matrix()
+        eval_time = time.perf_counter() - start
+
+        scene.delete(root)
+        results[variant] = (zero_time, nodes_added, eval_time)
+        scene.display_info(f"{variant} - {len(ctrls)} controls zeroed out: {zero_time:.3f}s, "
+                           f"nodes added: {nodes_added}, evaluation: {eval_time:.3f}s")
+
+    return results
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
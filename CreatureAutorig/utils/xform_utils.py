@@ -2,50 +2,217 @@
 '''
 @author: mstolarz
 '''
-import maya.OpenMaya as om
-import pymel.core as pm
+from contextlib import nullcontext
+import numpy as np
 from utils import name_utils
+from utils import orient_utils
+from utils import scene
+from core.build_session import BuildSession
 
 
-def zero(obj):
+ZERO_MODES = ("group", "opm")
+# group - the object is parented under a new group matching its transforms
+# opm - the transforms are moved to the offsetParentMatrix of the object, 
+#       no node is added (Maya 2020 and newer)
+ROTATION_TARGETS = ("jointOrient", "opm", "group")
+# jointOrient - the rotation of joints is moved to their jointOrient
+# opm - the rotation and the position are moved to the offsetParentMatrix
+# group - the objects are parented under groups carrying their rotation and position
+
+
+def zero(obj, mode="group"):
     '''
     TODO - this should take the number from the obj that's being grouped
-    This function gets a pymel object and groups it 
-    with the group aligned with that object to zero out the transforms
-    @param obj: PyNode, the object to be zeroed out
-    @return PyNode: the offset group
+    This function zeroes out the transforms of an object. By default it groups the object
+    with the group aligned with that object
+    @param obj: SceneNode, PyNode or str, the object to be zeroed out
+    @param mode: str, one of ZERO_MODES
+    @return SceneNode: the offset group, the object itself in the "opm" mode
     '''
+    if mode not in ZERO_MODES:
+        raise ValueError(f"Zero mode has to be one of {ZERO_MODES}, got: {mode}")
+    obj = scene.node(obj)
 
-    #Get parent object
+    if mode == "opm":
+        __zero_opm(obj, __local_matrices([obj])[0])
+        return obj
 
-    par = obj.getParent()
+    #Create group name
+    group_name = __group_name(obj)
+    if not group_name:
+        scene.display_error("Failed to generate a group name")
+        return None
 
-    #Create gorup name
-    name =  obj.name()
-    temp = name.split("_")
+    return __zero_group(obj, group_name, obj.world_matrix())
 
-    group_name = name_utils.build_unique_name(temp[0]+"Zero", temp[1], "grp")
 
-    if not group_name:
-        om.MGlobal.displayError("Failed to generate a group name")
+def zero_many(objs, mode="group"):
+    '''
+    This function zeroes out the transforms of many objects in one batch, 
+    e.g. all the controls of a rig. The world matrices are read before anything changes
+    and all the group names are generated together
+    @param objs: [SceneNode, PyNode or str], the objects can be nested inside each other
+    @param mode: str, one of ZERO_MODES
+    @return [SceneNode]: the offset groups, the objects themselves in the "opm" mode
+    '''
+    if mode not in ZERO_MODES:
+        raise ValueError(f"Zero mode has to be one of {ZERO_MODES}, got: {mode}")
+    objs = scene.nodes(objs)
+
+    if mode == "opm":
+        matrices = __local_matrices(objs)
+        with scene.undo_chunk("zero"):
+            for obj, matrix in zip(objs, matrices):
+                __zero_opm(obj, matrix)
+        return objs
+
+    matrices = [obj.world_matrix() for obj in objs]
+    group_names = __group_names(objs)
+    if not group_names:
+        scene.display_error("Failed to generate a group name")
         return None
 
-    #Create the group
-    grp = pm.createNode("transform", name=group_name)
+    with scene.undo_chunk("zero"):
+        return [__zero_group(obj, group_name, matrix) 
+                for obj, group_name, matrix in zip(objs, group_names, matrices)]
+
 
-    #Set the matrix for the group
-    grp.setMatrix(obj.wm.get())
+def __group_name(obj):
+    '''
+    This function returns the name of the group zeroing out the object
+    '''
+    temp = obj.name().split("_")
+    return name_utils.build_unique_name(temp[0]+"Zero", temp[1], "grp")
+
+
+def __group_names(objs):
+    '''
+    This function returns the names of the groups zeroing out the objects,
+    None if any of them cannot be generated
+    '''
+    session = nullcontext()
+    if name_utils.get_registry() is None:
+        # only the names the groups can clash with are read from the scene
+        session = BuildSession(name_utils.registry_from_scene(
+            ["{}Zero_{}_*".format(*obj.name().split("_")[:2]) for obj in objs]))
+    with session:
+        group_names = [__group_name(obj) for obj in objs]
+
+    return group_names if all(group_names) else None
+
+
+def __zero_group(obj, group_name, matrix):
+    '''
+    This function creates the group under the same parent, matches it to the world matrix
+    of the object and parents the object under it
+    '''
+    grp = scene.create_node("transform", name=group_name, parent=obj.parent())
+    grp.set_matrix(matrix)
 
     #Rebuild hierarchy
-    obj.setParent(grp)
-    if par:
-        grp.setParent(par)
+    obj.set_parent(grp)
 
     return grp
 
 
-def zero_rotation(obj):
+def __local_matrices(objs):
+    '''
+    This function returns the matrices of the objects relative to their parents
+    @return numpy.ndarray: shape (N,4,4)
+    '''
+    matrices = np.array([obj.world_matrix() for obj in objs]).reshape(-1, 4, 4)
+    parents = np.array([obj.parent().world_matrix() if obj.parent() is not None 
+                        else np.identity(4) for obj in objs]).reshape(-1, 4, 4)
+
+    return matrices @ np.linalg.inv(parents)
+
+
+def __zero_opm(obj, matrix, scale=(1, 1, 1)):
+    '''
+    This function moves the matrix of the object relative to its parent
+    to its offsetParentMatrix and resets the transform channels
+    @param matrix: numpy.ndarray (4,4), the matrix relative to the parent
+    @param scale: float[3], scale kept in the channels, it has to be removed from the matrix
+    '''
+    obj.set_attr("offsetParentMatrix", matrix)
+    obj.set_attr("translate", (0, 0, 0))
+    obj.set_attr("rotate", (0, 0, 0))
+    obj.set_attr("rotateAxis", (0, 0, 0))
+    obj.set_attr("scale", scale)
+    if obj.node_type() == "joint":
+        obj.set_attr("jointOrient", (0, 0, 0))
+
+
+def zero_rotation(objs, target="jointOrient"):
     '''
-    TODO
+    This function moves the rotation of objects out of their rotate channels, 
+    e.g. after the guides were edited. All the matrices are read first and decomposed 
+    together, then the results are written in one pass. The world matrices don't change,
+    the rotate order and the rotateAxis are taken into account, 
+    the rotateAxis is zeroed out together with the rotation
+    @param objs: SceneNode, PyNode or str or a list of them
+    @param target: str, one of ROTATION_TARGETS
+    @return [SceneNode]: the objects, their groups with the "group" target
     '''
-    return True
+    if target not in ROTATION_TARGETS:
+        raise ValueError(f"Rotation target has to be one of {ROTATION_TARGETS}, got: {target}")
+    objs = scene.nodes(objs if isinstance(objs, (list, tuple)) else [objs])
+
+    if target == "jointOrient":
+        not_joints = [obj.name() for obj in objs if obj.node_type() != "joint"]
+        if not_joints:
+            raise ValueError(f"Only joints have jointOrient: {', '.join(not_joints)}")
+
+        # the rotation is composed from the channels, so offsets and scale are kept as they are
+        eulers = np.array([obj.get_attr("rotate") for obj in objs], dtype=float)
+        rotate_orders = np.array([obj.get_attr("rotateOrder") for obj in objs])
+        rotations = np.empty((len(objs), 3, 3))
+        for rotate_order in np.unique(rotate_orders):
+            same_order = rotate_orders == rotate_order
+            rotations[same_order] = orient_utils.euler_to_matrix(eulers[same_order], 
+                                                                 int(rotate_order))
+        axes = orient_utils.euler_to_matrix([obj.get_attr("rotateAxis") for obj in objs])
+        orients = orient_utils.euler_to_matrix([obj.get_attr("jointOrient") for obj in objs])
+        orients = orient_utils.matrix_to_euler(axes @ rotations @ orients)
+
+        with scene.undo_chunk("zero_rotation"):
+            for obj, orient in zip(objs, orients):
+                obj.set_attr("rotate", (0, 0, 0))
+                obj.set_attr("rotateAxis", (0, 0, 0))
+                obj.set_attr("jointOrient", orient)
+        return objs
+
+    if target == "opm":
+        matrices = __local_matrices(objs)
+    else:
+        matrices = np.array([obj.world_matrix() for obj in objs])
+
+    # rows of the matrices are the scaled axes, the scale stays in the channels
+    scales = np.linalg.norm(matrices[:, :3, :3], axis=-1)
+    matrices[:, :3, :3] /= scales[:, :, None]
+
+    if target == "opm":
+        with scene.undo_chunk("zero_rotation"):
+            for obj, matrix, scale in zip(objs, matrices, scales):
+                __zero_opm(obj, matrix, scale)
+        return objs
+
+    group_names = __group_names(objs)
+    if not group_names:
+        scene.display_error("Failed to generate a group name")
+        return None
+
+    with scene.undo_chunk("zero_rotation"):
+        grps = [__zero_group(obj, group_name, matrix) 
+                for obj, group_name, matrix in zip(objs, group_names, matrices)]
+        # the groups carry everything except the scale of the objects
+        for obj, scale in zip(objs, scales):
+            obj.set_attr("offsetParentMatrix", np.identity(4))
+            obj.set_attr("translate", (0, 0, 0))
+            obj.set_attr("rotate", (0, 0, 0))
+            obj.set_attr("rotateAxis", (0, 0, 0))
+            obj.set_attr("scale", scale)
+            if obj.node_type() == "joint":
+                obj.set_attr("jointOrient", (0, 0, 0))
+
+    return grps